@@ -2,15 +2,22 @@
 
 from .employee import Employee
 from .germes import GermesAlea
+from .progress import CancellationToken, ProgressReporter, SimulationCancelled
 from .retiree import Retiree
 from .scenario import Scenario
+from .schema import RESULT_DTYPES, apply_result_schema
 from .simulator import Simulator
 
 # __all__ so `from core import *` works in tests or debugging
 __all__ = [
     "Employee",
     "GermesAlea",
+    "CancellationToken",
+    "ProgressReporter",
+    "SimulationCancelled",
     "Retiree",
     "Scenario",
+    "RESULT_DTYPES",
+    "apply_result_schema",
     "Simulator",
 ]
@@ -6,13 +6,51 @@ Permet d’éviter les imports circulaires tout en gardant un logger propre à `
 À utiliser dans tous les modules du dossier `core/` via :
 
     from core.logger import logger
+
+Les messages par entité (employé, retraité, tranche de cotisation) passent par
+`entity_logger` ("app.core.entities"), dont le volume se règle avec la variable
+d'environnement APP_LOG_ENTITY_FILTER : "all" (défaut), "sample:N", "rate:R/BURST"
+ou "summary" (un résumé agrégé par année, via log_entity_summary).
 """
 
+import os
+
+# Libellés des résumés agrégés, par modèle de message (voir employee.py, retiree.py, scenario.py)
+ENTITY_EVENTS = {
+    "Création Employé #%s | Âge: %s, Salaire: %s, Embauche: %s": "employés créés",
+    "Employé #%s vieillit → %s ans, %s années travaillées": "employés vieillis",
+    "Employé #%s salaire augmenté : %.2f → %.2f": "salaires augmentés",
+    "Employé #%s cotisation calculée à taux %.2f%% : %.2f dh/an": "cotisations calculées",
+    "Employé #%s atteint retraite ? %s (âge: %s, seuil: %s)": "tests de départ",
+    "Création Retraité #%s | âge retraite: %s, années: %s, pension: %.2f dh": "départs en retraite",
+    "Calcul pension pour Retraité #%s : taux=%s → pension=%.2f dh": "pensions calculées",
+    "Salaire %s → taux cotisation = %s": "taux par tranche",
+    "Salaire %s dépasse toutes les bornes → taux max = %s": "taux max appliqués",
+}
+
 try:
-    from utils.logger import get_child_logger
+    from utils.logger import get_child_logger, set_log_filter, SummaryFilter
     logger = get_child_logger("core")
+    entity_logger = get_child_logger("core.entities")
+    set_log_filter(entity_logger, os.environ.get("APP_LOG_ENTITY_FILTER", "all"), labels=ENTITY_EVENTS)
 except ImportError:
     import logging
     logger = logging.getLogger("app.core")
+    entity_logger = logging.getLogger("app.core.entities")
+    SummaryFilter = None
+
+
+def log_entity_summary(label):
+    """
+    En mode "summary", émet sur `logger` la ligne agrégée des événements par entité
+    depuis le dernier résumé (ex. "Année 2026 : 10 300 employés vieillis, ...").
+    Sans effet dans les autres modes.
+    """
+    if SummaryFilter is None:
+        return
+    for log_filter in entity_logger.filters:
+        if isinstance(log_filter, SummaryFilter):
+            log_filter.emit_summary(logger, label)
+
 
 logger.debug("Logger initialisé pour le module 'core'.")
@@ -0,0 +1,57 @@
+# core/progress.py
+
+"""
+Suivi et annulation des simulations longues :
+- ProgressReporter : callback progress(run, annee, elapsed, eta) après chaque année
+- CancellationToken : annulation coopérative, vérifiée entre deux années
+"""
+
+import threading
+import time
+
+
+class SimulationCancelled(Exception):
+    """Levée entre deux années lorsqu'une annulation a été demandée."""
+
+
+class CancellationToken:
+    """
+    Jeton d'annulation coopérative, partagé entre l'interface et le thread de simulation.
+    Le simulateur le consulte entre deux années simulées.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise SimulationCancelled("Simulation annulée par l'utilisateur.")
+
+
+class ProgressReporter:
+    """
+    Transmet l'avancement au callback `progress(run, annee, elapsed, eta)` après chaque
+    année simulée : temps écoulé et temps restant estimé (en secondes) d'après la
+    durée moyenne des années déjà simulées.
+    """
+
+    def __init__(self, callback, total_steps):
+        self.callback = callback
+        self.total_steps = total_steps
+        self.done = 0
+        self._start = time.perf_counter()
+
+    def step(self, run, annee):
+        self.done += 1
+        if self.callback is None:
+            return
+        elapsed = time.perf_counter() - self._start
+        eta = elapsed / self.done * max(self.total_steps - self.done, 0)
+        self.callback(run, annee, elapsed, eta)
@@ -1,6 +1,6 @@
 # core/retiree.py
 
-from core.logger import logger
+from core.logger import entity_logger
 
 class Retiree:
     def __init__(self, emp_id, age_retraite, ancien_salaire, annees_travaillees, formule_taux=2.0):
@@ -17,7 +17,8 @@ class Retiree:
         self.annees_travaillees = annees_travaillees
         self.pension = self.calculer_pension(formule_taux)
 
-        logger.info(f"Création Retraité #{self.id} | âge retraite: {self.age_retraite}, années: {self.annees_travaillees}, pension: {self.pension:.2f} dh")
+        entity_logger.info("Création Retraité #%s | âge retraite: %s, années: %s, pension: %.2f dh",
+                           self.id, self.age_retraite, self.annees_travaillees, self.pension)
 
     def calculer_pension(self, formule_taux=2.0):
         """
@@ -28,7 +29,7 @@ class Retiree:
         - taux : 2.0 ou 1.5 (selon le scénario)
         """
         pension = ((self.annees_travaillees * formule_taux) / 100.0) * self.ancien_salaire
-        logger.debug(f"Calcul pension pour Retraité #{self.id} : taux={formule_taux} → pension={pension:.2f} dh")
+        entity_logger.debug("Calcul pension pour Retraité #%s : taux=%s → pension=%.2f dh", self.id, formule_taux, pension)
         return pension
 
     def __repr__(self):
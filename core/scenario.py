@@ -1,6 +1,6 @@
 # core/scenario.py
 
-from core.logger import logger
+from core.logger import logger, entity_logger
 
 class Scenario:
     def __init__(self,
@@ -19,16 +19,16 @@ class Scenario:
         self.taux_cotisation_tranches = taux_cotisation_tranches
         self.formule_taux_pension = formule_taux_pension
 
-        logger.info(f"Scénario chargé: {self.nom}, retraite à {self.age_retraite}, taux pension: {self.formule_taux_pension}")
+        logger.info("Scénario chargé: %s, retraite à %s, taux pension: %s", self.nom, self.age_retraite, self.formule_taux_pension)
 
     def get_taux_cotisation(self, salaire):
         """Retourne le taux de cotisation selon la tranche du salaire."""
         for borne, taux in sorted(self.taux_cotisation_tranches.items()):
             if salaire <= borne:
-                logger.debug(f"Salaire {salaire} → taux cotisation = {taux}")
+                entity_logger.debug("Salaire %s → taux cotisation = %s", salaire, taux)
                 return taux
         taux_max = list(self.taux_cotisation_tranches.values())[-1]
-        logger.debug(f"Salaire {salaire} dépasse toutes les bornes → taux max = {taux_max}")
+        entity_logger.debug("Salaire %s dépasse toutes les bornes → taux max = %s", salaire, taux_max)
         return taux_max
 
     def __repr__(self):
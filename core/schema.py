@@ -0,0 +1,48 @@
+# core/schema.py
+
+"""
+Schéma compact des résultats de simulation (format long, une ligne par run et par année).
+- Annee : int16, Simulation : int32, effectifs : int32
+- Montants (TotCotis, TotPens, Reserve) : float64 par défaut, float32 en option
+- Scenario : catégoriel (un code par ligne au lieu d'une chaîne répétée)
+"""
+
+# Colonnes monétaires : seules colonnes en flottant
+MONETARY_COLUMNS = ["TotCotis", "TotPens", "Reserve"]
+
+RESULT_DTYPES = {
+    "Annee": "int16",
+    "Simulation": "int32",
+    "TotEmp": "int32",
+    "TotRet": "int32",
+    "NouvRet": "int32",
+    "NouvRec": "int32",
+    "TotCotis": "float64",
+    "TotPens": "float64",
+    "Reserve": "float64",
+    "Scenario": "category",
+}
+
+
+def result_dtypes(monetary_dtype="float64"):
+    """Retourne le dict colonne -> dtype, avec le type choisi pour les montants."""
+    dtypes = dict(RESULT_DTYPES)
+    for col in MONETARY_COLUMNS:
+        dtypes[col] = monetary_dtype
+    return dtypes
+
+
+def apply_result_schema(df, monetary_dtype="float64"):
+    """
+    Convertit les colonnes connues d'un DataFrame de résultats vers le schéma compact.
+    Les colonnes entières contenant des valeurs manquantes sont laissées telles quelles ;
+    les colonnes inconnues ne sont pas modifiées.
+    """
+    casts = {}
+    for col, dtype in result_dtypes(monetary_dtype).items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype.startswith("int") and df[col].isna().any():
+            continue
+        casts[col] = dtype
+    return df.astype(casts) if casts else df
@@ -4,9 +4,14 @@ from core.employee import Employee
 from core.retiree import Retiree
 from core.scenario import SCENARIOS
 from core.germes import GermesAlea
-from core.logger import logger  # ✅ logger partagé (DRY)
+from core.schema import apply_result_schema
+from core.progress import ProgressReporter, SimulationCancelled
+from core.logger import logger, log_entity_summary  # ✅ logger partagé (DRY)
 
 class Simulator:
+    # Type des colonnes monétaires des résultats ("float32" pour les très grosses études)
+    monetary_dtype = "float64"
+
     def __init__(self, seed=None, scenario_id=1, IX=12345, IY=23456, IZ=34567, seed_increment=5):
         # Permet de choisir le scénario directement par ID
         self.scenario = SCENARIOS[scenario_id]
@@ -28,6 +33,7 @@ class Simulator:
         try:
             self.init_employes()
             self.init_retraites()
+            log_entity_summary("Initialisation")
             logger.info("Initialisation Simulator (scenario_id=%s, germes=[%d,%d,%d]) OK", scenario_id, IX, IY, IZ)
         except Exception as e:
             logger.error("Erreur à l'initialisation du Simulator: %s", str(e))
@@ -160,20 +166,44 @@ class Simulator:
         self._last_result = result  # 🔁 pour les anciens tests
         return result
 
-    def simuler_11_ans(self, simulation_id=None):
+    def simuler_11_ans(self, simulation_id=None, progress=None, cancel_token=None):
+        """
+        Simule 2025-2035 et retourne le DataFrame des 11 années.
+        - progress : callback optionnel progress(run, annee, elapsed, eta) appelé après chaque année
+        - cancel_token : CancellationToken optionnel, vérifié avant chaque année (SimulationCancelled)
+        """
+        return self._simuler_annees(simulation_id, ProgressReporter(progress, 11), cancel_token)
+
+    def _simuler_annees(self, simulation_id, reporter, cancel_token):
         donnees = []
         for year in range(2025, 2025 + 11):
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             result = self.simuler_annee(year)
+            log_entity_summary(f"Année {year}")
             result["Annee"] = year
             if simulation_id is not None:
                 result["Simulation"] = simulation_id
             donnees.append(result)
-        df = pd.DataFrame(donnees)
+            reporter.step(simulation_id, year)
+        df = apply_result_schema(pd.DataFrame(donnees), monetary_dtype=self.monetary_dtype)
         self.history = df.to_dict(orient="records")  # 🔁 pour compatibilité
         logger.debug("simuler_11_ans: Simulation sur 11 ans terminée.")
         return df
 
-    def simuler_40_runs(self):
+    def simuler_40_runs(self, cube=None, scenario=None, journal=None, progress=None, cancel_token=None, on_run=None):
+        """
+        Lance 40 runs (germes incrémentés à chaque run) et retourne la liste des DataFrames.
+        - cube : ResultsCube optionnel dans lequel chaque run est écrit dès qu'il est terminé
+        - scenario : libellé du scénario dans le cube/journal (par défaut le nom du scénario courant)
+        - journal : RunJournal optionnel, chaque run terminé y est ajouté et flushé sur disque
+        - progress : callback optionnel progress(run, annee, elapsed, eta), ETA sur les 40 runs
+        - cancel_token : CancellationToken optionnel ; l'annulation lève SimulationCancelled
+          entre deux années (les runs déjà terminés restent dans le cube/journal)
+        - on_run : callback optionnel on_run(run, df_run) appelé à chaque run terminé
+          (ex. LiveResults.append_run pour les graphiques en direct)
+        """
+        reporter = ProgressReporter(progress, 40 * 11)
         all_runs = []
         initial_germes = self.germes.get_germes()
         logger.info("Début simuler_40_runs (scenario=%s, germes init=%s)", self.scenario.nom, initial_germes)
@@ -185,10 +215,23 @@ class Simulator:
                 self.init_employes()
                 self.init_retraites()
                 self.reserve = 200_000_000
-                df_run = self.simuler_11_ans(simulation_id=i + 1)
+                df_run = self._simuler_annees(i + 1, reporter, cancel_token)
                 all_runs.append(df_run)
+                if cube is not None:
+                    cube.write_run(scenario if scenario is not None else self.scenario.nom, i + 1, df_run)
+                if journal is not None:
+                    journal.append_run(i + 1, df_run, scenario=scenario if scenario is not None else self.scenario.nom)
+                if on_run is not None:
+                    on_run(i + 1, df_run)
                 logger.debug("Run %d/40 terminé.", i + 1)
+            if cube is not None:
+                cube.flush()
             logger.info("simuler_40_runs : Simulation complète (40 runs)")
+        except SimulationCancelled:
+            logger.info("simuler_40_runs annulée après %d run(s) terminé(s).", len(all_runs))
+            if cube is not None:
+                cube.flush()
+            raise
         except Exception as e:
             logger.error("Erreur pendant simuler_40_runs : %s", str(e))
             raise
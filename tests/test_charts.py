@@ -77,3 +77,120 @@ class TestChartsUI:
 
         assert selector.combo_box is not None, "❌ ComboBox manquant"
         assert selector.combo_box.count() > 0, "❌ Aucun scénario chargé dans le combo"
+
+    def test_graph_window_all_runs_single_collection(self, qtbot):
+        """🍝 Vérifie que le mode « tous les runs » trace un seul artiste (lignes ou densité)."""
+        import numpy as np
+        import pandas as pd
+        from matplotlib.collections import LineCollection, QuadMesh
+        from ui.graph_window import GraphWindow
+
+        def runs_df(n_runs):
+            return pd.DataFrame({
+                "Simulation": np.repeat(np.arange(1, n_runs + 1), 11),
+                "Annee": np.tile(np.arange(2025, 2036), n_runs),
+                "Reserve": np.random.default_rng(0).normal(size=n_runs * 11),
+            })
+
+        win = GraphWindow(data=runs_df(300), mode="runs")
+        qtbot.addWidget(win)
+        lines = [c for c in win.figure.axes[0].collections if isinstance(c, LineCollection)]
+        assert len(lines) == 1 and len(lines[0].get_segments()) == 300
+
+        win = GraphWindow(data=runs_df(3000), mode="runs")
+        qtbot.addWidget(win)
+        meshes = [c for c in win.figure.axes[0].collections if isinstance(c, QuadMesh)]
+        assert len(meshes) == 1, "❌ Au-delà du seuil, la densité 2-D est attendue"
+
+
+class TestChartBatchExport:
+
+    def _df(self):
+        import numpy as np
+        import pandas as pd
+        return pd.DataFrame({
+            "Simulation": np.repeat([1, 2, 3], 11),
+            "Annee": np.tile(np.arange(2025, 2036), 3),
+            "Reserve": np.linspace(100.0, 10.0, 33),
+        })
+
+    def test_batch_export_to_zip(self, tmp_path, caplog):
+        """🗜️ Vérifie l'export par lots dans une archive, échecs journalisés sans interrompre."""
+        import zipfile
+        from utils.charts import export_charts_batch
+        specs = [
+            {"kind": "evolution", "simulation_id": 2},
+            {"kind": "distribution", "annee": 2030, "name": "distribution_2030"},
+            {"kind": "spaghetti", "format": "svg"},
+            {"kind": "evolution", "simulation_id": 99},
+        ]
+        out = str(tmp_path / "graphiques.zip")
+        written = export_charts_batch(self._df(), specs, out, max_workers=1)
+        assert written == ["0000_evolution_Reserve_sim2.png", "distribution_2030.png", "0002_spaghetti_Reserve.svg"]
+        with zipfile.ZipFile(out) as archive:
+            assert archive.read("distribution_2030.png").startswith(b"\x89PNG")
+            assert b"<svg" in archive.read("0002_spaghetti_Reserve.svg")
+        assert "simulation_id=99" in caplog.text
+
+    def test_batch_export_sanitizes_names_and_formats(self, tmp_path):
+        """🛡️ Vérifie que noms et scénarios restent dans le dossier d'export et que les formats sont validés d'emblée."""
+        import pytest
+        from utils.charts import export_charts_batch
+        df = self._df().assign(Scenario="S/1")
+        out = tmp_path / "png"
+        specs = [
+            {"kind": "distribution", "annee": 2030, "name": "../evasion"},
+            {"kind": "evolution", "simulation_id": 1, "scenario": "S/1"},
+        ]
+        written = export_charts_batch(df, specs, str(out), max_workers=1)
+        assert written == ["evasion.png", "0001_evolution_Reserve_S_1_sim1.png"]
+        assert sorted(p.name for p in out.iterdir()) == sorted(written)
+        assert not (tmp_path / "evasion.png").exists()
+
+        with pytest.raises(ValueError, match="bmp"):
+            export_charts_batch(df, [{"kind": "spaghetti", "format": "bmp"}], str(out), max_workers=1)
+
+    def test_batch_export_duplicate_names_and_write_errors(self, tmp_path, monkeypatch, caplog):
+        """🗂️ Vérifie les noms dupliqués suffixés et qu'une erreur d'écriture n'interrompt pas le lot."""
+        import zipfile
+        from utils import charts
+        specs = [{"kind": "distribution", "annee": a, "name": "annee"} for a in (2025, 2030)]
+        specs.append({"kind": "spaghetti", "name": "../annee"})
+        out = str(tmp_path / "lot.zip")
+        written = charts.export_charts_batch(self._df(), specs, out, max_workers=1)
+        assert written == ["annee.png", "annee_2.png", "annee_3.png"]
+        with zipfile.ZipFile(out) as archive:
+            assert sorted(archive.namelist()) == sorted(written)
+
+        real_replace = charts.os.replace
+        def failing_replace(src, dst):
+            if dst.endswith("annee_2.png"):
+                raise PermissionError("disque protégé")
+            return real_replace(src, dst)
+        monkeypatch.setattr(charts.os, "replace", failing_replace)
+        written = charts.export_charts_batch(self._df(), specs, str(tmp_path / "png"), max_workers=1)
+        assert written == ["annee.png", "annee_3.png"]
+        assert "disque protégé" in caplog.text
+        assert not any(p.name.endswith(".tmp") for p in (tmp_path / "png").iterdir())
+
+    def test_small_batch_renders_without_pool(self, monkeypatch):
+        """⚡ Vérifie qu'un petit lot sans max_workers est rendu dans le processus courant."""
+        from utils import charts
+        monkeypatch.setattr(charts, "ProcessPoolExecutor", lambda *a, **k: pytest.fail("pool inattendu"))
+        specs = [{"kind": "distribution", "annee": a} for a in (2025, 2030, 2035)]
+        pages = charts.render_charts(self._df(), specs, fmt="pdf")
+        assert len(pages) == 3 and all(p.startswith(b"%PDF") for p in pages)
+
+    def test_batch_export_cube_in_process_pool(self, tmp_path):
+        """⚙️ Vérifie le rendu en pool de processus depuis un cube rouvert par chemin."""
+        from utils.charts import export_charts_batch
+        from utils.results_cube import ResultsCube
+        df = self._df()
+        cube = ResultsCube.create(str(tmp_path / "cube.dat"), ["S1"], [1, 2, 3], range(2025, 2036))
+        for run in (1, 2, 3):
+            cube.write_run("S1", run, df[df["Simulation"] == run])
+        cube.flush()
+        specs = [{"kind": "distribution", "annee": a} for a in (2025, 2030, 2035)]
+        written = export_charts_batch(cube, specs, str(tmp_path / "png"), max_workers=2)
+        assert len(written) == 3
+        assert all((tmp_path / "png" / name).stat().st_size > 0 for name in written)
@@ -0,0 +1,81 @@
+"""
+test_downsample.py
+
+📉 Teste la réduction de points pour l'affichage (utils.downsample) et le niveau de détail
+du graphique hybride (ui.widgets.hybrid_graph_widget) :
+- LTTB : nombre de points, extrémités conservées, pics préservés
+- Min/max : extrema de chaque tranche conservés
+- 10 000 runs : moteur pyqtgraph automatique et budget de points respecté au zoom
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.downsample import lttb, minmax_decimate, visible_slice
+
+
+class TestDownsample:
+
+    def test_lttb_keeps_endpoints_and_peak(self):
+        """🧪 Vérifie que LTTB garde n points, les extrémités et le pic principal."""
+        x = np.arange(10_000, dtype=float)
+        y = np.sin(x / 500.0)
+        y[4321] = 50.0
+        kept = lttb(x, y, 200)
+        assert len(kept) == 200
+        assert kept[0] == 0 and kept[-1] == 9_999
+        assert 4321 in kept, "❌ Le pic doit survivre à la réduction"
+        assert np.all(np.diff(kept) > 0)
+        assert len(lttb(x[:50], y[:50], 200)) == 50
+
+    def test_minmax_keeps_extrema(self):
+        """📊 Vérifie que la décimation min/max conserve le minimum et le maximum global."""
+        rng = np.random.default_rng(0)
+        y = rng.normal(size=5_000)
+        kept = minmax_decimate(np.arange(5_000), y, 100)
+        assert len(kept) <= 101
+        assert int(np.argmin(y)) in kept and int(np.argmax(y)) in kept
+
+    def test_visible_slice_with_margin(self):
+        """🔍 Vérifie les bornes de la fenêtre visible (avec un point de marge)."""
+        x = np.arange(2025, 2036, dtype=float)
+        assert visible_slice(x, 2028, 2030) == (2, 7)
+        assert visible_slice(x, 1900, 3000) == (0, len(x))
+
+
+class TestHybridGraphLod:
+
+    def _runs_df(self, n_runs, years=11):
+        annees = np.arange(2025, 2025 + years)
+        return pd.DataFrame({
+            "Simulation": np.repeat(np.arange(1, n_runs + 1), years),
+            "Annee": np.tile(annees, n_runs),
+            "Reserve": np.random.default_rng(1).normal(size=n_runs * years),
+        })
+
+    def test_10000_runs_uses_pyqtgraph_within_budget(self, qtbot):
+        """🚀 Vérifie le moteur auto et le nombre de points tracés pour 10 000 runs."""
+        from ui.widgets.hybrid_graph_widget import HybridGraphWidget
+        widget = HybridGraphWidget(data=self._runs_df(10_000), show_runs=True)
+        qtbot.addWidget(widget)
+        assert widget.active_engine() == "pg"
+        (x, y), runs = widget.lod_series()
+        assert len(x) == 11
+        n_full = np.count_nonzero(~np.isnan(runs[1]))
+        assert n_full <= widget.max_points
+        # Zoom sur 3 années : davantage de runs pour le même budget
+        _, zoomed = widget.lod_series(2030, 2032)
+        assert len(zoomed[0]) // 6 > len(runs[0]) // 12
+        assert np.count_nonzero(~np.isnan(zoomed[1])) <= widget.max_points
+
+    def test_small_data_stays_on_matplotlib(self, qtbot):
+        """🎨 Vérifie que quelques runs restent sur matplotlib et se redessinent au zoom."""
+        from ui.widgets.hybrid_graph_widget import HybridGraphWidget
+        widget = HybridGraphWidget(data=self._runs_df(40), show_runs=True)
+        qtbot.addWidget(widget)
+        assert widget.active_engine() == "mpl"
+        ax = widget.current_widget().figure.axes[0]
+        ax.set_xlim(2027, 2029)
+        assert len(widget._lod_items["runs"].get_segments()) == 40
+        widget.toggle_engine()
+        assert widget.active_engine() == "pg"
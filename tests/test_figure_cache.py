@@ -0,0 +1,84 @@
+"""
+test_figure_cache.py
+
+🗃️ Teste le cache de graphiques (utils.figure_cache) :
+- Empreinte de contenu stable entre deux DataFrames identiques
+- Éviction LRU bornée en mémoire
+- Changement de thème : restyle des artistes sans reconstruction
+- Réouverture d'un graphique depuis l'onglet Réserve sans recalcul
+"""
+
+import numpy as np
+import pandas as pd
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+
+from ui.charts_window.tab_reserve import TabReserve
+from utils.figure_cache import FigureCache, data_fingerprint, filter_key
+
+
+def _df():
+    return pd.DataFrame({
+        "Simulation": np.repeat([1, 2], 3),
+        "Annee": np.tile([2025, 2026, 2027], 2),
+        "Reserve": [100.0, 110.0, 120.0, 90.0, 95.0, 99.0],
+    })
+
+
+def _figure():
+    fig = Figure(figsize=(2, 2), dpi=50)
+    ax = fig.add_subplot(111)
+    ax.plot([1, 2], [3, 4], label="Réserve")
+    ax.set_title("Titre")
+    ax.legend()
+    return fig
+
+
+class TestFigureCache:
+
+    def test_fingerprint_by_content(self):
+        """🧪 Vérifie que l'empreinte dépend du contenu, pas de l'objet."""
+        df = _df()
+        assert data_fingerprint(df) == data_fingerprint(_df())
+        other = _df()
+        other.loc[0, "Reserve"] = -1.0
+        assert data_fingerprint(other) != data_fingerprint(df)
+        assert filter_key({"annees": [2030], "query": ""}) == filter_key({"query": "", "annees": [2030]})
+
+    def test_lru_eviction_by_bytes(self):
+        """📦 Vérifie l'éviction de l'entrée la moins récemment utilisée au-delà du budget."""
+        evicted = []
+        cache = FigureCache(max_bytes=250, on_evict=evicted.append)
+        for name in ["a", "b"]:
+            cache.put(name, name, _figure(), dark_mode=False, nbytes=100)
+        assert cache.get("a") == "a"  # "a" devient la plus récente
+        cache.put("c", "c", _figure(), dark_mode=False, nbytes=100)
+        assert evicted == ["b"]
+        assert "a" in cache and "c" in cache and cache.total_bytes == 200
+
+    def test_theme_change_restyles_without_rebuild(self):
+        """🌗 Vérifie qu'un accès avec l'autre thème restyle la figure existante."""
+        cache = FigureCache()
+        calls = []
+        fig = _figure()
+        factory = lambda: calls.append(1) or fig
+        assert cache.get_or_create("k", factory, dark_mode=False, figure_of=lambda f: f) is fig
+        assert cache.get_or_create("k", factory, dark_mode=True, figure_of=lambda f: f) is fig
+        assert len(calls) == 1, "❌ La figure ne doit pas être reconstruite"
+        ax = fig.axes[0]
+        assert to_hex(ax.title.get_color()) == "#eeeeee"
+        assert to_hex(ax.get_legend().get_texts()[0].get_color()) == "#eeeeee"
+
+    def test_tab_reserve_reuses_graph_window(self, qtbot):
+        """🔁 Vérifie que rouvrir le même graphique réutilise la fenêtre existante."""
+        tab = TabReserve(_df())
+        qtbot.addWidget(tab)
+        tab.open_graph()
+        first = tab.graph_win
+        tab.open_graph()
+        assert tab.graph_win is first
+        tab.all_runs_check.setChecked(True)
+        tab.open_graph()
+        assert tab.graph_win is not first, "❌ Un autre mode doit produire une autre fenêtre"
+        first.close()
+        tab.graph_win.close()
@@ -58,3 +58,129 @@ class TestFileIO:
         """⚠️ Vérifie qu’une erreur est levée si le chemin est invalide."""
         with pytest.raises(Exception):
             fileio.write_csv("/invalid/path/test.csv", [["x"]])
+
+    def test_binary_npz_roundtrip_with_projection_and_filters(self):
+        """🧪 Vérifie l’export npz multi-scénarios, la projection de colonnes et le filtrage."""
+        import pandas as pd
+        df = pd.DataFrame({
+            "Annee": [2025, 2026, 2025, 2026],
+            "Simulation": [1, 1, 2, 2],
+            "Reserve": [1.0, 2.0, 3.0, 4.0],
+        })
+        scenarios = {"Scénario 1": df, "Scénario 2": df.assign(Reserve=df["Reserve"] * 10)}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.npz")
+            assert fileio.export_results_binary(scenarios, path), "❌ Export npz échoué"
+
+            full = fileio.load_results_file(path)
+            assert list(full.columns) == ["Scenario", "Annee", "Simulation", "Reserve"]
+            assert len(full) == 8
+
+            subset = fileio.read_results_binary(
+                path, columns=["Annee", "Reserve"], scenarios=["Scénario 2"], annees=[2026]
+            )
+            assert list(subset.columns) == ["Annee", "Reserve"]
+            assert subset["Reserve"].tolist() == [20.0, 40.0]
+
+    def test_binary_unknown_extension_returns_false(self):
+        """⚠️ Vérifie qu’une extension inconnue est refusée sans exception."""
+        import pandas as pd
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.bin")
+            assert fileio.export_results_binary(pd.DataFrame({"a": [1]}), path) is False
+
+    def test_binary_formats_follow_pyarrow_availability(self, monkeypatch):
+        """📦 Vérifie que Parquet/Feather ne sont proposés et exportés que si pyarrow est installé."""
+        import pandas as pd
+        monkeypatch.setattr(fileio, "HAS_PYARROW", True)
+        assert "*.parquet" in fileio.results_export_filter() and "*.feather" in fileio.results_export_filter()
+
+        monkeypatch.setattr(fileio, "HAS_PYARROW", False)
+        assert fileio.available_binary_formats() == ["npz"]
+        assert "parquet" not in fileio.results_export_filter().lower()
+        assert "feather" not in fileio.results_export_filter().lower()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.parquet")
+            assert fileio.export_results_binary(pd.DataFrame({"a": [1]}), path) is False
+            assert not os.path.exists(path)
+
+    def test_csv_header_and_chunks(self):
+        """🧪 Vérifie la lecture de l’en-tête seul et la lecture par blocs avec types compacts."""
+        data = [["Annee", "Simulation", "Reserve"]] + [[2025 + i % 11, i // 11 + 1, float(i)] for i in range(55)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "gros.csv")
+            fileio.write_csv(file_path, data)
+
+            assert fileio.read_csv_header(file_path) == ["Annee", "Simulation", "Reserve"]
+
+            chunks = list(fileio.iter_csv_chunks(file_path, chunksize=20))
+            assert [len(c) for c, _ in chunks] == [20, 20, 15]
+            assert chunks[-1][1] == 1.0, "❌ La progression finale doit valoir 1"
+            assert str(chunks[0][0]["Annee"].dtype) == "int16"
+
+    def test_single_csv_export_keeps_compact_schema(self):
+        """🧪 Vérifie que l’export multi-scénarios puis l’import restituent le schéma compact."""
+        from core.schema import apply_result_schema
+        import pandas as pd
+        df = apply_result_schema(pd.DataFrame({
+            "Annee": [2025, 2026],
+            "Simulation": [1, 1],
+            "Reserve": [1.0, 2.0],
+        }))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.csv")
+            assert fileio.export_dataframe_to_csv({"S1": df, "S2": df}, path, mode="single")
+
+            back = fileio.load_results_file(path)
+            assert back["Scenario"].tolist() == ["S1", "S1", "S2", "S2"]
+            assert str(back["Scenario"].dtype) == "category"
+            assert str(back["Annee"].dtype) == "int16"
+            assert str(back["Simulation"].dtype) == "int32"
+
+    def test_streaming_csv_export_chunks_and_gzip(self):
+        """🧪 Vérifie l’écriture en flux multi-scénarios : en-tête unique, blocs, gzip et renommage atomique."""
+        import gzip
+        import pandas as pd
+        df1 = pd.DataFrame({"Annee": [2025, 2026, 2027], "Reserve": [1.0, 2.0, 3.0]})
+        df2 = pd.DataFrame({"Annee": [2025], "Reserve": [4.0], "Deficit": [True]})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.csv")
+            n = fileio.write_scenarios_csv({"S1": df1, "vide": pd.DataFrame(), "S, 2": df2}, path, chunksize=2)
+            assert n == 4
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            assert lines[0] == "Scenario,Annee,Reserve,Deficit", "❌ En-tête écrit une seule fois, colonnes unies"
+            assert lines[1:] == ["S1,2025,1.0,", "S1,2026,2.0,", "S1,2027,3.0,", '"S, 2",2025,4.0,True']
+
+            gz_path = os.path.join(temp_dir, "etude.csv.gz")
+            assert fileio.export_dataframe_to_csv({"S1": df1, "S2": df1}, gz_path, mode="single")
+            with gzip.open(gz_path, "rt", encoding="utf-8") as f:
+                assert f.readline().strip() == "Scenario,Annee,Reserve"
+            back = fileio.load_results_file(gz_path)
+            assert back["Scenario"].tolist() == ["S1"] * 3 + ["S2"] * 3
+            assert back["Reserve"].tolist() == [1.0, 2.0, 3.0] * 2
+            assert sorted(os.listdir(temp_dir)) == ["etude.csv", "etude.csv.gz"], "❌ Aucun .tmp ne doit subsister"
+
+            with pytest.raises(ValueError):
+                fileio.write_scenarios_csv({"S1": df1}, path, compression="bz2")
+
+    def test_streaming_csv_mismatched_columns_round_trip(self):
+        """🧪 Vérifie le relu d’un export dont les scénarios n’ont pas les mêmes colonnes (et une colonne Scenario existante)."""
+        import pandas as pd
+        df1 = pd.DataFrame({"Scenario": ["ancien"] * 2, "Annee": [2025, 2026], "Simulation": [1, 1],
+                            "TotEmp": [10, 11], "Reserve": [1.0, 2.0]})
+        df2 = pd.DataFrame({"Annee": [2025, 2026], "Simulation": [1, 1], "Reserve": [3.0, 4.0]})
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.csv")
+            assert fileio.export_dataframe_to_csv({"S1": df1, "S2": df2}, path, mode="single")
+            assert fileio.read_csv_header(path) == ["Scenario", "Annee", "Simulation", "TotEmp", "Reserve"]
+
+            back = pd.concat([c for c, _ in fileio.iter_csv_chunks(path, chunksize=3)], ignore_index=True)
+            assert back["Scenario"].tolist() == ["S1", "S1", "S2", "S2"]
+            assert back["TotEmp"].tolist()[:2] == [10, 11] and back["TotEmp"].isna().sum() == 2
+            assert fileio.load_results_file(path)["Reserve"].tolist() == [1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,61 @@
+"""
+test_filtered_view.py
+
+🧮 Teste le moteur de filtrage partagé (utils.filtered_view) :
+- Intersections d'index par année, simulation, scénario et recherche texte
+- Absence de copie quand aucun filtre n'est actif
+- Vue unique partagée pour un même DataFrame
+"""
+
+import pandas as pd
+
+from utils.filtered_view import FilteredView, get_filtered_view
+
+
+def _df():
+    return pd.DataFrame({
+        "Scenario": pd.Categorical(["A", "A", "B", "B", "B", "A"]),
+        "Annee": [2025, 2026, 2025, 2026, 2025, 2025],
+        "Simulation": [1, 1, 1, 1, 2, 2],
+        "Reserve": [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+    })
+
+
+class TestFilteredView:
+
+    def test_intersection_of_group_indices(self):
+        """🧪 Vérifie les intersections de filtres (année × simulation × scénario)."""
+        view = FilteredView(_df())
+        assert view.values("Annee") == [2025, 2026]
+        assert view.positions(annees=[2025]).tolist() == [0, 2, 4, 5]
+        assert view.select(annees=[2025], simulations=[2])["Reserve"].tolist() == [50.0, 60.0]
+        assert view.select(annees=[2025], scenarios=["A"], simulations=[1, 2])["Reserve"].tolist() == [10.0, 60.0]
+        assert view.count(annees=[2030]) == 0
+
+    def test_query_and_no_filter(self):
+        """🔎 Vérifie la recherche texte et le retour du DataFrame d'origine sans filtre."""
+        df = _df()
+        view = FilteredView(df)
+        assert view.select() is df, "❌ Sans filtre, aucune copie ne doit être faite"
+        assert view.select(query="50.0")["Simulation"].tolist() == [2]
+        assert view.count(annees=[2026], query="b") == 1
+
+    def test_view_shared_per_dataframe(self):
+        """♻️ Vérifie que tous les onglets obtiennent la même vue pour un même DataFrame."""
+        df = _df()
+        assert get_filtered_view(df) is get_filtered_view(df)
+        assert get_filtered_view(df) is not get_filtered_view(_df())
+
+    def test_shared_view_releases_dataframe(self):
+        """🧹 Vérifie que la vue partagée ne maintient pas le DataFrame en vie (pas de fuite mémoire)."""
+        import gc
+        import weakref
+        from utils import filtered_view
+        df = _df()
+        key = id(df)
+        assert len(get_filtered_view(df).select(annees=[2025], query="a")) == 2
+        ref = weakref.ref(df)
+        del df
+        gc.collect()
+        assert ref() is None, "❌ Le DataFrame doit être libéré après del"
+        assert key not in filtered_view._VIEWS
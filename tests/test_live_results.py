@@ -0,0 +1,73 @@
+"""
+test_live_results.py
+
+📡 Teste la source de résultats en direct (utils.live_results) :
+- Moyenne et IC incrémentaux identiques au calcul sur l'ensemble des runs
+- Version et nombre de runs incrémentés à chaque ajout
+- Rafraîchissement du graphique en direct (LiveChartWidget)
+"""
+
+import numpy as np
+import pandas as pd
+
+from ui.widgets.live_chart_widget import LiveChartWidget
+from utils.live_results import LiveResults
+from utils.stats import intervalle_confiance_reserve
+
+ANNEES = [2025, 2026, 2027]
+
+
+def _run(simulation_id, rng):
+    return pd.DataFrame({
+        "Simulation": simulation_id,
+        "Annee": ANNEES,
+        "Reserve": rng.normal(1e6, 5e4, len(ANNEES)),
+    })
+
+
+class TestLiveResults:
+
+    def test_incremental_matches_full_computation(self):
+        """🧮 Vérifie que moyenne et IC incrémentaux égalent le calcul complet."""
+        rng = np.random.default_rng(0)
+        live = LiveResults()
+        assert live.snapshot() is None
+        for sim_id in range(1, 6):
+            live.append_run(sim_id, _run(sim_id, rng))
+        snap = live.snapshot()
+        df = live.to_dataframe()
+        assert snap["n_runs"] == live.n_runs == 5
+        assert snap["version"] == 5
+        moyennes = df.groupby("Annee")["Reserve"].mean().to_numpy()
+        assert np.allclose(snap["moyenne"], moyennes)
+        for i, annee in enumerate(ANNEES):
+            bas, haut = intervalle_confiance_reserve(df, annee)
+            assert np.isclose(snap["ic_bas"][i], bas)
+            assert np.isclose(snap["ic_haut"][i], haut)
+
+    def test_single_run_has_degenerate_interval(self):
+        """1️⃣ Vérifie qu'avec un seul run l'IC se réduit à la moyenne."""
+        live = LiveResults()
+        live.append_run(1, _run(1, np.random.default_rng(1)))
+        snap = live.snapshot()
+        assert np.array_equal(snap["ic_bas"], snap["moyenne"])
+        assert np.array_equal(snap["ic_haut"], snap["moyenne"])
+
+    def test_live_chart_redraws_only_on_new_runs(self, qtbot):
+        """📈 Vérifie que le graphique suit les runs reçus et ignore les rafraîchissements inutiles."""
+        rng = np.random.default_rng(2)
+        live = LiveResults(expected_runs=40)
+        widget = LiveChartWidget(live, interval_ms=10_000)
+        qtbot.addWidget(widget)
+        widget.refresh()
+        assert len(widget.mean_line.get_xdata()) == 0
+        live.append_run(1, _run(1, rng))
+        live.append_run(2, _run(2, rng))
+        widget.refresh()
+        assert list(widget.mean_line.get_xdata()) == ANNEES
+        assert "2/40" in widget.runs_label.text()
+        errorbars = widget._errorbars
+        widget.refresh()
+        assert widget._errorbars is errorbars, "❌ Pas de nouveau run : rien à redessiner"
+        widget.stop()
+        assert not widget.timer.isActive()
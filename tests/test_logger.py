@@ -6,6 +6,9 @@ test_logger.py
 - Vérifie les niveaux de logs (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 - Vérifie la création d’un fichier de log temporaire
 - Vérifie que les loggers enfants héritent correctement du parent
+- Vérifie l'écriture asynchrone (file d'attente) et la rotation des fichiers
+- Vérifie que les logs du chemin critique (Employee) sont formatés paresseusement
+- Vérifie les filtres de volume : échantillonnage, limitation de débit, résumé agrégé
 
 🛡️ Ce test garantit que tous les modules du projet peuvent journaliser
 de manière fiable et cohérente.
@@ -16,6 +19,10 @@ import tempfile
 import logging
 import pytest
 from utils import logger
+from core.employee import Employee
+from core.retiree import Retiree
+from core.scenario import SCENARIOS
+from core.logger import entity_logger, log_entity_summary, ENTITY_EVENTS
 
 
 class TestLogger:
@@ -72,3 +79,86 @@ class TestLogger:
             child_logger.info("Child log message")
 
         assert "Child log message" in caplog.text, "❌ Le logger enfant n’a pas loggé correctement"
+
+    def test_async_rotating_file_handler(self, tmp_path):
+        """🧪 Vérifie l'écriture via le thread d'écriture et la rotation du fichier."""
+        path = tmp_path / "rot.log"
+        logger.add_file_handler(str(path), level="DEBUG", max_bytes=2000, backup_count=2)
+        log = logger.get_logger("rotation")
+        for i in range(100):
+            log.warning("Ligne de rotation %d", i)
+        logger.flush_handlers()
+        assert path.exists(), "❌ Fichier de log non créé"
+        assert (tmp_path / "rot.log.1").exists(), "❌ Aucune rotation effectuée"
+        assert "Ligne de rotation 99" in path.read_text(encoding="utf-8")
+        handler = next(h for h in logger._all_handlers() if getattr(h, "baseFilename", "") == str(path))
+        if logger._listener is not None:
+            logger._listener.handlers = tuple(h for h in logger._listener.handlers if h is not handler)
+        logger.logger.removeHandler(handler)
+        handler.close()
+
+    def test_sync_file_handler_is_not_batched(self, tmp_path, monkeypatch):
+        """🧪 Vérifie que, sans thread d'écriture, chaque message est écrit immédiatement (rien en tampon)."""
+        monkeypatch.setattr(logger, "_listener", None)
+        path = tmp_path / "sync.log"
+        logger.add_file_handler(str(path), level="DEBUG")
+        handler = next(h for h in logger.logger.handlers if getattr(h, "baseFilename", "") == str(path))
+        try:
+            assert not isinstance(handler, logger.BatchedFileHandler)
+            logger.get_logger("sync").warning("Dernière ligne avant arrêt brutal")
+            assert "Dernière ligne avant arrêt brutal" in path.read_text(encoding="utf-8")
+        finally:
+            logger.logger.removeHandler(handler)
+            handler.close()
+
+    def test_hot_path_logs_are_lazy(self, caplog):
+        """🧪 Vérifie que les messages du chemin critique sont passés en arguments (formatage différé)."""
+        emp = Employee(1, 40, 8000.0, 2010)
+        with caplog.at_level(logging.DEBUG, logger="app"):
+            emp.avancer_age()
+        record = next(r for r in caplog.records if "vieillit" in r.getMessage())
+        assert record.args == (1, 41, 16), "❌ Le message ne doit pas être pré-formaté"
+        assert "Employé #1 vieillit → 41 ans" in record.getMessage()
+
+    def test_sampling_and_rate_limit_filters(self, caplog):
+        """🧪 Vérifie l'échantillonnage 1/N et la limitation de débit par modèle de message."""
+        log = logger.get_logger("volume")
+        logger.set_log_filter(log, "sample:10")
+        with caplog.at_level(logging.DEBUG, logger="app"):
+            for i in range(100):
+                log.debug("Événement %d", i)
+            log.warning("Avertissement conservé")
+        kept = [r for r in caplog.records if r.name == "app.volume"]
+        assert len(kept) == 11, "❌ 1 message sur 10 attendu (+ l'avertissement)"
+
+        caplog.clear()
+        logger.set_log_filter(log, "rate:0.001/5")
+        with caplog.at_level(logging.DEBUG, logger="app"):
+            for i in range(50):
+                log.debug("Rafale %d", i)
+        assert len([r for r in caplog.records if r.name == "app.volume"]) == 5
+        logger.set_log_filter(log, "all")
+        assert not log.filters
+
+    def test_entity_summary_aggregates_per_year(self, caplog):
+        """🧪 Vérifie le résumé agrégé des événements par entité (mode summary)."""
+        summary = logger.set_log_filter(entity_logger, "summary", labels=ENTITY_EVENTS)
+        try:
+            with caplog.at_level(logging.DEBUG, logger="app"):
+                employes = [Employee(i, 62, 8000.0, 2000) for i in range(3)]
+                for emp in employes:
+                    emp.avancer_age()
+                    emp.augmenter_salaire()
+                    emp.cotisation(SCENARIOS[1].get_taux_cotisation(emp.salaire))
+                    if emp.est_a_la_retraite(63):
+                        Retiree(emp.id, emp.age, emp.salaire, emp.annees_travaillees)
+                SCENARIOS[1].get_taux_cotisation(50_000)
+                assert set(summary.counts()) <= set(ENTITY_EVENTS.values()), "❌ Modèle de message sans libellé"
+                assert not [r for r in caplog.records if r.name == "app.core.entities"]
+                log_entity_summary("Année 2026")
+            lines = [r.getMessage() for r in caplog.records if r.name == "app.core"]
+            assert any("Année 2026 : 3 employés créés, 3 employés vieillis" in line for line in lines)
+            assert any("3 départs en retraite" in line for line in lines)
+            assert summary.counts() == {}
+        finally:
+            logger.set_log_filter(entity_logger, "all")
@@ -0,0 +1,99 @@
+"""
+test_pdf_export.py
+
+📑 Teste la génération du rapport PDF (utils.pdf_export) :
+- Assemblage en mémoire (octets retournés, figures fusionnées)
+- Écriture atomique du fichier final, sans fichier temporaire résiduel
+- Pages de graphiques rendues en parallèle depuis des spécifications, dans l'ordre
+- Grands tableaux découpés en blocs (en-tête répété), tronqués ou résumés au-delà d'une taille
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from PyPDF2 import PdfReader
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, Table
+
+from utils.fileio import export_pdf_file
+from utils.pdf_export import export_report_to_pdf, _stats_table
+
+
+def _figure():
+    fig = Figure(figsize=(3, 2))
+    fig.add_subplot(111).plot([2025, 2026], [1.0, 2.0])
+    return fig
+
+
+def _pages(pdf_bytes):
+    return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+class TestPdfExport:
+
+    def test_report_built_in_memory(self):
+        """🧪 Vérifie que path=None retourne les octets du rapport, figures incluses."""
+        stats = [("Statistiques globales", {"Runs": 40})]
+        pdf_bytes = export_report_to_pdf(path=None, figures=[_figure(), _figure()], stats=stats, summary="Résumé")
+        assert pdf_bytes.startswith(b"%PDF")
+        sans_figures = export_report_to_pdf(path=None, stats=stats, summary="Résumé")
+        assert _pages(pdf_bytes) == _pages(sans_figures) + 2, "❌ Une page par figure attendue"
+
+    def test_report_written_atomically(self, tmp_path):
+        """🧪 Vérifie l'écriture du fichier final seul, sans fichiers temporaires."""
+        path = tmp_path / "rapport.pdf"
+        assert export_report_to_pdf(path=str(path), figures=[_figure()]) is True
+        assert os.listdir(tmp_path) == ["rapport.pdf"]
+        assert path.read_bytes().startswith(b"%PDF")
+
+    def test_export_pdf_file_failure_leaves_target_untouched(self, tmp_path):
+        """🧪 Vérifie qu'un échec d'écriture ne tronque pas un PDF existant."""
+        path = tmp_path / "rapport.pdf"
+        path.write_bytes(b"%PDF ancien")
+        assert export_pdf_file(None, str(path)) is False
+        assert path.read_bytes() == b"%PDF ancien"
+        assert os.listdir(tmp_path) == ["rapport.pdf"]
+        assert export_pdf_file(io.BytesIO(b"%PDF nouveau"), str(path)) is True
+        assert path.read_bytes() == b"%PDF nouveau"
+
+    def test_chart_specs_rendered_in_parallel_and_in_order(self):
+        """🧪 Vérifie le rendu des spécifications en pool de processus, une page chacune, dans l'ordre."""
+        df = pd.DataFrame({
+            "Simulation": np.repeat([1, 2, 3], 11),
+            "Annee": np.tile(np.arange(2025, 2036), 3),
+            "Reserve": np.linspace(100.0, 10.0, 33),
+        })
+        specs = [{"kind": "distribution", "annee": a} for a in (2025, 2030, 2035)]
+        specs.insert(1, {"kind": "evolution", "simulation_id": 99})  # En échec : ignorée
+        base = export_report_to_pdf(path=None, summary="Résumé")
+        pdf_bytes = export_report_to_pdf(path=None, summary="Résumé", chart_source=df, chart_specs=specs, max_workers=2)
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        pages = reader.pages[_pages(base):]
+        assert len(pages) == 3
+        assert ["2025" in p.extract_text() for p in pages] == [True, False, False]
+        assert "2035" in pages[-1].extract_text()
+
+    def test_large_table_chunked_with_repeated_header(self):
+        """🧪 Vérifie le découpage en blocs, l'en-tête répété et le formatage des nombres."""
+        df = pd.DataFrame({"Annee": np.arange(450), "Reserve": np.linspace(0.0, 1.0, 450)})
+        df.loc[3, "Reserve"] = np.nan
+        tables = _stats_table(df, getSampleStyleSheet(), chunk_rows=200)
+        assert [len(t._cellvalues) for t in tables] == [201, 201, 51]
+        assert all(t._cellvalues[0] == ["Annee", "Reserve"] for t in tables)
+        assert tables[0]._cellvalues[1] == ["0", "0.00"]
+        assert tables[0]._cellvalues[4] == ["3", ""]
+
+    def test_table_truncated_or_summarized_above_max_rows(self):
+        """🧪 Vérifie la troncature (avec note) ou le résumé statistique au-delà de max_rows."""
+        styles = getSampleStyleSheet()
+        df = pd.DataFrame({"Reserve": np.arange(1000, dtype=float)})
+        flowables = _stats_table(df, styles, max_rows=300)
+        tables = [f for f in flowables if isinstance(f, Table)]
+        assert sum(len(t._cellvalues) - 1 for t in tables) == 300
+        assert isinstance(flowables[-1], Paragraph) and "700" in flowables[-1].getPlainText()
+        summary = _stats_table(df, styles, max_rows=300, overflow="summary")
+        assert summary[0]._cellvalues[0][:3] == ["Colonne", "count", "mean"]
+        assert len(summary[0]._cellvalues) == 2
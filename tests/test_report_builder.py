@@ -0,0 +1,138 @@
+"""
+test_report_builder.py
+
+🧾 Teste la construction du rapport sans interface (utils.report_builder) :
+- Statistiques, résumé et figures calculés directement depuis les données
+- Agrégats réutilisés d'un rapport à l'autre sur les mêmes résultats
+- Aucun module Qt chargé par un script qui génère un rapport
+- Régénération incrémentale : seules les sections dont les entrées changent sont re-rendues
+- Graphiques du rapport rendus ensemble dans le pool de processus de utils.charts
+"""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import pandas as pd
+from PyPDF2 import PdfReader
+
+from utils import report_builder
+from utils.report_builder import ReportBuilder
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _df(offset=0.0):
+    return pd.DataFrame({
+        "Simulation": np.repeat([1, 2, 3], 11),
+        "Annee": np.tile(np.arange(2025, 2036), 3),
+        "Reserve": np.linspace(100.0, 10.0, 33) + offset,
+        "TotEmp": 10_000,
+    })
+
+
+class TestReportBuilder:
+
+    def test_content_from_data(self):
+        """🧪 Vérifie résumé, statistiques et figures calculés depuis les données."""
+        df = _df()
+        builder = ReportBuilder(df, {"S1": df, "S2": _df(50.0)})
+        summary = builder.summary()
+        assert "Réserve moyenne finale (2035)" in summary
+        assert "Nombre de simulations : 3" in summary
+        titles = [title for title, _ in builder.stats()]
+        assert titles == ["Réserve moyenne", "Réserve finale par scénario",
+                          "Intervalles de confiance à 95%", "Résultats annuels moyens"]
+        assert len(builder.figures()) == 3
+        table = builder.confidence_table()
+        assert list(table["Annee"]) == list(range(2025, 2036))
+        assert np.allclose(table["Moyenne"], df.groupby("Annee")["Reserve"].mean())
+
+    def test_missing_scenarios_skip_comparison(self):
+        """🧪 Vérifie que la comparaison est ignorée sans données multi-scénarios."""
+        builder = ReportBuilder(_df(), None)
+        assert "comparaison" not in builder.available_parts()
+        assert len(builder.figures()) == 2
+
+    def test_aggregates_cached_by_content(self, monkeypatch):
+        """🧪 Vérifie que deux rapports sur les mêmes données réutilisent les agrégats."""
+        calls = []
+        original = report_builder.intervalle_confiance_reserve
+        monkeypatch.setattr(report_builder, "intervalle_confiance_reserve",
+                            lambda *a, **k: calls.append(1) or original(*a, **k))
+        df = _df(7.0)
+        ReportBuilder(df).confidence_table()
+        ReportBuilder(df.copy()).confidence_table()
+        assert len(calls) == 11, "❌ L'IC ne doit être calculé qu'une fois par année"
+
+    def test_headless_script_without_qt(self, tmp_path):
+        """🧪 Vérifie qu'un script génère le PDF sans charger PyQt5."""
+        out = tmp_path / "rapport.pdf"
+        script = (
+            "import sys, numpy as np, pandas as pd\n"
+            "from utils.report_builder import ReportBuilder\n"
+            "df = pd.DataFrame({'Simulation': np.repeat([1, 2], 11), 'Annee': np.tile(np.arange(2025, 2036), 2),"
+            " 'Reserve': np.arange(22.0)})\n"
+            f"assert ReportBuilder(df).export_pdf({str(out)!r}) is True\n"
+            "assert not any(m.startswith('PyQt5') for m in sys.modules), 'Qt chargé'\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr[-2000:]
+        assert out.read_bytes().startswith(b"%PDF")
+
+    def test_incremental_export_rerenders_only_stale_sections(self, tmp_path, monkeypatch):
+        """🧪 Vérifie la réutilisation des fragments en cache et le re-rendu des seules sections modifiées."""
+        rendered = []
+        for name in ("summary_pdf", "stats_pdf"):
+            original = getattr(report_builder, name)
+            monkeypatch.setattr(report_builder, name,
+                                lambda *a, _name=name, _f=original, **k: rendered.append(_name) or _f(*a, **k))
+        render_charts = report_builder.render_charts
+        monkeypatch.setattr(report_builder, "render_charts",
+                            lambda source, specs, **k: rendered.extend(["chart"] * len(specs)) or render_charts(source, specs, **k))
+        cache_dir = str(tmp_path / "cache")
+        df = _df(3.0)
+        scenarios = {"S1": df, "S2": _df(50.0)}
+        first = ReportBuilder(df, scenarios).export_pdf(None, cache_dir=cache_dir)
+        assert sorted(rendered) == ["chart"] * 3 + ["stats_pdf", "summary_pdf"]
+
+        rendered.clear()
+        second = ReportBuilder(df.copy(), dict(scenarios)).export_pdf(None, cache_dir=cache_dir)
+        assert rendered == [], "❌ Aucune section ne doit être re-rendue"
+        assert len(PdfReader(io.BytesIO(second)).pages) == len(PdfReader(io.BytesIO(first)).pages)
+
+        rendered.clear()
+        ReportBuilder(df, {**scenarios, "S2": _df(60.0)}).export_pdf(None, cache_dir=cache_dir)
+        assert sorted(rendered) == ["chart", "stats_pdf"], "❌ Seules la comparaison et les stats changent"
+
+    def test_report_charts_rendered_in_process_pool(self, monkeypatch):
+        """⚙️ Vérifie que les graphiques d'un rapport multi-graphiques passent par le pool de processus."""
+        from utils import charts
+        pools = []
+
+        class RecordingPool(charts.ProcessPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                pools.append(kwargs.get("max_workers"))
+                super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(charts, "ProcessPoolExecutor", RecordingPool)
+        builder = ReportBuilder(_df(), {"S1": _df(), "S2": _df(50.0)})
+        without_figures = builder.export_pdf(None, sections=["summary", "stats"])
+        pdf_bytes = builder.export_pdf(None, max_workers=2)
+
+        assert pools == [2], "❌ Les 3 graphiques doivent être rendus par un seul pool"
+        pages = PdfReader(io.BytesIO(pdf_bytes)).pages
+        assert len(pages) == len(PdfReader(io.BytesIO(without_figures)).pages) + 3
+        assert "Comparaison multi-scénarios" in pages[-2].extract_text()
+
+    def test_default_report_renders_charts_in_process(self, monkeypatch):
+        """⚡ Vérifie qu'un rapport des dialogues (max_workers par défaut) ne démarre aucun pool."""
+        from utils import charts
+        pools = []
+        monkeypatch.setattr(charts, "ProcessPoolExecutor", lambda *a, **k: pools.append(k) or pytest.fail("pool"))
+        pdf_bytes = ReportBuilder(_df(), {"S1": _df(), "S2": _df(50.0)}).export_pdf(None)
+        assert pools == []
+        assert len(PdfReader(io.BytesIO(pdf_bytes)).pages) >= 4
@@ -0,0 +1,117 @@
+"""
+test_result_store.py
+
+🗄️ Teste le stock de résultats SQLite (utils.result_store) :
+- Insertion multi-scénarios en une transaction et filtrage indexé
+- Pagination par clé (keyset) et LIMIT/OFFSET
+- Onglet filtré alimenté par le stock (pages, filtres et recherche texte en SQL)
+- Ouverture d’un .sqlite depuis la fenêtre d’import sans chargement complet
+"""
+
+import os
+
+import pandas as pd
+
+from utils.result_store import ResultStore
+from ui.tabs_shared.base_tab_filtered import BaseTabFiltered
+
+
+def _fake_runs(n_runs=4, years=(2025, 2026, 2027)):
+    return pd.DataFrame([
+        {"Annee": annee, "Simulation": run, "TotEmp": 100 + run, "Reserve": run * 1000.0 + i}
+        for run in range(1, n_runs + 1)
+        for i, annee in enumerate(years)
+    ])
+
+
+class TestResultStore:
+
+    def test_insert_and_filtered_query(self, tmp_path):
+        """🧪 Vérifie l'insertion multi-scénarios et les filtres (scénario, année, run)."""
+        df = _fake_runs()
+        with ResultStore.from_dataframe({"S1": df, "S2": df}, str(tmp_path / "etude.sqlite")) as store:
+            assert store.count() == 24
+            assert store.distinct("Scenario") == ["S1", "S2"]
+
+            sub = store.query(scenarios=["S2"], annees=[2026], simulations=[2, 3])
+            assert sub["Reserve"].tolist() == [2001.0, 3001.0]
+            assert str(sub["Annee"].dtype) == "int16"
+            assert str(sub["Scenario"].dtype) == "category"
+            assert store.count(annees=[]) == 0
+            assert store.query(scenarios=[], annees=[2026]).empty
+
+    def test_keyset_and_offset_paging(self, tmp_path):
+        """📄 Vérifie que les pages keyset et LIMIT/OFFSET couvrent toutes les lignes, dans l'ordre."""
+        df = _fake_runs(n_runs=5)
+        with ResultStore.from_dataframe(df, str(tmp_path / "etude.sqlite")) as store:
+            pages, key = [], 0
+            while True:
+                page, key = store.fetch_page(4, after=key, annees=[2025, 2027])
+                if page.empty:
+                    break
+                pages.append(page)
+            assert [len(p) for p in pages] == [4, 4, 2]
+            assert pd.concat(pages)["Simulation"].tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+            assert store.query(limit=3, offset=3)["Simulation"].tolist() == [2, 2, 2]
+
+    def test_filtered_tab_pages_through_store(self, qtbot, tmp_path):
+        """🖥️ Vérifie que l'onglet filtré interroge le stock page par page."""
+        path = str(tmp_path / "etude.sqlite")
+        store = ResultStore.from_dataframe(_fake_runs(n_runs=4), path)
+        tab = BaseTabFiltered(store)
+        tab.page_size = 5
+        qtbot.addWidget(tab)
+
+        tab.apply_filters()
+        assert len(tab.filtered_data) == 5
+        assert tab.next_btn.isEnabled() and not tab.prev_btn.isEnabled()
+
+        tab.next_page()
+        assert len(tab.filtered_data) == 5
+        tab.year_combo.setCurrentText("2026")
+        assert tab.filtered_data["Annee"].unique().tolist() == [2026]
+        assert len(tab.filtered_data) == 4
+        store.close()
+        assert os.path.exists(path)
+
+    def test_text_search_is_paged_in_sql(self, qtbot, tmp_path):
+        """🔎 Vérifie que la recherche texte est filtrée en SQL : pages pleines, total et export cohérents."""
+        df = _fake_runs(n_runs=12)
+        path = str(tmp_path / "etude.sqlite")
+        store = ResultStore.from_dataframe({"S1": df, "S2": df}, path)
+        assert store.count(text="s2") == 36
+        assert store.count(text="2026", scenarios=["S1"]) == 12
+        assert store.count(text="%") == 0, "❌ Les jokers LIKE doivent être échappés"
+
+        tab = BaseTabFiltered(store)
+        tab.page_size = 10
+        qtbot.addWidget(tab)
+        tab.search_edit.setText("S2")
+        assert len(tab.filtered_data) == 10
+        assert set(tab.filtered_data["Scenario"]) == {"S2"}
+        assert "36 lignes" in tab.page_label.text()
+
+        sizes = [len(tab.filtered_data)]
+        while tab.next_btn.isEnabled():
+            tab.next_page()
+            sizes.append(len(tab.filtered_data))
+        assert sizes == [10, 10, 10, 6]
+        assert len(store.query(**tab._store_filters())) == 36
+        store.close()
+
+    def test_import_window_opens_store_without_loading(self, qtbot, tmp_path):
+        """🗂️ Vérifie que l'ouverture d'un .sqlite branche le stock sur l'onglet filtré (pas de DataFrame complet)."""
+        from ui.csv_import_window.csv_import_window import CSVImportWindow
+
+        path = str(tmp_path / "etude.sqlite")
+        ResultStore.from_dataframe({"S1": _fake_runs()}, path).close()
+        window = CSVImportWindow()
+        qtbot.addWidget(window)
+        window.open_store(path)
+
+        assert window.data is None and window.store is not None
+        filtered = window.tabs.widget(2)._inner
+        assert filtered.store is window.store
+        assert window.tabs.widget(1)._inner.data["Annee"].tolist() == [2025, 2026, 2027]
+        window.close()
+        assert window.store is None
@@ -0,0 +1,84 @@
+"""
+test_results_cube.py
+
+🧊 Teste le cube de résultats memmap (utils.results_cube) :
+- Création, écriture par run et réouverture depuis le disque
+- Lecture d'une année sur tous les runs (vue sans copie)
+- Conversion aller-retour avec le format DataFrame long (schéma compact)
+- Lecture sans scénario refusée sur un cube multi-scénarios
+- Intégration avec les statistiques (IC réserve)
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import stats
+from utils.results_cube import ResultsCube
+
+
+def _fake_runs(n_runs=3, years=(2025, 2026, 2027)):
+    rows = []
+    for run in range(1, n_runs + 1):
+        for i, annee in enumerate(years):
+            rows.append({"TotEmp": 100 + run, "Reserve": run * 1000.0 + i, "Annee": annee, "Simulation": run})
+    return pd.DataFrame(rows)
+
+
+class TestResultsCube:
+
+    def test_roundtrip_dataframe(self):
+        """🧪 Vérifie la conversion DataFrame → cube → DataFrame."""
+        df = _fake_runs()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.cube")
+            ResultsCube.from_dataframe(df, path)
+
+            cube = ResultsCube.open(path)
+            back = cube.to_dataframe()
+            assert len(back) == len(df)
+            assert back["Reserve"].tolist() == df["Reserve"].tolist()
+            assert back["Simulation"].tolist() == df["Simulation"].tolist()
+            del cube
+
+    def test_year_slice_is_view(self):
+        """🧪 Vérifie que la tranche d'une année est une vue sur le memmap."""
+        df = _fake_runs()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "etude.cube")
+            cube = ResultsCube.from_dataframe(df, path)
+            reserves = cube.year_slice(2026)
+            assert np.shares_memory(reserves, cube.data), "❌ La tranche devrait être une vue"
+            assert reserves.tolist() == [1001.0, 2001.0, 3001.0]
+            del reserves, cube
+
+    def test_stats_accept_cube(self):
+        """📈 Vérifie que l'IC réserve se calcule directement sur le cube."""
+        df = _fake_runs(n_runs=5)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cube = ResultsCube.from_dataframe(df, os.path.join(temp_dir, "etude.cube"))
+            assert stats.intervalle_confiance_reserve(cube, 2025) == stats.intervalle_confiance_reserve(df, 2025)
+            assert stats.moyenne_reserve(cube, annee=2025) == stats.moyenne_reserve(df, annee=2025)
+            del cube
+
+    def test_multi_scenario_requires_scenario_and_compact_schema(self):
+        """🧊 Vérifie qu'un cube multi-scénarios exige `scenario` et que le DataFrame suit le schéma compact."""
+        df = _fake_runs()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cube = ResultsCube.from_dataframe(
+                {"S1": df, "S2": df.assign(Reserve=-df["Reserve"])}, os.path.join(temp_dir, "etude.cube")
+            )
+            with pytest.raises(ValueError):
+                cube.year_slice(2026)
+            with pytest.raises(ValueError):
+                cube.indicator()
+            assert cube.year_slice(2026, scenario="S2").tolist() == [-1001.0, -2001.0, -3001.0]
+
+            back = cube.to_dataframe()
+            assert back["Scenario"].dtype == "category"
+            assert back["Annee"].dtype == "int16" and back["Simulation"].dtype == "int32"
+            assert back["TotEmp"].dtype == "int32" and back["Reserve"].dtype == "float64"
+            del cube
@@ -0,0 +1,93 @@
+"""
+test_run_journal.py
+
+🧾 Teste le journal append-only des runs (utils.run_journal) :
+- Écriture de runs complets et relecture au format DataFrame long
+- Tolérance à un crash : run incomplet ou ligne tronquée en fin de fichier ignorés
+- Chargement via fileio.load_results_file
+- Colonne 'Scenario' restaurée depuis les pieds, purge des anciens journaux
+- Journal désactivé par défaut dans SimulationThread
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from utils.fileio import load_results_file
+from utils.run_journal import RunJournal, prune_old_journals, read_run_journal
+
+
+def _fake_run(run, years=(2025, 2026, 2027)):
+    return pd.DataFrame([
+        {"TotEmp": 100 + run, "Reserve": run * 1000.0 + i, "Annee": annee, "Simulation": run}
+        for i, annee in enumerate(years)
+    ])
+
+
+class TestRunJournal:
+
+    def test_append_and_read_complete_runs(self):
+        """🧪 Vérifie que les runs terminés sont relus dans l'ordre."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "runs.jsonl")
+            with RunJournal(path) as journal:
+                journal.append_run(1, _fake_run(1), scenario="Scénario 1")
+                journal.append_run(2, _fake_run(2), scenario="Scénario 1")
+
+            df = read_run_journal(path)
+            assert len(df) == 6
+            assert df.columns[0] == "Scenario" and df["Scenario"].dtype == "category"
+            assert df["Scenario"].unique().tolist() == ["Scénario 1"]
+            assert df["Simulation"].tolist() == [1, 1, 1, 2, 2, 2]
+            assert df["Reserve"].tolist() == pd.concat([_fake_run(1), _fake_run(2)])["Reserve"].tolist()
+
+    def test_incomplete_tail_is_skipped(self):
+        """💥 Simule un crash : le run sans pied et la ligne tronquée sont ignorés."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "runs.jsonl")
+            with RunJournal(path) as journal:
+                journal.append_run(1, _fake_run(1))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('{"TotEmp": 102, "Reserve": 2000.0, "Annee": 2025, "Simulation": 2}\n')
+                f.write('{"TotEmp": 102, "Reserve": 20')
+
+            df = read_run_journal(path)
+            assert df["Simulation"].unique().tolist() == [1]
+            assert len(df) == 3
+
+    def test_load_results_file_reads_journal(self):
+        """📂 Vérifie que le journal se charge comme un fichier de résultats."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "runs.jsonl")
+            with RunJournal(path) as journal:
+                journal.append_run(1, _fake_run(1))
+                journal.append_run(2, _fake_run(2))
+
+            df = load_results_file(path, columns=["Annee", "Reserve"], annees=[2027])
+            assert list(df.columns) == ["Annee", "Reserve"]
+            assert df["Reserve"].tolist() == [1002.0, 2002.0]
+
+    def test_prune_keeps_most_recent_journals(self):
+        """🧹 Vérifie que seuls les journaux horodatés les plus récents sont conservés."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            names = [f"runs_2025-06-0{d}_10-00-00.jsonl" for d in range(1, 6)]
+            for name in names + ["autre.jsonl"]:
+                open(os.path.join(temp_dir, name), "w").close()
+
+            removed = prune_old_journals(temp_dir, keep=2)
+            assert sorted(os.path.basename(p) for p in removed) == names[:3]
+            assert sorted(os.listdir(temp_dir)) == ["autre.jsonl"] + names[3:]
+            assert prune_old_journals(os.path.join(temp_dir, "absent")) == []
+
+    def test_simulation_thread_does_not_journal_by_default(self, tmp_path, monkeypatch):
+        """🚫 Vérifie qu'aucun journal n'est écrit sans `journal_path`."""
+        from ui.simulation_thread import SimulationThread
+        monkeypatch.chdir(tmp_path)
+        thread = SimulationThread(1, 12345, 23456, 34567)
+        cancelled = []
+        thread.cancelled.connect(lambda: cancelled.append(True))
+        thread.cancel()
+        thread.run()  # Exécution synchrone : annulée avant la première année
+        assert thread.journal_path is None and cancelled
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,45 @@
+"""
+test_search_index.py
+
+🔎 Teste l'index de recherche rapide (utils.search_index) :
+- Recherche insensible à la casse sur toutes les colonnes
+- Affinage incrémental (frappe au clavier) cohérent avec une recherche complète
+- Réutilisation de l'index pour un même DataFrame
+"""
+
+import pandas as pd
+
+from utils.search_index import SearchIndex, get_search_index, search_mask
+
+
+def _df():
+    return pd.DataFrame({
+        "Scenario": pd.Categorical(["Départ 63", "Départ 65", "Départ 65"]),
+        "Annee": [2025, 2035, 2035],
+        "Reserve": [1500.5, -20.0, 3.25],
+    })
+
+
+class TestSearchIndex:
+
+    def test_substring_positions(self):
+        """🧪 Vérifie la recherche de sous-chaîne sur le texte des lignes."""
+        index = SearchIndex(_df())
+        assert index.positions("DÉPART 65").tolist() == [1, 2]
+        assert index.positions("2035 -20").tolist() == [1]
+        assert index.positions("").tolist() == [0, 1, 2]
+        assert index.positions("introuvable").tolist() == []
+
+    def test_incremental_refinement_matches_full_search(self):
+        """⌨️ Vérifie que l'affinage caractère par caractère donne le même résultat."""
+        index = SearchIndex(_df())
+        for query in ["2", "20", "203", "2035"]:
+            typed = index.positions(query).tolist()
+        assert typed == SearchIndex(_df()).positions("2035").tolist() == [1, 2]
+        assert index.positions("15").tolist() == [0], "❌ Une recherche plus courte doit repartir de zéro"
+
+    def test_index_cached_per_dataframe(self):
+        """♻️ Vérifie que l'index est construit une seule fois par DataFrame."""
+        df = _df()
+        assert get_search_index(df) is get_search_index(df)
+        assert search_mask(df, "1500").tolist() == [True, False, False]
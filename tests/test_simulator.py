@@ -12,6 +12,7 @@ et que l’évolution des états est cohérente dans le temps.
 """
 
 import pytest
+from core.progress import CancellationToken, SimulationCancelled
 from core.simulator import Simulator
 
 class TestSimulatorCore:
@@ -58,3 +59,41 @@ class TestSimulatorCore:
         assert reserve > 0, "❌ Réserve nulle ou négative"
         assert cotisations > 0, "❌ Aucune cotisation calculée"
         assert pension > 0, "❌ Aucune pension versée"
+
+    def test_results_use_compact_schema(self):
+        sim = Simulator(seed=123, scenario_id=1)
+        df = sim.simuler_11_ans(simulation_id=1)
+        assert str(df["Annee"].dtype) == "int16", "❌ 'Annee' doit être en int16"
+        assert str(df["Simulation"].dtype) == "int32", "❌ 'Simulation' doit être en int32"
+        assert str(df["Reserve"].dtype) == "float64", "❌ Les montants restent en float64 par défaut"
+
+        sim.monetary_dtype = "float32"
+        assert str(sim.simuler_11_ans()["Reserve"].dtype) == "float32", "❌ Option float32 ignorée"
+
+    def test_progress_callback_reports_each_year(self):
+        """⏱️ Vérifie le callback (run, année, écoulé, restant) après chaque année."""
+        calls = []
+        sim = Simulator(seed=123, scenario_id=1)
+        sim.simuler_11_ans(simulation_id=7, progress=lambda *args: calls.append(args))
+        assert [(run, annee) for run, annee, _, _ in calls] == [(7, a) for a in range(2025, 2036)]
+        assert all(elapsed >= 0 and eta >= 0 for _, _, elapsed, eta in calls)
+        assert calls[-1][3] == 0, "❌ Plus rien ne reste à simuler après la dernière année"
+
+    def test_cancellation_between_years(self, tmp_path):
+        """🛑 Vérifie l'arrêt coopératif : les runs terminés restent dans le journal."""
+        from utils.run_journal import RunJournal, read_run_journal
+        token = CancellationToken()
+        seen = []
+
+        def progress(run, annee, elapsed, eta):
+            seen.append((run, annee))
+            if (run, annee) == (2, 2027):
+                token.cancel()
+
+        sim = Simulator(seed=123, scenario_id=1)
+        path = str(tmp_path / "runs.jsonl")
+        with RunJournal(path) as journal:
+            with pytest.raises(SimulationCancelled):
+                sim.simuler_40_runs(journal=journal, progress=progress, cancel_token=token)
+        assert seen[-1] == (2, 2027), "❌ Aucune année ne doit être simulée après l'annulation"
+        assert sorted(read_run_journal(path)["Simulation"].unique()) == [1]
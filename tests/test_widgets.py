@@ -77,3 +77,207 @@ class TestWidgets:
         QApplication.processEvents()
 
         assert tab_widget.currentIndex() == next_index, "L’onglet actif n’a pas changé"
+
+    def test_csv_loader_thread_emits_preview_and_data(self, qtbot, tmp_path):
+        from ui.csv_loader import CSVLoaderThread
+        path = tmp_path / "res.csv"
+        path.write_text("Annee,Simulation,Reserve\n" + "".join(f"{2025 + i % 11},{i // 11 + 1},{i}\n" for i in range(110)))
+
+        loader = CSVLoaderThread(str(path), required_columns={"Annee", "Simulation"}, chunksize=30)
+        previews = []
+        loader.preview_ready.connect(previews.append)
+        with qtbot.waitSignal(loader.loaded, timeout=5000) as blocker:
+            loader.start()
+        loader.wait()
+
+        assert len(blocker.args[0]) == 110
+        assert previews and len(previews[0]) == 20
+
+    def test_csv_loader_thread_previews_first_and_accepts_blank_ints(self, qtbot, tmp_path):
+        from ui.csv_loader import CSVLoaderThread
+        path = tmp_path / "trous.csv"
+        rows = [f"{2025 + i % 11},{i // 11 + 1},{'' if i == 57 else 100 + i},{i}\n" for i in range(110)]
+        path.write_text("Annee,Simulation,TotEmp,Reserve\n" + "".join(rows))
+
+        loader = CSVLoaderThread(str(path), required_columns={"Annee", "Simulation"}, chunksize=200_000, preview_rows=5)
+        events = []
+        loader.preview_ready.connect(lambda df: events.append(("preview", len(df))))
+        loader.progress.connect(lambda p: events.append(("progress", p)))
+        with qtbot.waitSignal(loader.loaded, timeout=5000) as blocker:
+            loader.start()
+        loader.wait()
+
+        assert events[0] == ("preview", 5), "L’aperçu doit précéder la lecture par blocs"
+        df = blocker.args[0]
+        assert str(df["Annee"].dtype) == "int16"
+        assert str(df["TotEmp"].dtype) == "Int32" and df["TotEmp"].isna().sum() == 1
+
+    def test_csv_loader_thread_rejects_missing_columns(self, qtbot, tmp_path):
+        from ui.csv_loader import CSVLoaderThread
+        path = tmp_path / "bad.csv"
+        path.write_text("Annee,Reserve\n2025,1\n")
+
+        loader = CSVLoaderThread(str(path), required_columns={"Annee", "Simulation"})
+        with qtbot.waitSignal(loader.failed, timeout=5000) as blocker:
+            loader.start()
+        loader.wait()
+        assert "Simulation" in blocker.args[0]
+
+    def test_dataframe_model_formats_edits_and_sorts(self, qtbot):
+        import pandas as pd
+        from PyQt5.QtCore import Qt
+        from ui.widgets.dataframe_model import DataFrameTableModel, format_rounded
+        df = pd.DataFrame({"Annee": [2026, 2025], "Reserve": [1500.7, 900.2]})
+
+        model = DataFrameTableModel(df, formatter=format_rounded, editable=True)
+        assert (model.rowCount(), model.columnCount()) == (2, 2)
+        assert model.data(model.index(0, 1)) == "1500"
+        assert model.headerData(1, Qt.Horizontal) == "Reserve"
+
+        assert model.setData(model.index(1, 1), "42")
+        assert not model.setData(model.index(1, 0), "abc")
+        assert df["Reserve"].tolist() == [1500.7, 900.2], "La source ne doit pas être modifiée"
+        assert model.dataframe()["Reserve"].tolist() == [1500.7, 42.0]
+
+        model.sort(0, Qt.AscendingOrder)
+        assert model.data(model.index(0, 0)) == "2025"
+
+    def test_dataframe_view_copy_paste(self, qtbot):
+        import pandas as pd
+        from PyQt5.QtCore import QItemSelectionModel
+        from ui.widgets.csv_table_widget import CSVTableWidget
+        widget = CSVTableWidget()
+        qtbot.addWidget(widget)
+        widget.set_dataframe(pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}))
+
+        view = widget.table
+        selection = view.selectionModel()
+        for row in range(2):
+            for col in range(2):
+                selection.select(view.model().index(row, col), QItemSelectionModel.Select)
+        widget.copy_selected()
+        assert QApplication.clipboard().text() == "1\tx\n2\ty"
+
+        QApplication.clipboard().setText("7\tz")
+        selection.clear()
+        selection.select(view.model().index(1, 0), QItemSelectionModel.Select)
+        widget.paste_selected()
+        assert view.dataframe().iloc[1].tolist() == [7, "z"]
+
+    def test_filter_scheduler_applies_latest_only(self, qtbot):
+        from ui.filter_scheduler import FilterScheduler
+        state = {"query": ""}
+        applied = []
+        scheduler = FilterScheduler(lambda: state["query"], str.upper, applied.append, delay_ms=20)
+
+        for text in ["r", "re", "res"]:
+            state["query"] = text
+            scheduler.schedule()
+        qtbot.waitUntil(lambda: bool(applied), timeout=3000)
+        qtbot.wait(100)
+        assert applied == ["RES"], "Seule la dernière saisie doit être appliquée"
+
+    def test_filtered_tab_export_flushes_pending_filter(self, qtbot, tmp_path, monkeypatch):
+        import pandas as pd
+        from PyQt5.QtWidgets import QFileDialog
+        from ui.tabs_shared.base_tab_filtered import BaseTabFiltered
+        df = pd.DataFrame({"Annee": [2025, 2026, 2026], "Simulation": [1, 1, 2], "Reserve": [1.0, 2.0, 3.0]})
+        tab = BaseTabFiltered(df)
+        qtbot.addWidget(tab)
+        out = tmp_path / "vue.csv"
+        monkeypatch.setattr(QFileDialog, "getSaveFileName", lambda *a, **k: (str(out), ""))
+
+        tab.year_combo.setCurrentText("2026")
+        assert tab.filter_scheduler.is_pending() and len(tab.filtered_data) == 3
+        tab.export_filtered_view()
+        assert pd.read_csv(out)["Annee"].tolist() == [2026, 2026], "L’export doit suivre les filtres courants"
+        assert not tab.filter_scheduler.is_pending()
+
+    def test_tab_reserve_counter_updates_after_debounce(self, qtbot):
+        import pandas as pd
+        from ui.charts_window.tab_reserve import TabReserve
+        df = pd.DataFrame({"Annee": [2025, 2026, 2026], "Simulation": [1, 1, 2], "Reserve": [1.0, 2.0, 3.0]})
+        tab = TabReserve(df)
+        qtbot.addWidget(tab)
+
+        tab.year_combo.setCurrentText("2026")
+        assert len(tab.filtered_df) == 3, "Le filtrage est différé (anti-rebond)"
+        qtbot.waitUntil(lambda: len(tab.filtered_df) == 2, timeout=3000)
+        assert "2 / 3" in tab.row_count_label.text()
+
+    def test_mpl_tooltips_and_crosshair_blit_overlay(self):
+        import numpy as np
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.backend_bases import MouseEvent
+        from ui.widgets.plot_helpers import mpl_add_tooltips, mpl_add_crosshair
+
+        fig = Figure()
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        x = np.repeat(np.arange(2025, 2036), 100).astype(float)
+        y = np.tile(np.arange(100), 11).astype(float)
+        mpl_add_tooltips(fig, ax, x, y, labels=[f"{a}-{b}" for a, b in zip(x, y)])
+        mpl_add_crosshair(fig, ax)
+        canvas.draw()
+        overlay = fig._blit_overlay
+        assert overlay.background is not None, "Le fond statique doit être mis en cache"
+
+        px, py = ax.transData.transform((2030, 42))
+        redraws = []
+        canvas.draw_idle = lambda: redraws.append(1)
+        canvas.callbacks.process("motion_notify_event", MouseEvent("motion_notify_event", canvas, px + 1, py))
+
+        annot = overlay.artists[0]
+        assert annot.get_visible() and annot.get_text() == "2030.0-42.0"
+        assert not redraws, "Le survol ne doit pas redessiner tout le canvas"
+
+    def test_simulation_window_close_ignores_queued_cancel(self, qtbot, monkeypatch):
+        from PyQt5.QtWidgets import QMessageBox
+        from ui.simulation_thread import SimulationThread
+        from ui.simulation_window import SimulationWindow
+
+        def run_until_cancelled(thread):
+            while not thread.cancel_token.cancelled:
+                thread.msleep(5)
+            thread.cancelled.emit()
+
+        messages = []
+        monkeypatch.setattr(SimulationThread, "run", run_until_cancelled)
+        monkeypatch.setattr(QMessageBox, "information", lambda *a, **k: messages.append(a))
+        window = SimulationWindow()
+        qtbot.addWidget(window)
+        window.check_live.setChecked(False)
+        window.lancer_simulation()
+        assert window._sim_thread.isRunning()
+
+        window.close()
+        qtbot.wait(50)
+        assert not window._sim_thread.isRunning()
+        assert messages == [], "Aucun message ne doit s'afficher sur une fenêtre fermée"
+        assert not window._progress_dialog.isVisible()
+
+    def test_simulation_window_reuses_single_live_chart(self, qtbot, monkeypatch):
+        from PyQt5 import sip
+        from ui.simulation_thread import SimulationThread
+        from ui.simulation_window import SimulationWindow
+
+        monkeypatch.setattr(SimulationThread, "run", lambda thread: thread.cancelled.emit())
+        monkeypatch.setattr(SimulationWindow, "_on_simulation_cancelled", SimulationWindow._end_simulation)
+        window = SimulationWindow()
+        qtbot.addWidget(window)
+
+        window.lancer_simulation()
+        first = window._live_chart
+        assert first.parent() is window and first.isWindow()
+        qtbot.waitUntil(lambda: window.btn_lancer.isEnabled(), timeout=3000)
+        window.lancer_simulation()
+        qtbot.waitUntil(lambda: sip.isdeleted(first), timeout=3000)
+        assert window._live_chart is not None and window._live_chart is not first
+
+        # Fermé par l’utilisateur : une fin de simulation ultérieure ne touche plus au widget
+        qtbot.waitUntil(lambda: window.btn_lancer.isEnabled(), timeout=3000)
+        window._live_chart.close()
+        qtbot.wait(20)
+        assert window._live_chart is None
+        window._end_simulation()
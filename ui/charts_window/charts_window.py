@@ -11,8 +11,6 @@ from ui.charts_window import TabReserve, TabComparaison, TabConfidence
 from ui.dialogs import (
     show_error,
     show_info,
-    validate_required_columns,
-    show_preview_dataframe,
     confirm_export_success,
     confirm_export_failure,
 )
@@ -20,10 +18,14 @@ from ui.theme import get_custom_palette, get_dark_palette
 from utils.mpl_theme import set_mpl_theme
 from utils.theme_utils import load_theme_pref, save_theme_pref
 
-from utils.pdf_export import export_report_to_pdf
+from utils.report_builder import ReportBuilder, DEFAULT_CACHE_DIR
+from utils.fileio import RESULTS_FILE_FILTER
 from ui.widgets.report_export_dialog import ReportExportDialog
 from ui.widgets.animated_tool_button import AnimatedToolButton
 from ui.widgets.fade_tab_widget import FadeTabWidget  # <--- NEW!
+from ui.progress_dialog import ProgressDialog
+from ui.csv_loader import CSVLoaderThread
+from ui.graph_window import restyle_graph_windows
 
 REQUIRED_COLUMNS = {"Annee", "Reserve", "Simulation"}
 ASSETS_DIR = "assets"  # Place tes icônes sun.png et moon.png ici
@@ -219,35 +221,46 @@ class ChartsWindow(QMainWindow):
             show_info(self, "Aucun graphique exportable sur cet onglet.")
 
     def import_csv(self):
-        """Ouvre un QFileDialog pour importer un CSV, le charge et valide les colonnes."""
+        """
+        Ouvre un QFileDialog pour importer un CSV (ou un export binaire npz/Parquet/Feather).
+        Le chargement se fait par blocs dans un thread : en-tête validé d'abord,
+        aperçu affiché dès le premier bloc, progression dans un ProgressDialog.
+        """
         path, _ = QFileDialog.getOpenFileName(
-            self, "Importer un CSV de simulation", "", "Fichiers CSV (*.csv);;Tous les fichiers (*)"
+            self, "Importer un CSV de simulation", "", RESULTS_FILE_FILTER
         )
         if not path:
             return
-        try:
-            df = pd.read_csv(path)
-        except Exception as e:
-            show_error(self, "Erreur d'import", f"Impossible de lire le CSV :\n{str(e)}")
-            return
 
-        ok, missing = validate_required_columns(df, REQUIRED_COLUMNS)
-        if not ok:
-            show_error(
-                self,
-                "CSV invalide",
-                f"Le fichier doit contenir les colonnes : {', '.join(REQUIRED_COLUMNS)}\n"
-                f"Colonnes manquantes : {', '.join(missing)}"
-            )
-            return
+        self._import_path = path
+        self._import_dialog = ProgressDialog("Import du fichier en cours…", max_steps=100)
+        self._import_dialog.show()
+
+        self._loader = CSVLoaderThread(path, required_columns=REQUIRED_COLUMNS, parent=self)
+        self._loader.preview_ready.connect(self._on_import_preview)
+        self._loader.progress.connect(self._import_dialog.set_step)
+        self._loader.loaded.connect(self._on_import_loaded)
+        self._loader.failed.connect(self._on_import_failed)
+        self._loader.start()
+
+    def _on_import_preview(self, preview):
+        """Affiche les premières lignes dès qu'elles sont lues (avant la fin de l'import)."""
+        self.preview_label.setText(
+            "<b>Aperçu des données importées :</b>"
+            f"<pre>{preview.head(5).to_string(index=False)}</pre>"
+        )
+        self.preview_label.show()
 
+    def _on_import_loaded(self, df):
+        self._import_dialog.close()
         self.data = df
         self.data_scenarios = None  # Reset, let parent logic handle multi-scenarios
         self.refresh_tabs(self.data, self.data_scenarios)
-        self.preview_label.setText("<b>Aperçu des données importées :</b>")
-        self.preview_label.show()
-        show_preview_dataframe(self, df, n_rows=5)
-        show_info(self, "Import réussi", f"Fichier CSV importé avec succès :\n{os.path.basename(path)}")
+        show_info(self, "Import réussi", f"Fichier importé avec succès :\n{os.path.basename(self._import_path)} ({len(df):,} lignes)")
+
+    def _on_import_failed(self, message):
+        self._import_dialog.close()
+        show_error(self, "Erreur d'import", f"Impossible de lire le fichier :\n{message}")
 
     # ----- PDF REPORT EXPORT -----
     def export_pdf_report(self):
@@ -259,36 +272,10 @@ class ChartsWindow(QMainWindow):
                 return
 
             try:
-                # === Récupération des figures des onglets ===
-                figures = []
-                if "figures" in sections:
-                    for tab in [getattr(self, n, None) for n in ["tab_reserve", "tab_confidence", "tab_comparaison"]]:
-                        if hasattr(tab, "get_figure"):
-                            figures.append(tab.get_figure())
-
-                # === Récupération des stats ===
-                stats = []
-                if "stats" in sections:
-                    for tab in [getattr(self, n, None) for n in ["tab_reserve", "tab_confidence", "tab_comparaison"]]:
-                        if hasattr(tab, "get_stats"):
-                            stats.append((tab.__class__.__name__, tab.get_stats()))
-
-                # === Récupération du résumé texte ===
-                summary = ""
-                if "summary" in sections:
-                    for tab in [getattr(self, n, None) for n in ["tab_reserve", "tab_confidence", "tab_comparaison"]]:
-                        if hasattr(tab, "get_summary"):
-                            summary += tab.get_summary() + "\n\n"
-
-                # === Export PDF final ===
-                ok = export_report_to_pdf(
-                    path=pdf_path,
-                    figures=figures,
-                    stats=stats,
-                    summary=summary,
-                    sections=sections,
-                    title="Rapport Simulation Retraite",
-                    author="Nawfal RAZOUK"
+                # Mêmes contenus que les onglets, calculés sans passer par les widgets
+                ok = ReportBuilder(self.data, self.data_scenarios).export_pdf(
+                    pdf_path, parts=("reserve", "confidence", "comparaison", "summary"), sections=sections,
+                    cache_dir=DEFAULT_CACHE_DIR
                 )
 
                 if ok:
@@ -325,6 +312,8 @@ class ChartsWindow(QMainWindow):
 
     def redraw_all(self):
         """Redessine tous les onglets graphiques pour refléter le thème."""
+        # Fenêtres graphiques en cache : simple restyle des artistes, sans recalcul
+        restyle_graph_windows(self.dark_mode)
         for tab in [getattr(self, n, None) for n in ["tab_reserve", "tab_confidence", "tab_comparaison"]]:
             if hasattr(tab, 'plot_reserve'):
                 tab.plot_reserve()
@@ -2,8 +2,12 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit
 )
 import pandas as pd
+from utils.filtered_view import get_filtered_view
+from ui.filter_scheduler import FilterScheduler
 from ui.charts_window.logger import logger
-from ui.graph_window import GraphWindow  # ✅ Fenêtre dédiée
+from ui.graph_window import GraphWindow, open_graph_window  # ✅ Fenêtre dédiée
+from utils.figure_cache import data_fingerprint, filter_key
+from utils.theme_utils import load_theme_pref
 from ui.charts_window.scenario_selector import ScenarioSelector
 from ui.dialogs import show_info
 
@@ -15,6 +19,11 @@ class TabComparaison(QWidget):
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(QLabel("<b>Comparaison multi-scénarios (réserve)</b>"))
 
+        # Recalcul du compteur différé et hors thread GUI pendant la saisie
+        self.filter_scheduler = FilterScheduler(
+            self._count_params, self._count_rows, self._show_count, parent=self
+        )
+
         # 1. Sélecteur de scénarios
         self.selector = ScenarioSelector(
             scenario_names=list(self.data_scenarios.keys()),
@@ -28,13 +37,13 @@ class TabComparaison(QWidget):
         self.year_combo = QComboBox()
         self.year_combo.addItem("Toutes années")
         self._populate_years_combo()
-        self.year_combo.currentIndexChanged.connect(self.update_status)
+        self.year_combo.currentIndexChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(QLabel("Année :"))
         filter_layout.addWidget(self.year_combo)
 
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Recherche rapide (optionnel)")
-        self.search_edit.textChanged.connect(self.update_status)
+        self.search_edit.textChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(self.search_edit)
         filter_layout.addStretch()
         main_layout.addLayout(filter_layout)
@@ -63,7 +72,7 @@ class TabComparaison(QWidget):
         for name in self.selector.selected_scenarios():
             df = self.data_scenarios.get(name)
             if isinstance(df, pd.DataFrame) and "Annee" in df.columns:
-                years.update(df["Annee"].unique())
+                years.update(get_filtered_view(df).values("Annee"))
         for y in sorted(years):
             self.year_combo.addItem(str(y))
 
@@ -72,56 +81,67 @@ class TabComparaison(QWidget):
         self._populate_years_combo()
         self.update_status()
 
+    def _scenario_filters(self, year_filter, query):
+        """Filtres année / recherche au format FilteredView."""
+        filters = {"query": query}
+        if year_filter != "Toutes années":
+            try:
+                filters["annees"] = [int(year_filter)]
+            except ValueError:
+                pass
+        return filters
+
     def update_status(self):
         """Met à jour le label d'information sur les lignes filtrées."""
-        count = 0
-        for name in self.active_scenarios:
-            df = self.data_scenarios.get(name)
-            if not isinstance(df, pd.DataFrame) or df.empty:
-                continue
-            dff = df.copy()
-            if self.year_combo.currentText() != "Toutes années":
-                try:
-                    year = int(self.year_combo.currentText())
-                    dff = dff[dff["Annee"] == year]
-                except ValueError:
-                    pass
-            query = self.search_edit.text().strip()
-            if query:
-                dff = dff[dff.astype(str).apply(lambda row: query.lower() in " ".join(row), axis=1)]
-            count += len(dff)
+        self._show_count(self._count_rows(self._count_params()))
+
+    def _count_params(self):
+        """Lit l'état des filtres (thread GUI) : (scénarios actifs, filtres FilteredView)."""
+        frames = [self.data_scenarios.get(name) for name in self.active_scenarios]
+        filters = self._scenario_filters(self.year_combo.currentText(), self.search_edit.text().strip())
+        return frames, filters
+
+    @staticmethod
+    def _count_rows(params):
+        frames, filters = params
+        return sum(
+            get_filtered_view(df).count(**filters)  # Un index par scénario, sans copie
+            for df in frames
+            if isinstance(df, pd.DataFrame) and not df.empty
+        )
+
+    def _show_count(self, count):
         self.row_count_label.setText(f"<b>Lignes potentiellement affichées : {count:,}</b>")
 
     def ouvrir_graphique(self):
-        """Ouvre une fenêtre dédiée avec le graphique comparatif."""
-        filtered = {}
-        year_filter = self.year_combo.currentText()
-        query = self.search_edit.text().strip()
-
-        for name in self.active_scenarios:
-            df = self.data_scenarios.get(name)
-            if not isinstance(df, pd.DataFrame) or df.empty:
-                continue
-            dff = df.copy()
-            if year_filter != "Toutes années":
-                try:
-                    year = int(year_filter)
-                    dff = dff[dff["Annee"] == year]
-                except ValueError:
-                    pass
-            if query:
-                dff = dff[dff.astype(str).apply(lambda row: query.lower() in " ".join(row), axis=1)]
-            if not dff.empty:
-                filtered[name] = dff
-
-        if not filtered:
-            show_info(self, "Aucune donnée", "Aucun scénario ne correspond aux filtres.")
-            return
-
-        self.graph_win = GraphWindow(
-            filtered,
-            title="Comparaison multi-scénarios",
-            y_label="Réserve (DH)",
-            mode="multi"  # ✅ Important pour gérer dict de scénarios
+        """Ouvre une fenêtre dédiée avec le graphique comparatif (réutilisée si déjà construite)."""
+        filters = self._scenario_filters(self.year_combo.currentText(), self.search_edit.text().strip())
+        names = sorted(self.active_scenarios)
+        key = (
+            data_fingerprint({name: self.data_scenarios.get(name) for name in names}),
+            filter_key(filters),
+            "multi",
         )
-        self.graph_win.show()
+
+        def build():
+            filtered = {}
+            for name in names:
+                df = self.data_scenarios.get(name)
+                if not isinstance(df, pd.DataFrame) or df.empty:
+                    continue
+                dff = get_filtered_view(df).select(**filters)
+                if not dff.empty:
+                    filtered[name] = dff
+
+            if not filtered:
+                show_info(self, "Aucune donnée", "Aucun scénario ne correspond aux filtres.")
+                return None
+
+            return GraphWindow(
+                filtered,
+                title="Comparaison multi-scénarios",
+                y_label="Réserve (DH)",
+                mode="multi"  # ✅ Important pour gérer dict de scénarios
+            )
+
+        self.graph_win = open_graph_window(key, build, load_theme_pref())
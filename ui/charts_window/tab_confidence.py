@@ -2,40 +2,49 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit
 )
 import pandas as pd
+from utils.filtered_view import get_filtered_view
+from ui.filter_scheduler import FilterScheduler
 from ui.charts_window.logger import logger
 from ui.dialogs import show_error, show_info
-from ui.graph_window import GraphWindow  # ✅ Ajout pour la fenêtre graphique dédiée
+from ui.graph_window import GraphWindow, open_graph_window  # ✅ Ajout pour la fenêtre graphique dédiée
+from utils.figure_cache import data_fingerprint, filter_key
+from utils.theme_utils import load_theme_pref
 
 class TabConfidence(QWidget):
     def __init__(self, data=None, alpha=0.05):
         super().__init__()
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
-        self.filtered_data = self.data.copy()
+        self.filtered_data = self.data
         self.alpha = alpha
 
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(QLabel("<b>Intervalle de confiance sur la réserve par année</b>"))
 
+        # Recalcul du compteur différé et hors thread GUI pendant la saisie
+        self.filter_scheduler = FilterScheduler(
+            self._filter_params, self._filter, self._show_status, parent=self
+        )
+
         # --------- 1. Filtres dynamiques ----------
         filter_layout = QHBoxLayout()
 
         self.year_combo = QComboBox()
         self.year_combo.addItem("Toutes années")
-        self.all_years = sorted(self.data["Annee"].unique()) if not self.data.empty else []
+        self.all_years = get_filtered_view(self.data).values("Annee") if not self.data.empty else []
         for a in self.all_years:
             self.year_combo.addItem(str(a))
-        self.year_combo.currentIndexChanged.connect(self.update_status)
+        self.year_combo.currentIndexChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(QLabel("Année :"))
         filter_layout.addWidget(self.year_combo)
 
         self.reserve_min_edit = QLineEdit()
         self.reserve_min_edit.setPlaceholderText("Réserve min (optionnel)")
-        self.reserve_min_edit.textChanged.connect(self.update_status)
+        self.reserve_min_edit.textChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(self.reserve_min_edit)
 
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Recherche rapide (optionnel)")
-        self.search_edit.textChanged.connect(self.update_status)
+        self.search_edit.textChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(self.search_edit)
 
         filter_layout.addStretch()
@@ -59,53 +68,69 @@ class TabConfidence(QWidget):
         self.update_status()
 
     def _get_filtered_df(self):
-        df = self.data.copy()
-        # Filtre année
+        return self._filter(self._filter_params())
+
+    def _filter_params(self):
+        """Lit l'état des filtres (thread GUI) : (données, filtres FilteredView, réserve min)."""
+        filters = {"query": self.search_edit.text().strip()}
         year_val = self.year_combo.currentText()
         if year_val != "Toutes années":
             try:
-                df = df[df["Annee"] == int(year_val)]
+                filters["annees"] = [int(year_val)]
             except ValueError:
                 pass
-        # Filtre réserve min
+        reserve_min = None
         reserve_min_text = self.reserve_min_edit.text().strip()
         if reserve_min_text:
             try:
-                val = float(reserve_min_text)
-                df = df[df["Reserve"] >= val]
+                reserve_min = float(reserve_min_text)
             except ValueError:
                 pass
-        # Recherche texte
-        query = self.search_edit.text().strip()
-        if query:
-            df = df[df.astype(str).apply(lambda row: query.lower() in " ".join(row).lower(), axis=1)]
+        return self.data, filters, reserve_min
+
+    @staticmethod
+    def _filter(params):
+        # Filtres année + recherche texte sur la vue partagée (index précalculés)
+        data, filters, reserve_min = params
+        df = get_filtered_view(data).select(**filters)
+        # Filtre réserve min (sur les lignes déjà retenues)
+        if reserve_min is not None:
+            df = df[df["Reserve"] >= reserve_min]
         return df
 
     def update_status(self):
-        self.filtered_data = self._get_filtered_df()
+        self._show_status(self._get_filtered_df())
+
+    def _show_status(self, df):
+        self.filtered_data = df
         self.row_count_label.setText(f"<b>Lignes affichées : {len(self.filtered_data):,} / {len(self.data):,}</b>")
 
     def open_graph(self):
-        """Ouvre une fenêtre avec le graphique IC."""
-        df = self._get_filtered_df()
-        if df.empty:
-            show_info(self, "Aucune donnée", "Aucune donnée à afficher avec les filtres sélectionnés.")
-            return
-
-        # ✅ Ouverture dans GraphWindow
-        self.graph_win = GraphWindow(
-            data=df,
-            title="Intervalle de Confiance Réserve",
-            mode="confidence",  # Pour afficher le graphique IC
-            confidence_alpha=self.alpha
-        )
-        self.graph_win.show()
+        """Ouvre une fenêtre avec le graphique IC (réutilisée si déjà construite)."""
+        params = self._filter_params()
+        _data, filters, reserve_min = params
+        key = (data_fingerprint(self.data), filter_key({**filters, "reserve_min": reserve_min}), "confidence", self.alpha)
+
+        def build():
+            df = self._filter(params)
+            if df.empty:
+                show_info(self, "Aucune donnée", "Aucune donnée à afficher avec les filtres sélectionnés.")
+                return None
+            # ✅ Ouverture dans GraphWindow
+            return GraphWindow(
+                data=df,
+                title="Intervalle de Confiance Réserve",
+                mode="confidence",  # Pour afficher le graphique IC
+                confidence_alpha=self.alpha
+            )
+
+        self.graph_win = open_graph_window(key, build, load_theme_pref())
 
     def update_chart(self, data: pd.DataFrame):
         """Méthode appelée depuis l’extérieur pour forcer une mise à jour."""
         if isinstance(data, pd.DataFrame):
-            self.data = data.copy()
-            self.all_years = sorted(self.data["Annee"].unique()) if not self.data.empty else []
+            self.data = data
+            self.all_years = get_filtered_view(self.data).values("Annee") if not self.data.empty else []
             self.year_combo.clear()
             self.year_combo.addItem("Toutes années")
             for a in self.all_years:
@@ -1,46 +1,59 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QLineEdit, QCheckBox
 )
 import pandas as pd
+from utils.filtered_view import get_filtered_view
+from ui.filter_scheduler import FilterScheduler
 from ui.charts_window.logger import logger
-from ui.graph_window import GraphWindow
+from ui.graph_window import GraphWindow, open_graph_window
+from utils.figure_cache import data_fingerprint, filter_key
+from utils.theme_utils import load_theme_pref
 from ui.dialogs import show_error, show_info
 
 class TabReserve(QWidget):
     def __init__(self, data=None):
         super().__init__()
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
-        self.filtered_df = self.data.copy()
+        self.filtered_df = self.data
 
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(QLabel("<b>Évolution de la réserve sur 11 ans</b>"))
 
+        # Recalcul du compteur différé et hors thread GUI pendant la saisie
+        self.filter_scheduler = FilterScheduler(
+            self._filter_params, self._filter, self._show_status, parent=self
+        )
+
         # Filtres dynamiques
         filter_layout = QHBoxLayout()
 
         self.year_combo = QComboBox()
         self.year_combo.addItem("Toutes années")
         if not self.data.empty:
-            self.years = sorted(self.data["Annee"].unique())
+            self.years = get_filtered_view(self.data).values("Annee")
             self.year_combo.addItems([str(a) for a in self.years])
-        self.year_combo.currentIndexChanged.connect(self.update_status)
+        self.year_combo.currentIndexChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(QLabel("Année :"))
         filter_layout.addWidget(self.year_combo)
 
         self.sim_combo = QComboBox()
         self.sim_combo.addItem("Toutes simulations")
         if not self.data.empty and "Simulation" in self.data.columns:
-            self.sims = sorted(self.data["Simulation"].unique())
+            self.sims = get_filtered_view(self.data).values("Simulation")
             self.sim_combo.addItems([str(s) for s in self.sims])
-        self.sim_combo.currentIndexChanged.connect(self.update_status)
+        self.sim_combo.currentIndexChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(QLabel("Simulation :"))
         filter_layout.addWidget(self.sim_combo)
 
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Recherche rapide (optionnel)")
-        self.search_edit.textChanged.connect(self.update_status)
+        self.search_edit.textChanged.connect(self.filter_scheduler.schedule)
         filter_layout.addWidget(self.search_edit)
 
+        self.all_runs_check = QCheckBox("Tous les runs")
+        self.all_runs_check.setToolTip("Superpose la trajectoire de chaque simulation (densité si trop de runs)")
+        filter_layout.addWidget(self.all_runs_check)
+
         filter_layout.addStretch()
         main_layout.addLayout(filter_layout)
 
@@ -62,48 +75,62 @@ class TabReserve(QWidget):
 
     def update_status(self):
         """Met à jour le label d’info pour montrer combien de lignes seront affichées."""
-        df = self._get_filtered_df()
+        self._show_status(self._get_filtered_df())
+
+    def _show_status(self, df):
         self.filtered_df = df
         self.row_count_label.setText(f"<b>Lignes affichées : {len(df):,} / {len(self.data):,}</b>")
 
     def _get_filtered_df(self):
         """Retourne un DataFrame filtré selon les combos et recherche."""
-        df = self.data.copy()
+        return self._filter(self._filter_params())
+
+    def _filter_params(self):
+        """Lit l'état des filtres (thread GUI) : (données, filtres FilteredView)."""
+        filters = {"query": self.search_edit.text().strip()}
         year_val = self.year_combo.currentText()
         if year_val != "Toutes années":
             try:
-                df = df[df["Annee"] == int(year_val)]
+                filters["annees"] = [int(year_val)]
             except ValueError:
                 pass
         sim_val = self.sim_combo.currentText()
         if sim_val != "Toutes simulations":
             try:
-                df = df[df["Simulation"] == int(sim_val)]
+                filters["simulations"] = [int(sim_val)]
             except ValueError:
                 pass
-        query = self.search_edit.text().strip()
-        if query:
-            df = df[df.astype(str).apply(lambda row: query.lower() in " ".join(row).lower(), axis=1)]
-        return df
+        return self.data, filters
+
+    @staticmethod
+    def _filter(params):
+        # Vue partagée par les onglets : index précalculés, pas de copie
+        data, filters = params
+        return get_filtered_view(data).select(**filters)
 
     def open_graph(self):
-        """Affiche la fenêtre dédiée avec le graphique de réserve."""
-        df = self._get_filtered_df()
-        if df.empty:
-            show_info(self, "Aucune donnée", "Aucune donnée ne correspond aux filtres sélectionnés.")
-            return
-
-        self.graph_win = GraphWindow(
-            data=df,
-            title="Évolution de la réserve",
-            y_label="Réserve (DH)",
-            mode="line"  # ✅ Spécifie le mode de tracé
-        )
-        self.graph_win.show()
+        """Affiche la fenêtre dédiée avec le graphique de réserve (réutilisée si déjà construite)."""
+        params = self._filter_params()
+        mode = "runs" if self.all_runs_check.isChecked() else "line"
+        key = (data_fingerprint(self.data), filter_key(params[1]), mode)
+
+        def build():
+            df = self._filter(params)
+            if df.empty:
+                show_info(self, "Aucune donnée", "Aucune donnée ne correspond aux filtres sélectionnés.")
+                return None
+            return GraphWindow(
+                data=df,
+                title="Évolution de la réserve",
+                y_label="Réserve (DH)",
+                mode=mode  # ✅ Spécifie le mode de tracé
+            )
+
+        self.graph_win = open_graph_window(key, build, load_theme_pref())
 
     def update_chart(self, new_data):
         if isinstance(new_data, pd.DataFrame):
-            self.data = new_data.copy()
+            self.data = new_data
             self.update_status()
         else:
             logger.warning("TabReserve.update_chart() a reçu un type invalide : %s", type(new_data))
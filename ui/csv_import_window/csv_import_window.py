@@ -1,7 +1,8 @@
+import os
+
 from PyQt5.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QPushButton, QFileDialog, QMessageBox
+    QMainWindow, QWidget, QVBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QProgressBar
 )
-import pandas as pd
 
 from ui.csv_import_window.tab_summary import TabSummary
 from ui.csv_import_window.tab_by_year import TabByYear
@@ -9,6 +10,9 @@ from ui.csv_import_window.tab_by_year_filtered import TabByYearFiltered
 from ui.csv_import_window.tab_interactive import TabCSVInteractive
 from ui.widgets.fade_tab_widget import FadeTabWidget
 from ui.csv_import_window.logger import logger
+from utils.fileio import RESULTS_FILE_FILTER
+from utils.result_store import ResultStore, is_result_store
+from ui.csv_loader import CSVLoaderThread
 
 class CSVImportWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -17,6 +21,7 @@ class CSVImportWindow(QMainWindow):
         self.setGeometry(280, 280, 1000, 680)
 
         self.data = None
+        self.store = None
         self.tabs = None
 
         self.init_ui()
@@ -29,45 +34,110 @@ class CSVImportWindow(QMainWindow):
         self.load_button.clicked.connect(self.import_csv)
 
         layout.addWidget(self.load_button)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+        self.preview_label = QLabel()
+        self.preview_label.hide()
+        layout.addWidget(self.preview_label)
+
         self.setCentralWidget(central_widget)
         central_widget.setLayout(layout)
 
     def import_csv(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Choisir un fichier CSV", "", "CSV Files (*.csv)")
+        file_path, _ = QFileDialog.getOpenFileName(self, "Choisir un fichier CSV", "", RESULTS_FILE_FILTER)
         if not file_path:
             return
+        if is_result_store(file_path):
+            self.open_store(file_path)
+            return
 
+        # Chargement par blocs dans un thread : l'interface reste réactive sur les gros fichiers
+        self.load_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self._loader = CSVLoaderThread(file_path, required_columns={"Annee", "Simulation"}, parent=self)
+        self._loader.preview_ready.connect(self.show_preview)
+        self._loader.progress.connect(self.progress_bar.setValue)
+        self._loader.loaded.connect(lambda df: self.on_loaded(df, file_path))
+        self._loader.failed.connect(self.on_failed)
+        self._loader.start()
+
+    def show_preview(self, preview):
+        """Affiche les premières lignes pendant que la suite du fichier est lue."""
+        self.preview_label.setText(f"<pre>{preview.head(5).to_string(index=False)}</pre>")
+        self.preview_label.show()
+
+    def on_loaded(self, df, file_path):
+        self.load_button.setEnabled(True)
+        self.progress_bar.hide()
+        self.preview_label.hide()
+
+        self._close_store()
+        self.data = df
+        logger.info("CSV importé avec succès : %s", file_path)
+        self.show_tabs()
+
+        # ✅ Mise à jour de MenuWindow si parent() est défini
+        parent = self.parent()
+        if parent and hasattr(parent, "set_dernier_resultat_df"):
+            parent.set_dernier_resultat_df(df)
+            logger.debug("Résultat CSV stocké dans MenuWindow via set_dernier_resultat_df().")
+
+    def open_store(self, file_path):
+        """
+        Stock SQLite : ouvert sans être chargé en mémoire. L'onglet filtré le parcourt
+        par pages (filtres en SQL) ; résumé et moyennes annuelles sont des requêtes agrégées.
+        """
+        if not os.path.exists(file_path):
+            self.on_failed(f"Fichier introuvable : {file_path}")
+            return
+        self._close_store()
         try:
-            df = pd.read_csv(file_path)
-
-            if not {"Annee", "Simulation"}.issubset(df.columns):
-                QMessageBox.warning(self, "Colonnes manquantes",
-                    "Le fichier doit contenir les colonnes 'Annee' et 'Simulation'.")
-                return
+            self.store = ResultStore(file_path)
+            logger.info("Stock SQLite ouvert : %s (%d lignes)", file_path, self.store.count())
+        except Exception as e:
+            self.store = None
+            self.on_failed(str(e))
+            return
+        self.data = None
+        self.show_tabs()
 
-            self.data = df
-            logger.info("CSV importé avec succès : %s", file_path)
-            self.show_tabs()
+    def _close_store(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
 
-            # ✅ Mise à jour de MenuWindow si parent() est défini
-            parent = self.parent()
-            if parent and hasattr(parent, "set_dernier_resultat_df"):
-                parent.set_dernier_resultat_df(df)
-                logger.debug("Résultat CSV stocké dans MenuWindow via set_dernier_resultat_df().")
+    def closeEvent(self, event):
+        self._close_store()
+        super().closeEvent(event)
 
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur d'import", f"Impossible de lire le fichier : {e}")
-            logger.error("Erreur lors de l'import CSV : %s", str(e))
+    def on_failed(self, message):
+        self.load_button.setEnabled(True)
+        self.progress_bar.hide()
+        self.preview_label.hide()
+        QMessageBox.critical(self, "Erreur d'import", f"Impossible de lire le fichier : {message}")
+        logger.error("Erreur lors de l'import CSV : %s", message)
 
     def show_tabs(self):
         if self.tabs:
             self.tabs.setParent(None)
 
         self.tabs = FadeTabWidget()
-        self.tabs.addTab(TabSummary(self.data), "📊 Résumé")
-        self.tabs.addTab(TabByYear(self.data), "📆 Annuel (moyennes)")
-        self.tabs.addTab(TabByYearFiltered(self.data), "🔍 Filtres dynamiques")
-        self.tabs.addTab(TabCSVInteractive(self.data), "🧾 CSV interactif")
+        if self.store is not None:
+            # Aucun onglet ne charge le stock entier : requêtes ciblées et pages
+            finale = self.store.query(annees=[2035], columns=["Annee", "Simulation", "Reserve"])
+            self.tabs.addTab(TabSummary(finale), "📊 Résumé")
+            self.tabs.addTab(TabByYear(self.store.mean_by_year()), "📆 Annuel (moyennes)")
+            self.tabs.addTab(TabByYearFiltered(self.store), "🔍 Filtres dynamiques")
+        else:
+            self.tabs.addTab(TabSummary(self.data), "📊 Résumé")
+            self.tabs.addTab(TabByYear(self.data), "📆 Annuel (moyennes)")
+            self.tabs.addTab(TabByYearFiltered(self.data), "🔍 Filtres dynamiques")
+            self.tabs.addTab(TabCSVInteractive(self.data), "🧾 CSV interactif")
 
         self.centralWidget().layout().addWidget(self.tabs)
         self.tabs.setCurrentIndex(0)
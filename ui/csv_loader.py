@@ -0,0 +1,75 @@
+# ui/csv_loader.py
+
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+import pandas as pd
+
+from core.schema import apply_result_schema
+from utils.fileio import read_csv_header, read_csv_preview, iter_csv_chunks, load_results_file
+from ui import logger
+
+
+class CSVLoaderThread(QThread):
+    """
+    Charge un fichier de résultats dans un thread de travail, sans bloquer l'interface.
+    - En-tête validé seul (colonnes requises) avant toute lecture des données
+    - Aperçu des premières lignes (lecture de `preview_rows` lignes seulement) émis
+      avant la lecture par blocs
+    - Lecture par blocs avec progression (0-100) ; interruption possible via requestInterruption()
+    Les autres formats (npz/Parquet/Feather, journaux .jsonl) sont lus d'un seul bloc.
+    """
+    preview_ready = pyqtSignal(object)   # DataFrame des premières lignes
+    progress = pyqtSignal(int)           # Pourcentage lu
+    loaded = pyqtSignal(object)          # DataFrame complet
+    failed = pyqtSignal(str)             # Message d'erreur
+
+    def __init__(self, path, required_columns=None, chunksize=200_000, preview_rows=20, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.required_columns = set(required_columns or [])
+        self.chunksize = chunksize
+        self.preview_rows = preview_rows
+
+    def run(self):
+        try:
+            if os.path.splitext(self.path)[1].lower() != ".csv":
+                df = load_results_file(self.path)
+                if not self._check_columns(df.columns):
+                    return
+                self.preview_ready.emit(df.head(self.preview_rows))
+                self.progress.emit(100)
+                self.loaded.emit(df)
+                return
+
+            if not self._check_columns(read_csv_header(self.path)):
+                return
+            self.preview_ready.emit(read_csv_preview(self.path, nrows=self.preview_rows))
+
+            chunks = []
+            for chunk, fraction in iter_csv_chunks(self.path, chunksize=self.chunksize):
+                if self.isInterruptionRequested():
+                    logger.info("Import CSV interrompu : %s", self.path)
+                    return
+                chunks.append(chunk)
+                self.progress.emit(int(fraction * 100))
+
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=read_csv_header(self.path))
+            df = apply_result_schema(df)
+            logger.info("Import CSV terminé : %s (%d lignes, %d blocs)", self.path, len(df), len(chunks))
+            self.progress.emit(100)
+            self.loaded.emit(df)
+
+        except Exception as e:
+            logger.error("Erreur lors de l'import de %s : %s", self.path, str(e))
+            self.failed.emit(str(e))
+
+    def _check_columns(self, columns):
+        missing = sorted(self.required_columns - set(columns))
+        if missing:
+            self.failed.emit(
+                f"Le fichier doit contenir les colonnes : {', '.join(sorted(self.required_columns))}\n"
+                f"Colonnes manquantes : {', '.join(missing)}"
+            )
+            return False
+        return True
@@ -0,0 +1,111 @@
+# ui/filter_scheduler.py
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from ui import logger
+
+# Un seul thread de filtrage pour toute l'application : les calculs ne se concurrencent pas
+# et un calcul devenu obsolète est abandonné avant de démarrer.
+_FILTER_POOL = None
+
+
+def _filter_pool():
+    global _FILTER_POOL
+    if _FILTER_POOL is None:
+        _FILTER_POOL = QThreadPool()
+        _FILTER_POOL.setMaxThreadCount(1)
+    return _FILTER_POOL
+
+
+class _FilterSignals(QObject):
+    done = pyqtSignal(int, object)      # (génération, résultat)
+    failed = pyqtSignal(int, str)
+
+
+class _FilterTask(QRunnable):
+    def __init__(self, scheduler, generation, compute, params):
+        super().__init__()
+        self.scheduler = scheduler
+        self.generation = generation
+        self.compute = compute
+        self.params = params
+        self.signals = scheduler._signals
+
+    def run(self):
+        if self.generation != self.scheduler.generation:
+            return  # Une saisie plus récente a été planifiée : calcul obsolète
+        try:
+            result = self.compute(self.params)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.done.emit(self.generation, result)
+
+
+class FilterScheduler(QObject):
+    """
+    Planifie le recalcul d'un filtre d'onglet hors du thread GUI.
+    - schedule() (à connecter aux signaux des widgets) relance un délai d'anti-rebond
+    - à l'expiration, `snapshot()` lit l'état des widgets (thread GUI), puis
+      `compute(params)` s'exécute dans le thread de filtrage
+    - seul le résultat de la dernière planification est passé à `apply(result)`
+    - flush() applique tout de suite l'état courant (avant un export, par exemple)
+    """
+
+    def __init__(self, snapshot, compute, apply, delay_ms=200, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.compute = compute
+        self.apply = apply
+        self.generation = 0
+        self._applied_generation = 0
+        # Sans parent : reste valide si l'onglet est détruit pendant un calcul
+        self._signals = _FilterSignals()
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start)
+
+    def schedule(self, *args):
+        """Relance le délai d'anti-rebond ; les arguments des signaux Qt sont ignorés."""
+        self.generation += 1  # Invalide tout calcul en attente ou en cours
+        self._timer.start()
+
+    def cancel(self):
+        self.generation += 1
+        self._timer.stop()
+
+    def is_pending(self):
+        """Vrai si le dernier état planifié n'a pas encore été appliqué (délai ou calcul en cours)."""
+        return self._applied_generation != self.generation
+
+    def flush(self):
+        """
+        Si un recalcul est en attente ou en cours, l'abandonne et applique le filtre courant
+        de façon synchrone (thread GUI). Retourne True si un résultat a été appliqué.
+        """
+        if not self.is_pending():
+            return False
+        self.cancel()
+        try:
+            result = self.compute(self.snapshot())
+        except Exception as e:
+            logger.error("Erreur lors du filtrage immédiat : %s", str(e))
+            return False
+        self.apply(result)
+        self._applied_generation = self.generation
+        return True
+
+    def _start(self):
+        _filter_pool().start(_FilterTask(self, self.generation, self.compute, self.snapshot()))
+
+    def _on_done(self, generation, result):
+        if generation == self.generation:
+            self.apply(result)
+            self._applied_generation = generation
+
+    def _on_failed(self, generation, message):
+        if generation == self.generation:
+            logger.error("Erreur lors du filtrage en arrière-plan : %s", message)
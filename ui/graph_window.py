@@ -17,17 +17,48 @@ from ui.widgets.plot_helpers import (
 )
 
 from utils.stats import intervalle_confiance_reserve
+from utils.charts import runs_matrix, draw_all_runs
+from utils.figure_cache import FigureCache, estimate_figure_bytes
 
 ASSETS_DIR = "assets"
 
+# Fenêtres graphiques déjà construites, réutilisées à la réouverture d'un même graphique
+_GRAPH_CACHE = FigureCache(on_evict=lambda win: (win.close(), win.deleteLater()))
+
+
+def _graph_window_bytes(win):
+    """Mémoire retenue par une fenêtre en cache : figure rendue + données filtrées."""
+    frames = win.data.values() if isinstance(win.data, dict) else [win.data]
+    data_bytes = sum(int(df.memory_usage(deep=False).sum()) for df in frames if isinstance(df, pd.DataFrame))
+    return estimate_figure_bytes(win.figure) + data_bytes
+
+
+def open_graph_window(key, factory, dark_mode=False):
+    """
+    Affiche la fenêtre graphique décrite par `key` (empreinte des données, filtres, mode).
+    En cache : la fenêtre existante est restylée si le thème a changé puis réaffichée,
+    sans refiltrer ni recalculer. Sinon `factory()` construit la GraphWindow (ou None).
+    """
+    win = _GRAPH_CACHE.get_or_create(key, factory, dark_mode, nbytes_of=_graph_window_bytes)
+    if win is not None:
+        win.show()
+        win.raise_()
+    return win
+
+
+def restyle_graph_windows(dark_mode):
+    """Applique le thème à toutes les fenêtres graphiques en cache (ouvertes ou non)."""
+    _GRAPH_CACHE.restyle_all(dark_mode)
+
 class GraphWindow(QMainWindow):
-    def __init__(self, data, title="Graphique", y_label="Réserve", parent=None, mode="line", confidence_alpha=0.05):
+    def __init__(self, data, title="Graphique", y_label="Réserve", parent=None, mode="line", confidence_alpha=0.05, density=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setGeometry(300, 300, 1000, 600)
         self.data = data
-        self.mode = mode  # "line", "multi", "confidence"
+        self.mode = mode  # "line", "multi", "confidence", "runs"
         self.confidence_alpha = confidence_alpha
+        self.density = density  # Mode "runs" : None = densité 2-D automatique si trop de runs
         self._original_xlim = None
         self._original_ylim = None
 
@@ -103,6 +134,16 @@ class GraphWindow(QMainWindow):
                 all_x, all_y = x, y
                 all_labels = [f"Année {a}: {v:,.0f} DH" for a, v in zip(x, y)]
 
+            elif self.mode == "runs" and isinstance(self.data, pd.DataFrame):
+                # Toutes les trajectoires en un seul artiste, puis la moyenne par-dessus
+                annees, matrix = runs_matrix(self.data)
+                draw_all_runs(ax, annees, matrix, couleur="#0077cc", density=self.density)
+                x = annees.astype(int)
+                y = np.nanmean(matrix, axis=0)
+                ax.plot(x, y, marker='o', color="#C44D58", label=f"Réserve moyenne ({len(matrix)} runs)")
+                all_x, all_y = x, y
+                all_labels = [f"Année {a}: {v:,.0f} DH" for a, v in zip(x, y)]
+
             elif isinstance(self.data, pd.DataFrame):
                 reserve_par_annee = self.data.groupby("Annee")["Reserve"].mean()
                 x = np.array(reserve_par_annee.index, dtype=int)
@@ -1,9 +1,12 @@
 # ui/progress_dialog.py
 
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import pyqtSignal
 
 class ProgressDialog(QDialog):
-    def __init__(self, message="Veuillez patienter...", max_steps=4):
+    canceled = pyqtSignal()  # Bouton "Annuler" ou fermeture de la fenêtre (si cancelable)
+
+    def __init__(self, message="Veuillez patienter...", max_steps=4, cancelable=False):
         super().__init__()
         self.setWindowTitle("Traitement en cours")
         self.setModal(True)
@@ -16,7 +19,33 @@ class ProgressDialog(QDialog):
         self.progress.setMaximum(max_steps)
         self.progress.setValue(0)
         layout.addWidget(self.progress)
-        self.setFixedSize(340, 120)
+        # Ligne de détail (run en cours, temps restant…)
+        self.detail_label = QLabel("")
+        self.detail_label.setStyleSheet("color:#666;")
+        layout.addWidget(self.detail_label)
+        self.cancel_btn = None
+        if cancelable:
+            self.cancel_btn = QPushButton("Annuler")
+            self.cancel_btn.clicked.connect(self.cancel)
+            layout.addWidget(self.cancel_btn)
+        self.setFixedSize(340, 170 if cancelable else 140)
 
     def set_step(self, step):
         self.progress.setValue(step)
+
+    def set_detail(self, text):
+        self.detail_label.setText(text)
+
+    def cancel(self):
+        """Demande l'annulation : le dialogue reste ouvert jusqu'à l'arrêt effectif du traitement."""
+        if self.cancel_btn is not None and self.cancel_btn.isEnabled():
+            self.cancel_btn.setEnabled(False)
+            self.detail_label.setText("Annulation en cours…")
+            self.canceled.emit()
+
+    def reject(self):
+        # Échap / croix : vaut "Annuler" si le traitement est annulable (fermer ensuite avec accept())
+        if self.cancel_btn is not None:
+            self.cancel()
+        else:
+            super().reject()
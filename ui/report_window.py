@@ -7,10 +7,8 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QFileDialog, QGroupBox
 )
 
-from ui.charts_window import TabReserve, TabComparaison, TabConfidence
-from ui.results_window import TabSummary, TabByYear
 from ui.dialogs import show_error, confirm_export_success, confirm_export_failure
-from utils.pdf_export import export_report_to_pdf
+from utils.report_builder import ReportBuilder, REPORT_PARTS, DEFAULT_CACHE_DIR
 
 
 class ReportWindow(QDialog):
@@ -88,46 +86,12 @@ class ReportWindow(QDialog):
             export_path += ".pdf"
 
         try:
-            tabs = []
-
-            if self.cb_reserve.isChecked() and isinstance(self.data, pd.DataFrame):
-                tabs.append(TabReserve(self.data))
-            if self.cb_comparaison.isChecked() and isinstance(self.data_scenarios, dict):
-                tabs.append(TabComparaison(self.data_scenarios))
-            if self.cb_confidence.isChecked() and isinstance(self.data, pd.DataFrame):
-                tabs.append(TabConfidence(self.data))
-            if self.cb_tab_summary.isChecked() and isinstance(self.data, pd.DataFrame):
-                tabs.append(TabSummary(self.data))
-            if self.cb_tab_by_year.isChecked() and isinstance(self.data, pd.DataFrame):
-                tabs.append(TabByYear(self.data))
-
-            figures, stats, summary = [], [], ""
-
-            for tab in tabs:
-                # ⚠️ Forcer le rendu et les données
-                if hasattr(tab, "apply_filters"):
-                    tab.apply_filters(initial=True)
-                elif hasattr(tab, "plot_reserve"):
-                    tab.plot_reserve()
-                elif hasattr(tab, "plot_comparaison"):
-                    tab.plot_comparaison()
-                elif hasattr(tab, "plot_confidence"):
-                    tab.plot_confidence()
-
-                if self.cb_figures.isChecked() and hasattr(tab, "get_figure"):
-                    fig = tab.get_figure()
-                    if fig:
-                        figures.append(fig)
-
-                if self.cb_stats.isChecked() and hasattr(tab, "get_stats"):
-                    stat = tab.get_stats()
-                    if stat:
-                        stats.append((tab.__class__.__name__, stat))
-
-                if self.cb_summary.isChecked() and hasattr(tab, "get_summary"):
-                    s = tab.get_summary()
-                    if s:
-                        summary += s + "\n\n"
+            checked = {
+                "reserve": self.cb_reserve, "comparaison": self.cb_comparaison,
+                "confidence": self.cb_confidence, "summary": self.cb_tab_summary,
+                "by_year": self.cb_tab_by_year,
+            }
+            parts = [part for part in REPORT_PARTS if checked[part].isChecked()]
 
             sections = []
             if self.cb_summary.isChecked():
@@ -137,14 +101,9 @@ class ReportWindow(QDialog):
             if self.cb_figures.isChecked():
                 sections.append("figures")
 
-            ok = export_report_to_pdf(
-                path=export_path,
-                figures=figures,
-                stats=stats,
-                summary=summary.strip(),
-                sections=sections,
-                title="Rapport Simulation Retraite",
-                author="Nawfal RAZOUK"
+            # Contenu calculé directement depuis les données, sans construire les onglets
+            ok = ReportBuilder(self.data, self.data_scenarios).export_pdf(
+                export_path, parts=parts, sections=sections, cache_dir=DEFAULT_CACHE_DIR
             )
 
             if ok:
@@ -16,7 +16,7 @@ class TabCSVImport(QWidget):
     def __init__(self, data=None, parent=None):
         super().__init__(parent)
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
-        self.filtered_data = self.data.copy()
+        self.filtered_data = self.data
         self.max_rows_per_page = 50
         self.current_page = 0
         self.sort_columns, self.sort_orders = load_sort_config(self.CONFIG_SORT_PATH)
@@ -70,8 +70,7 @@ class TabCSVImport(QWidget):
         df = self.filtered_data
         n_rows = len(df)
         if n_rows == 0:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
+            self.table.set_dataframe(pd.DataFrame())
             self.lbl_page.setText("Aucune donnée")
             return
 
@@ -111,7 +110,7 @@ class TabCSVImport(QWidget):
                 ascending=self.sort_orders if self.sort_orders else True
             )
         else:
-            self.filtered_data = self.data.copy()
+            self.filtered_data = self.data
         self.current_page = 0
 
     def next_page(self):
@@ -0,0 +1,56 @@
+# ui/simulation_thread.py
+
+from contextlib import nullcontext
+
+from PyQt5.QtCore import QThread, pyqtSignal
+import pandas as pd
+
+from core.progress import CancellationToken, SimulationCancelled
+from core.simulator import Simulator
+from utils.run_journal import RunJournal
+from ui import logger
+
+
+class SimulationThread(QThread):
+    """
+    Exécute les 40 runs d'un scénario dans un thread de travail.
+    - progress(run, annee, elapsed, eta) relayé après chaque année simulée
+    - cancel() demande l'arrêt, effectif avant l'année suivante
+    - journal_path : si fourni, chaque run terminé est journalisé (RunJournal),
+      même en cas d'annulation ; None (défaut) n'écrit aucun journal
+    - live : LiveResults optionnel alimenté à chaque run (graphiques en direct)
+    """
+    progress = pyqtSignal(int, int, float, float)   # run, année, écoulé (s), restant estimé (s)
+    finished_ok = pyqtSignal(object)                # DataFrame concaténé des 40 runs
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, scenario_id, ix, iy, iz, journal_path=None, live=None, parent=None):
+        super().__init__(parent)
+        self.scenario_id = scenario_id
+        self.germes = (ix, iy, iz)
+        self.journal_path = journal_path
+        self.cancel_token = CancellationToken()
+        self.live = live
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            ix, iy, iz = self.germes
+            sim = Simulator(scenario_id=self.scenario_id, IX=ix, IY=iy, IZ=iz)
+            # Journal activé : un crash ne perd que le run en cours
+            journal_ctx = RunJournal(self.journal_path) if self.journal_path else nullcontext()
+            with journal_ctx as journal:
+                runs = sim.simuler_40_runs(
+                    journal=journal, progress=self.progress.emit, cancel_token=self.cancel_token,
+                    on_run=self.live.append_run if self.live is not None else None,
+                )
+            self.finished_ok.emit(pd.concat(runs, ignore_index=True))
+        except SimulationCancelled:
+            logger.info("Simulation annulée (scénario %s).", self.scenario_id)
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error("Erreur lors de la simulation : %s", str(e))
+            self.failed.emit(str(e))
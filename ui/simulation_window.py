@@ -2,13 +2,16 @@
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QComboBox,
-    QLineEdit, QPushButton, QFormLayout, QMessageBox
+    QLineEdit, QPushButton, QFormLayout, QMessageBox, QCheckBox
 )
 from PyQt5.QtCore import Qt
 
-from core.simulator import Simulator
 from core.scenario import SCENARIOS
-import pandas as pd
+from ui.progress_dialog import ProgressDialog
+from ui.simulation_thread import SimulationThread
+from ui.widgets.live_chart_widget import LiveChartWidget
+from utils.live_results import LiveResults
+from utils.run_journal import get_default_journal_path, prune_old_journals
 
 from ui import logger  # Logger global UI
 
@@ -51,6 +54,16 @@ class SimulationWindow(QMainWindow):
         form.addRow("Gemme IZ :", self.edit_iz)
         layout.addLayout(form)
 
+        # Suivi en direct : graphique mis à jour à chaque run terminé
+        self.check_live = QCheckBox("Afficher le graphique en direct")
+        self.check_live.setChecked(True)
+        layout.addWidget(self.check_live)
+
+        # Journal des runs sur disque (reprise après crash) : désactivé par défaut
+        self.check_journal = QCheckBox("Journaliser les runs sur disque")
+        self.check_journal.setChecked(False)
+        layout.addWidget(self.check_journal)
+
         # Bouton lancer
         self.btn_lancer = QPushButton("Lancer la Simulation")
         self.btn_lancer.setMinimumHeight(40)
@@ -72,27 +85,99 @@ class SimulationWindow(QMainWindow):
             logger.warning("Valeurs de germes invalides saisies par l'utilisateur.")
             return
 
-        try:
-            sim = Simulator(scenario_id, IX=ix, IY=iy, IZ=iz)
-            runs = sim.simuler_40_runs()
-            df_concat = pd.concat(runs, ignore_index=True)
-
-            # Stockage du résultat dans le parent (MenuWindow)
-            parent = self.parent()
-            if parent is not None:
-                parent.dernier_resultat_df = df_concat
-                logger.debug("Résultat simulation stocké dans le parent.")
-
-            reserve_finale = df_concat[df_concat["Annee"] == 2035]["Reserve"].mean()
-            QMessageBox.information(self, "Simulation terminée",
-                f"Simulation (40 runs) pour le scénario {scenario_id} effectuée.\n"
-                f"Réserve moyenne finale (2035) : {reserve_finale:,.2f} DH\n"
-                f"\nLes résultats sont disponibles dans le menu Résultats."
-            )
-            logger.info("Simulation terminée : réserve moyenne 2035 = %.2f DH", reserve_finale)
-        except Exception as e:
-            logger.error("Erreur lors de la simulation : %s", str(e))
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de la simulation : {e}")
+        # Simulation dans un thread : l'interface reste réactive et la simulation annulable
+        self.btn_lancer.setEnabled(False)
+        self._scenario_id = scenario_id
+        self._progress_dialog = ProgressDialog("Simulation des 40 runs en cours…", max_steps=40 * 11, cancelable=True)
+        self._live = LiveResults(expected_runs=40) if self.check_live.isChecked() else None
+        # Graphique du lancement précédent fermé (et détruit) avant d'en ouvrir un nouveau
+        if getattr(self, "_live_chart", None) is not None:
+            self._live_chart.close()
+        self._live_chart = None
+        if self._live is not None:
+            # Fenêtre séparée mais possédée par SimulationWindow : détruite avec elle
+            chart = LiveChartWidget(self._live, parent=self)
+            chart.setWindowFlag(Qt.Window)
+            chart.setAttribute(Qt.WA_DeleteOnClose)
+            chart.destroyed.connect(lambda *_: self._forget_live_chart(chart))
+            chart.show()
+            self._live_chart = chart
+        journal_path = None
+        if self.check_journal.isChecked():
+            prune_old_journals()  # Seuls les journaux les plus récents sont conservés
+            journal_path = get_default_journal_path()
+        self._journal_path = journal_path
+        self._sim_thread = SimulationThread(
+            scenario_id, ix, iy, iz, journal_path=journal_path, live=self._live, parent=self
+        )
+        self._sim_thread.progress.connect(self._on_progress)
+        self._sim_thread.finished_ok.connect(self._on_simulation_done)
+        self._sim_thread.cancelled.connect(self._on_simulation_cancelled)
+        self._sim_thread.failed.connect(self._on_simulation_failed)
+        self._progress_dialog.canceled.connect(self._sim_thread.cancel)
+        self._progress_dialog.show()
+        self._sim_thread.start()
+
+    def closeEvent(self, event):
+        # Fermeture pendant un calcul : arrêt coopératif avant de détruire le thread
+        thread = getattr(self, "_sim_thread", None)
+        if thread is not None and thread.isRunning():
+            # Signaux déconnectés d'abord : le `cancelled` mis en file ne doit pas
+            # afficher de message ni rouvrir le dialogue sur une fenêtre qui se ferme
+            for signal in (thread.progress, thread.finished_ok, thread.cancelled, thread.failed):
+                signal.disconnect()
+            thread.cancel()
+            thread.wait()
+            self._end_simulation()
+        if getattr(self, "_live_chart", None) is not None:
+            self._live_chart.close()
+        super().closeEvent(event)
+
+    def _forget_live_chart(self, chart):
+        # Fermé par l'utilisateur : ne plus toucher au widget détruit
+        if self._live_chart is chart:
+            self._live_chart = None
+
+    def _on_progress(self, run, annee, elapsed, eta):
+        self._progress_dialog.set_step((run - 1) * 11 + (annee - 2025) + 1)
+        self._progress_dialog.set_detail(
+            f"Run {run}/40 — année {annee} — écoulé {elapsed:.0f} s — restant ≈ {eta:.0f} s"
+        )
+
+    def _end_simulation(self):
+        if self._live_chart is not None:
+            self._live_chart.stop()  # Reste affiché : runs reçus jusqu'à la fin ou l'annulation
+        self._progress_dialog.accept()
+        self.btn_lancer.setEnabled(True)
+
+    def _on_simulation_done(self, df_concat):
+        self._end_simulation()
+        scenario_id = self._scenario_id
+
+        # Stockage du résultat dans le parent (MenuWindow)
+        parent = self.parent()
+        if parent is not None:
+            parent.dernier_resultat_df = df_concat
+            logger.debug("Résultat simulation stocké dans le parent.")
+
+        reserve_finale = df_concat[df_concat["Annee"] == 2035]["Reserve"].mean()
+        QMessageBox.information(self, "Simulation terminée",
+            f"Simulation (40 runs) pour le scénario {scenario_id} effectuée.\n"
+            f"Réserve moyenne finale (2035) : {reserve_finale:,.2f} DH\n"
+            f"\nLes résultats sont disponibles dans le menu Résultats."
+        )
+        logger.info("Simulation terminée : réserve moyenne 2035 = %.2f DH", reserve_finale)
+
+    def _on_simulation_cancelled(self):
+        self._end_simulation()
+        message = "La simulation a été annulée."
+        if self._journal_path:
+            message += f"\nLes runs déjà terminés restent disponibles dans le journal :\n{self._journal_path}"
+        QMessageBox.information(self, "Simulation annulée", message)
+
+    def _on_simulation_failed(self, message):
+        self._end_simulation()
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de la simulation : {message}")
 
 # --- Pour test seul ---
 # if __name__ == "__main__":
@@ -1,17 +1,32 @@
 # ui/tabs_shared/base_tab_filtered.py
 
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QComboBox, QLineEdit, QPushButton, QFileDialog
 )
 import pandas as pd
+from utils.filtered_view import get_filtered_view
+from utils.result_store import ResultStore
+from ui.widgets.dataframe_model import DataFrameTableView, format_rounded
+from ui.filter_scheduler import FilterScheduler
 from ui.results_window.logger import logger
 
 class BaseTabFiltered(QWidget):
+    """
+    Onglet de résultats filtrés par année / simulation / texte.
+    `data` peut être un DataFrame ou un ResultStore SQLite : dans ce cas les filtres
+    (année, simulation et recherche texte) sont exécutés en SQL et les lignes affichées
+    par pages de `page_size`.
+    """
+    page_size = 1000
+
     def __init__(self, data=None):
         super().__init__()
+        self.store = data if isinstance(data, ResultStore) else None
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
-        self.filtered_data = self.data.copy()
+        self.filtered_data = self.data
+        self._page_keys = [0]   # Clés de début des pages parcourues (pagination keyset)
+        self._next_key = None
 
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel("<b>Résultats filtrés par année et simulation</b>"))
@@ -36,84 +51,147 @@ class BaseTabFiltered(QWidget):
         filter_layout.addWidget(self.export_btn)
         layout.addLayout(filter_layout)
 
+        # --- Pagination (stock SQLite uniquement) ---
+        if self.store is not None:
+            page_layout = QHBoxLayout()
+            self.prev_btn = QPushButton("◀ Page précédente")
+            self.next_btn = QPushButton("Page suivante ▶")
+            self.page_label = QLabel()
+            self.prev_btn.clicked.connect(self.previous_page)
+            self.next_btn.clicked.connect(self.next_page)
+            page_layout.addWidget(self.prev_btn)
+            page_layout.addWidget(self.page_label)
+            page_layout.addWidget(self.next_btn)
+            layout.addLayout(page_layout)
+
         # --- Tableau ---
-        self.table = QTableWidget()
+        self.table = DataFrameTableView(formatter=format_rounded)
         layout.addWidget(self.table)
 
         self.setLayout(layout)
         self.populate_filters()
-        self.update_table()
-
-        # --- Connexions ---
-        self.year_combo.currentTextChanged.connect(self.apply_filters)
-        self.sim_combo.currentTextChanged.connect(self.apply_filters)
-        self.search_edit.textChanged.connect(self.apply_filters)
+        if self.store is not None:
+            self.apply_filters()
+        else:
+            self.update_table()
+
+        # --- Connexions (filtrage différé et hors thread GUI, sauf stock SQLite) ---
+        self.filter_scheduler = FilterScheduler(
+            self._filter_params, self._compute_filtered, self._show_filtered, parent=self
+        )
+        self.year_combo.currentTextChanged.connect(self._on_filters_changed)
+        self.sim_combo.currentTextChanged.connect(self._on_filters_changed)
+        self.search_edit.textChanged.connect(self._on_filters_changed)
 
     def populate_filters(self):
+        if self.store is not None:
+            self.year_combo.addItems([str(y) for y in self.store.distinct("Annee")])
+            self.sim_combo.addItems([str(s) for s in self.store.distinct("Simulation")])
+            return
         if not isinstance(self.data, pd.DataFrame):
             return
 
         try:
-            years = sorted(self.data["Annee"].unique())
-            self.year_combo.addItems([str(y) for y in years])
-            if "Simulation" in self.data.columns:
-                sims = sorted(self.data["Simulation"].unique())
-                self.sim_combo.addItems([str(s) for s in sims])
+            view = get_filtered_view(self.data)
+            self.year_combo.addItems([str(y) for y in view.values("Annee")])
+            self.sim_combo.addItems([str(s) for s in view.values("Simulation")])
         except Exception as e:
             logger.error("Erreur lors du remplissage des filtres : %s", str(e))
 
-    def apply_filters(self):
+    def _store_filters(self):
+        """Filtres courants au format ResultStore (None = pas de filtre)."""
         year_text = self.year_combo.currentText()
         sim_text = self.sim_combo.currentText()
-        query = self.search_edit.text().strip().lower()
+        return {
+            "annees": None if year_text == "Toutes années" else [int(year_text)],
+            "simulations": None if sim_text == "Toutes simulations" else [int(sim_text)],
+            "text": self.search_edit.text().strip().lower() or None,
+        }
+
+    def _load_page(self):
+        """Charge la page courante depuis le stock SQLite (tous les filtres, texte compris, en SQL)."""
+        filters = self._store_filters()
+        df, last_key = self.store.fetch_page(self.page_size, after=self._page_keys[-1], **filters)
+        self._next_key = last_key if len(df) == self.page_size else None
 
-        df = self.data.copy()
+        self.filtered_data = df
+        total = self.store.count(**filters)
+        self.page_label.setText(f"Page {len(self._page_keys)} — {total} lignes au total")
+        self.prev_btn.setEnabled(len(self._page_keys) > 1)
+        self.next_btn.setEnabled(self._next_key is not None)
+        logger.debug("[BaseTabFiltered] Page %d chargée : %d lignes (filtres=%s)",
+                     len(self._page_keys), len(df), filters)
+        self.update_table()
+
+    def next_page(self):
+        if self.store is not None and self._next_key is not None:
+            self._page_keys.append(self._next_key)
+            self._load_page()
 
+    def previous_page(self):
+        if self.store is not None and len(self._page_keys) > 1:
+            self._page_keys.pop()
+            self._load_page()
+
+    def apply_filters(self):
+        if self.store is not None:
+            try:
+                self._page_keys = [0]
+                self._load_page()
+            except ValueError:
+                logger.warning("Filtres invalides : Année=%s, Sim=%s",
+                               self.year_combo.currentText(), self.sim_combo.currentText())
+            return
+
+        self._show_filtered(self._compute_filtered(self._filter_params()))
+
+    def _on_filters_changed(self, *args):
+        if self.store is not None:
+            self.apply_filters()  # Requêtes SQL paginées : rapides, et connexion liée au thread GUI
+        else:
+            self.filter_scheduler.schedule()
+
+    def _filter_params(self):
+        """Lit l'état des filtres (thread GUI) : (données, filtres FilteredView)."""
+        year_text = self.year_combo.currentText()
+        sim_text = self.sim_combo.currentText()
+        filters = {"query": self.search_edit.text().strip().lower()}
         if year_text != "Toutes années":
             try:
-                df = df[df["Annee"] == int(year_text)]
-            except Exception:
+                filters["annees"] = [int(year_text)]
+            except ValueError:
                 logger.warning("Filtre année invalide : %s", year_text)
-
-        if sim_text != "Toutes simulations" and "Simulation" in df.columns:
+        if sim_text != "Toutes simulations":
             try:
-                df = df[df["Simulation"] == int(sim_text)]
-            except Exception:
+                filters["simulations"] = [int(sim_text)]
+            except ValueError:
                 logger.warning("Filtre simulation invalide : %s", sim_text)
+        return self.data, filters
 
-        if query:
-            df = df[df.astype(str).apply(lambda row: query in " ".join(row).lower(), axis=1)]
+    @staticmethod
+    def _compute_filtered(params):
+        # Vue partagée : index de groupes par année / simulation, aucune copie des données
+        data, filters = params
+        return get_filtered_view(data).select(**filters)
 
+    def _show_filtered(self, df):
         self.filtered_data = df
-        logger.debug("[BaseTabFiltered] Résultat filtré : %d lignes — Année=%s, Sim=%s, Query='%s'",
-                     len(df), year_text, sim_text, query)
+        logger.debug("[BaseTabFiltered] Résultat filtré : %d lignes", len(df))
         self.update_table()
 
     def update_table(self):
         df = self.filtered_data
-        self.table.clear()
+        self.table.set_dataframe(df)
 
         if df.empty:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
             logger.warning("BaseTabFiltered : Aucune donnée à afficher.")
             return
 
-        df = df.reset_index(drop=True)
-        cols = list(df.columns)
-        self.table.setColumnCount(len(cols))
-        self.table.setRowCount(len(df))
-        self.table.setHorizontalHeaderLabels(cols)
-
-        for i, row in df.iterrows():
-            for j, val in enumerate(row):
-                val_str = str(int(val)) if isinstance(val, float) else str(val)
-                self.table.setItem(i, j, QTableWidgetItem(val_str))
-                logger.debug("→ Cell[%d,%d] = %s", i, j, val_str)
-
         logger.info("BaseTabFiltered : tableau mis à jour avec %d lignes.", len(df))
 
     def export_filtered_view(self):
+        if self.store is None:
+            self.filter_scheduler.flush()  # Filtre encore en anti-rebond : exporter l'état affiché par les widgets
         if self.filtered_data.empty:
             logger.warning("Export CSV échoué : aucune donnée.")
             return
@@ -121,7 +199,9 @@ class BaseTabFiltered(QWidget):
         path, _ = QFileDialog.getSaveFileName(self, "Exporter la vue filtrée", "", "CSV (*.csv)")
         if path:
             try:
-                self.filtered_data.to_csv(path, index=False)
+                # Stock SQLite : toutes les pages correspondant aux filtres, pas seulement la page affichée
+                df = self.store.query(**self._store_filters()) if self.store is not None else self.filtered_data
+                df.to_csv(path, index=False)
                 logger.info("Export CSV réussi : %s", path)
             except Exception as e:
                 logger.error("Erreur export CSV : %s", str(e))
@@ -1,9 +1,9 @@
 # ui/tabs_shared/base_tab_interactive.py
 
-from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem
-)
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt
 import pandas as pd
+from ui.widgets.dataframe_model import DataFrameTableView, format_rounded
 from ui.results_window.logger import logger
 
 class BaseTabInteractive(QWidget):
@@ -14,7 +14,8 @@ class BaseTabInteractive(QWidget):
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel(f"<b>{title}</b>"))
 
-        self.table = QTableWidget()
+        self.table = DataFrameTableView(formatter=format_rounded)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)  # Ordre d'origine au départ
         self.table.setSortingEnabled(True)
         layout.addWidget(self.table)
 
@@ -23,23 +24,13 @@ class BaseTabInteractive(QWidget):
 
     def show_table(self):
         if self.data.empty:
-            self.table.setRowCount(0)
-            self.table.setColumnCount(0)
+            self.table.set_dataframe(pd.DataFrame())
             logger.warning("BaseTabInteractive : Aucune donnée à afficher.")
             return
 
         try:
-            df = self.data.reset_index(drop=True)
-            cols = list(df.columns)
-
-            self.table.setColumnCount(len(cols))
-            self.table.setRowCount(len(df))
-            self.table.setHorizontalHeaderLabels(cols)
-
-            for i, row in df.iterrows():
-                for j, val in enumerate(row):
-                    val_str = str(int(val)) if isinstance(val, float) else str(val)
-                    self.table.setItem(i, j, QTableWidgetItem(val_str))
+            df = self.data
+            self.table.set_dataframe(df)
 
             logger.info("BaseTabInteractive : tableau affiché avec %d lignes.", len(df))
 
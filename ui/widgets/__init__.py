@@ -4,7 +4,9 @@ from .animated_tool_button import AnimatedToolButton
 from .fade_tab_widget import FadeTabWidget
 from .fade_widget import FadeWidget
 from .csv_table_widget import CSVTableWidget
+from .dataframe_model import DataFrameTableModel, DataFrameTableView
 from .hybrid_graph_widget import HybridGraphWidget
+from .live_chart_widget import LiveChartWidget
 from .plot_helpers import *
 from .report_export_dialog import ReportExportDialog
 from .sort_dialog import SortDialog
@@ -15,7 +17,10 @@ __all__ = [
     "FadeTabWidget",
     "FadeWidget",
     "CSVTableWidget",
+    "DataFrameTableModel",
+    "DataFrameTableView",
     "HybridGraphWidget",
+    "LiveChartWidget",
     "ReportExportDialog",
     "SortDialog",
 ]
@@ -0,0 +1,173 @@
+# ui/widgets/dataframe_model.py
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtWidgets import QTableView, QAbstractItemView, QApplication, QShortcut
+from PyQt5.QtGui import QKeySequence
+
+
+def format_rounded(val):
+    """Affiche les flottants en entiers (convention des onglets de résultats)."""
+    if isinstance(val, (float, np.floating)):
+        return str(int(val)) if np.isfinite(val) else ""
+    return str(val)
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    Modèle Qt adossé directement à un DataFrame : seules les cellules visibles sont
+    formatées (aucun QTableWidgetItem). Les colonnes sont lues via leurs tableaux NumPy.
+    En mode éditable, le DataFrame est copié à la première modification (la source reste intacte).
+    """
+
+    def __init__(self, df=None, formatter=str, editable=False, parent=None):
+        super().__init__(parent)
+        self.formatter = formatter
+        self.editable = editable
+        self._df = pd.DataFrame()
+        self._values = []
+        self._owned = False
+        self.set_dataframe(df)
+
+    # --- Données ---
+
+    def set_dataframe(self, df):
+        self.beginResetModel()
+        self._df = df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+        self._owned = False
+        self._refresh_values()
+        self.endResetModel()
+
+    def dataframe(self):
+        """DataFrame affiché (modifications comprises)."""
+        return self._df
+
+    def _refresh_values(self, column=None):
+        if column is None:
+            self._values = [self._df.iloc[:, j].to_numpy() for j in range(self._df.shape[1])]
+        else:
+            self._values[column] = self._df.iloc[:, column].to_numpy()
+
+    # --- Interface QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._df)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._df.shape[1]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        val = self._values[index.column()][index.row()]
+        if role == Qt.DisplayRole:
+            return self.formatter(val)
+        if role == Qt.EditRole:
+            return str(val)
+        if role == Qt.TextAlignmentRole and isinstance(val, (int, float, np.number)):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return str(self._df.columns[section])
+        return str(section + 1)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        return flags | Qt.ItemIsEditable if self.editable else flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or not self.editable:
+            return False
+        row, col = index.row(), index.column()
+        series = self._df.iloc[:, col]
+        try:
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                if value not in series.cat.categories:
+                    self._own()
+                    self._df.isetitem(col, self._df.iloc[:, col].cat.add_categories([value]))
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                number = float(value)
+                if pd.api.types.is_integer_dtype(series.dtype) and not number.is_integer():
+                    return False
+                value = np.array([number]).astype(series.dtype)[0]
+        except (TypeError, ValueError):
+            return False
+        self._own()
+        self._df.iat[row, col] = value
+        self._refresh_values(col)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def _own(self):
+        if not self._owned:
+            self._df = self._df.copy()
+            self._owned = True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0 or column >= self._df.shape[1]:
+            return
+        self.layoutAboutToBeChanged.emit()
+        positions = np.argsort(self._values[column], kind="stable")
+        if order == Qt.DescendingOrder:
+            positions = positions[::-1]
+        self._df = self._df.iloc[positions]
+        self._owned = True
+        self._refresh_values()
+        self.layoutChanged.emit()
+
+
+class DataFrameTableView(QTableView):
+    """
+    QTableView associé à un DataFrameTableModel, avec copier/coller compatibles Excel
+    (Ctrl+C / Ctrl+V, cellules séparées par tabulations).
+    """
+
+    def __init__(self, formatter=str, editable=False, parent=None):
+        super().__init__(parent)
+        self.setModel(DataFrameTableModel(formatter=formatter, editable=editable, parent=self))
+        self.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.setAlternatingRowColors(True)
+        if not editable:
+            self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        QShortcut(QKeySequence("Ctrl+C"), self, activated=self.copy_selected)
+        if editable:
+            QShortcut(QKeySequence("Ctrl+V"), self, activated=self.paste_selected)
+
+    def set_dataframe(self, df):
+        self.model().set_dataframe(df)
+
+    def dataframe(self):
+        return self.model().dataframe()
+
+    def copy_selected(self):
+        """Copie la sélection (rectangle englobant) dans le presse-papiers."""
+        selection = self.selectedIndexes()
+        if not selection:
+            return
+        rows = sorted(idx.row() for idx in selection)
+        cols = sorted(idx.column() for idx in selection)
+        data = [[""] * (cols[-1] - cols[0] + 1) for _ in range(rows[-1] - rows[0] + 1)]
+        for idx in selection:
+            data[idx.row() - rows[0]][idx.column() - cols[0]] = idx.data(Qt.DisplayRole)
+        QApplication.clipboard().setText("\n".join("\t".join(row) for row in data))
+
+    def paste_selected(self):
+        """Colle le presse-papiers à partir de la cellule en haut à gauche de la sélection."""
+        clipboard = QApplication.clipboard().text()
+        if not clipboard:
+            return
+        selection = self.selectedIndexes()
+        anchor = min(selection, key=lambda idx: (idx.row(), idx.column())) if selection else self.currentIndex()
+        if not anchor.isValid():
+            return
+        model = self.model()
+        for i, line in enumerate(clipboard.rstrip("\n").split("\n")):
+            for j, text in enumerate(line.split("\t")):
+                r, c = anchor.row() + i, anchor.column() + j
+                if r < model.rowCount() and c < model.columnCount():
+                    model.setData(model.index(r, c), text)
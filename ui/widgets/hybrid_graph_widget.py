@@ -3,29 +3,52 @@ from PyQt5.QtCore import Qt
 
 import matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
 import matplotlib.pyplot as plt
 
+import numpy as np
 import pyqtgraph as pg
 import pandas as pd
 
 from ui.theme import MPL_COLORS, get_custom_palette, get_dark_palette
 from utils.mpl_theme import set_mpl_theme
+from utils.downsample import lttb, minmax_decimate, visible_slice
 
 class HybridGraphWidget(QWidget):
-    def __init__(self, data=None, engine="mpl", dark_mode=False, parent=None):
+    """
+    Graphique de réserve à double moteur (matplotlib / pyqtgraph) avec niveau de détail :
+    - engine="auto" choisit pyqtgraph au-delà de `pg_threshold` points
+    - show_runs=True trace la trajectoire de chaque run (un seul artiste / item)
+    - au plus `max_points` points sont tracés pour la fenêtre visible ; la courbe est
+      réduite (LTTB ou min/max) et le nombre de runs tracés s'adapte au zoom, recalculés à chaque zoom/pan
+
+    Widget à intégrer (exporté par ui.widgets), non utilisé par les fenêtres actuelles :
+    leurs séries comptent une dizaine d'années, et la vue « Tous les runs » de GraphWindow
+    trace déjà tous les runs en un seul artiste, ou en densité 2-D au-delà de
+    SPAGHETTI_DENSITY_THRESHOLD runs (utils.charts), en gardant ses infobulles, son zoom
+    et son cache de fenêtres.
+    """
+    max_points = 5000
+    pg_threshold = 20_000
+    downsample = "lttb"   # ou "minmax" (préserve les pics)
+
+    def __init__(self, data=None, engine="auto", dark_mode=False, parent=None, show_runs=False):
         super().__init__(parent)
-        self.engine = engine      # "mpl" or "pg"
+        self.engine = engine      # "mpl", "pg" ou "auto"
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
         self.dark_mode = dark_mode
+        self.show_runs = show_runs
         self._graph_widget = None
+        self._lod_items = {}
 
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0,0,0,0)
         self.setLayout(self.layout)
+        self._prepare_series()
         self.draw_graph()
 
     def set_engine(self, engine):
-        """Change le moteur de rendu graphique (matplotlib / pyqtgraph)."""
+        """Change le moteur de rendu graphique (matplotlib / pyqtgraph / auto)."""
         if engine == self.engine:
             return
         self.engine = engine
@@ -34,6 +57,13 @@ class HybridGraphWidget(QWidget):
     def set_data(self, data):
         """Recharge les données et redessine le graphique actif."""
         self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
+        self._prepare_series()
+        self.draw_graph()
+
+    def set_show_runs(self, show_runs):
+        """Affiche (ou masque) les trajectoires de tous les runs."""
+        self.show_runs = show_runs
+        self._prepare_series()
         self.draw_graph()
 
     def set_dark_mode(self, dark):
@@ -47,34 +77,100 @@ class HybridGraphWidget(QWidget):
             self._graph_widget.setParent(None)
             self._graph_widget.deleteLater()
             self._graph_widget = None
+        self._lod_items = {}
+
+    def active_engine(self):
+        """Moteur effectivement utilisé ("auto" résolu selon le nombre de points)."""
+        if self.engine != "auto":
+            return self.engine
+        n_points = self._runs.size if self._runs is not None else len(self._x)
+        return "pg" if n_points > self.pg_threshold else "mpl"
 
     def draw_graph(self):
         """Crée le widget graphique selon le moteur/les données/le thème."""
         self.clear_graph()
-        if self.engine == "mpl":
+        if self.active_engine() == "mpl":
             self._graph_widget = self._plot_mpl()
         else:
             self._graph_widget = self._plot_pg()
         self.layout.addWidget(self._graph_widget)
 
+    # ---- Séries et niveau de détail ----
+
+    def _has_data(self):
+        return not self.data.empty and "Annee" in self.data.columns and "Reserve" in self.data.columns
+
+    def _prepare_series(self):
+        """Calcule une fois la moyenne par année et, si demandé, la matrice runs × années."""
+        self._x = np.array([])
+        self._y = np.array([])
+        self._runs = None
+        if not self._has_data():
+            return
+        reserve_par_annee = self.data.groupby("Annee")["Reserve"].mean()
+        self._x = reserve_par_annee.index.to_numpy(dtype=float)
+        self._y = reserve_par_annee.to_numpy(dtype=float)
+        if self.show_runs and "Simulation" in self.data.columns:
+            matrix = self.data.pivot_table(index="Simulation", columns="Annee", values="Reserve")
+            self._runs = matrix.reindex(columns=reserve_par_annee.index).to_numpy(dtype=float)
+
+    def lod_series(self, x_min=None, x_max=None):
+        """
+        Données à tracer pour la fenêtre [x_min, x_max] :
+        (x, y) de la moyenne (réduite si trop de points) et (x, y) des runs retenus,
+        concaténés et séparés par NaN (None sans runs).
+        """
+        x_min = self._x[0] if x_min is None and len(self._x) else x_min
+        x_max = self._x[-1] if x_max is None and len(self._x) else x_max
+        start, stop = visible_slice(self._x, x_min, x_max)
+        x, y = self._x[start:stop], self._y[start:stop]
+        if len(x) > self.max_points:
+            reduce = minmax_decimate if self.downsample == "minmax" else lttb
+            kept = reduce(x, y, self.max_points)
+            x, y = x[kept], y[kept]
+
+        runs = None
+        if self._runs is not None and stop > start:
+            block = self._runs[:, start:stop]
+            # Budget de points constant : plus on zoome, plus de runs sont tracés
+            n_runs = min(len(block), max(self.max_points // block.shape[1], 1))
+            rows = np.unique(np.linspace(0, len(block) - 1, n_runs).astype(int))
+            sub = block[rows]
+            xs = np.tile(np.append(self._x[start:stop], np.nan), len(rows))
+            ys = np.hstack([sub, np.full((len(rows), 1), np.nan)]).ravel()
+            runs = (xs, ys)
+        return (x, y), runs
+
+    def _run_color(self):
+        return "#9aa5b1" if not self.dark_mode else "#5c6773"
+
+    # ---- Matplotlib ----
+
     def _plot_mpl(self):
         """Affiche la courbe (matplotlib). Zoom/pan inclus nativement."""
         set_mpl_theme(self.dark_mode)
         fig, ax = plt.subplots(figsize=(7, 4), tight_layout=True)
-        if not self.data.empty and "Annee" in self.data.columns and "Reserve" in self.data.columns:
-            reserve_par_annee = self.data.groupby("Annee")["Reserve"].mean()
-            ax.plot(
-                reserve_par_annee.index,
-                reserve_par_annee.values,
-                marker='o',
+        if self._has_data():
+            (x, y), runs = self.lod_series()
+            if runs is not None:
+                runs_coll = LineCollection(self._segments(runs), colors=self._run_color(),
+                                           linewidths=0.6, alpha=0.35, label="Runs")
+                ax.add_collection(runs_coll)
+                self._lod_items["runs"] = runs_coll
+            line, = ax.plot(
+                x, y,
+                marker='o' if len(x) <= 200 else None,
                 color=MPL_COLORS['reserve'],
                 label="Réserve moyenne"
             )
+            self._lod_items["mean"] = line
+            ax.autoscale_view()
             ax.set_title("Réserve moyenne par année")
             ax.set_xlabel("Année")
             ax.set_ylabel("Réserve (DH)")
             ax.legend()
             ax.grid(True)
+            ax.callbacks.connect("xlim_changed", self._refresh_mpl_lod)
         else:
             ax.text(0.5, 0.5, "Aucune donnée à afficher", ha='center', va='center', fontsize=12, color="red")
         canvas = FigureCanvas(fig)
@@ -82,21 +178,45 @@ class HybridGraphWidget(QWidget):
         canvas.setFocus()
         return canvas
 
+    @staticmethod
+    def _segments(runs):
+        """(x, y) séparés par NaN -> tableau (runs, années, 2) pour LineCollection."""
+        xs, ys = runs
+        n_cols = int(np.flatnonzero(np.isnan(xs))[0]) + 1
+        pts = np.column_stack([xs, ys]).reshape(-1, n_cols, 2)
+        return pts[:, :-1, :]
+
+    def _refresh_mpl_lod(self, ax):
+        x_min, x_max = ax.get_xlim()
+        (x, y), runs = self.lod_series(x_min, x_max)
+        self._lod_items["mean"].set_data(x, y)
+        if runs is not None and "runs" in self._lod_items:
+            self._lod_items["runs"].set_segments(self._segments(runs))
+        ax.figure.canvas.draw_idle()
+
+    # ---- PyQtGraph ----
+
     def _plot_pg(self):
         """Affiche la courbe (pyqtgraph) avec zoom/pan très fluide."""
         plt = pg.PlotWidget()
         plt.showGrid(x=True, y=True, alpha=0.4)
-        if not self.data.empty and "Annee" in self.data.columns and "Reserve" in self.data.columns:
-            reserve_par_annee = self.data.groupby("Annee")["Reserve"].mean()
-            x = list(reserve_par_annee.index)
-            y = list(reserve_par_annee.values)
+        if self._has_data():
+            (x, y), runs = self.lod_series()
+            if runs is not None:
+                # Un seul item pour tous les runs : segments séparés par NaN
+                run_pen = pg.mkPen(color=self._run_color(), width=1)
+                self._lod_items["runs"] = plt.plot(runs[0], runs[1], pen=run_pen, connect="finite", name="Runs")
             color = MPL_COLORS['reserve'] if not self.dark_mode else "#4ec8e6"
             pen = pg.mkPen(color=color, width=3)
             symbolBrush = pg.mkBrush(color)
-            plt.plot(x, y, pen=pen, symbol='o', symbolBrush=symbolBrush, name="Réserve moyenne")
+            self._lod_items["mean"] = plt.plot(
+                x, y, pen=pen, symbol='o' if len(x) <= 200 else None,
+                symbolBrush=symbolBrush, name="Réserve moyenne"
+            )
             plt.setTitle("Réserve moyenne par année", color="w" if self.dark_mode else "#222", size="16pt")
             plt.setLabel("bottom", "Année", color="w" if self.dark_mode else "#222", size="11pt")
             plt.setLabel("left", "Réserve (DH)", color="w" if self.dark_mode else "#222", size="11pt")
+            plt.getPlotItem().sigXRangeChanged.connect(self._refresh_pg_lod)
         else:
             txt = pg.TextItem("Aucune donnée à afficher", color="r", anchor=(0.5, 0.5))
             plt.addItem(txt)
@@ -106,6 +226,12 @@ class HybridGraphWidget(QWidget):
             plt.setBackground("w")
         return plt
 
+    def _refresh_pg_lod(self, _view, x_range):
+        (x, y), runs = self.lod_series(*x_range)
+        self._lod_items["mean"].setData(x, y)
+        if runs is not None and "runs" in self._lod_items:
+            self._lod_items["runs"].setData(runs[0], runs[1], connect="finite")
+
     # ---- Optionnel: expose le widget courant pour manip custom (zoom, tooltips…) ----
     def current_widget(self):
         return self._graph_widget
@@ -113,4 +239,4 @@ class HybridGraphWidget(QWidget):
     # ---- (Bonus) Ajoute une méthode pour sélectionner engine via bouton ----
     def toggle_engine(self):
         """Bascule entre Matplotlib et PyQtGraph."""
-        self.set_engine("pg" if self.engine == "mpl" else "mpl")
+        self.set_engine("pg" if self.active_engine() == "mpl" else "mpl")
@@ -0,0 +1,71 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import QTimer
+
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from ui.theme import MPL_COLORS
+
+
+class LiveChartWidget(QWidget):
+    """
+    Graphique de réserve mis à jour pendant la simulation, à partir d'un LiveResults :
+    moyenne par année, barres d'IC et nombre de runs reçus.
+    Un QTimer (interval_ms) consulte la version de la source et ne redessine qu'en cas
+    de nouveaux runs, quel que soit le rythme auquel le simulateur les produit.
+    """
+
+    def __init__(self, live, interval_ms=500, parent=None):
+        super().__init__(parent)
+        self.live = live
+        self._drawn_version = None
+        self._errorbars = None
+        self.setWindowTitle("Simulation en direct — Réserve")
+        self.resize(720, 460)
+
+        layout = QVBoxLayout(self)
+        self.runs_label = QLabel("En attente du premier run…")
+        layout.addWidget(self.runs_label)
+
+        self.figure = Figure(figsize=(7, 4))
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.set_title("Réserve moyenne par année (en cours)")
+        self.ax.set_xlabel("Année")
+        self.ax.set_ylabel("Réserve (DH)")
+        self.ax.grid(True)
+        self.mean_line, = self.ax.plot([], [], marker='o', color=MPL_COLORS['reserve'], label="Réserve moyenne")
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def refresh(self):
+        """Redessine si de nouveaux runs sont arrivés depuis le dernier affichage."""
+        if self.live.version == self._drawn_version:
+            return
+        snap = self.live.snapshot()
+        if snap is None:
+            return
+        self._drawn_version = snap["version"]
+        x, y = snap["annees"], snap["moyenne"]
+        self.mean_line.set_data(x, y)
+        # Barres d'IC : quelques points, recréées à chaque rafraîchissement
+        if self._errorbars is not None:
+            self._errorbars.remove()
+        self._errorbars = self.ax.errorbar(
+            x, y, yerr=[y - snap["ic_bas"], snap["ic_haut"] - y],
+            fmt='none', ecolor=MPL_COLORS['danger'], capsize=4
+        )
+        self.ax.relim()
+        self.ax.autoscale_view()
+        total = f"/{self.live.expected_runs}" if self.live.expected_runs else ""
+        self.runs_label.setText(f"<b>Runs terminés : {snap['n_runs']}{total}</b>")
+        self.canvas.draw_idle()
+
+    def stop(self):
+        """Dernier rafraîchissement puis arrêt du timer (fin ou annulation de la simulation)."""
+        self.refresh()
+        self.timer.stop()
@@ -9,17 +9,92 @@ UX Ultimate — Matplotlib & PyQtGraph for PyQt
 
 # ===== MATPLOTLIB BONUS =====
 
-def mpl_add_tooltips(figure, ax, x, y, labels=None, fmt="({x}, {y})", precision=0):
+class _BlitOverlay:
+    """
+    Superposition "blittée" partagée par les helpers d'une même figure :
+    - le fond statique est capturé après chaque dessin complet (draw_event)
+    - au survol, seuls les artistes animés (crosshair, tooltip) sont redessinés
+      par-dessus le fond, puis blittés — jamais de redessin complet du canvas
+    Les helpers s'enregistrent via `add(artists, on_motion, on_draw)` ; un seul
+    gestionnaire motion_notify_event et un seul blit par mouvement de souris.
+    """
+
+    def __init__(self, figure):
+        self.figure = figure
+        self.canvas = figure.canvas
+        self.artists = []
+        self.motion_handlers = []
+        self.draw_handlers = []
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("motion_notify_event", self._on_motion)
+
+    @classmethod
+    def of(cls, figure):
+        overlay = getattr(figure, "_blit_overlay", None)
+        if overlay is None or overlay.canvas is not figure.canvas:
+            overlay = cls(figure)
+            figure._blit_overlay = overlay
+        return overlay
+
+    def add(self, artists, on_motion, on_draw=None):
+        for artist in artists:
+            artist.set_animated(True)
+            self.artists.append(artist)
+        self.motion_handlers.append(on_motion)
+        if on_draw is not None:
+            on_draw()
+            self.draw_handlers.append(on_draw)
+
+    def _on_draw(self, event):
+        for handler in self.draw_handlers:
+            handler()
+        if getattr(self.canvas, "supports_blit", False):
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _on_motion(self, event):
+        changed = False
+        for handler in self.motion_handlers:
+            changed = handler(event) or changed
+        if changed:
+            self.update()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+
+    def update(self):
+        if self.background is None:
+            self.canvas.draw_idle()  # Backend sans blit ou premier dessin pas encore fait
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
+
+
+def mpl_add_tooltips(figure, ax, x, y, labels=None, fmt="({x}, {y})", precision=0, radius=8):
     """
     Tooltips dynamiques sur survol de points matplotlib.
+    Le point survolé est trouvé par un KD-tree en coordonnées écran (reconstruit à
+    chaque dessin complet), l'annotation est blittée sur le fond en cache.
     """
+    import numpy as np
+    from scipy.spatial import cKDTree
+    x, y = np.asarray(x), np.asarray(y)
     scatter = ax.scatter(x, y, s=38, color="#2077B4", zorder=5, picker=8)
     annot = ax.annotate("", xy=(0,0), xytext=(12,12), textcoords="offset points",
                         bbox=dict(boxstyle="round", fc="#fffbe8", ec="#707070"),
                         arrowprops=dict(arrowstyle="->"),
                         fontsize=10, visible=False)
-    def update_annot(ind):
-        idx = ind["ind"][0]
+    state = {"tree": None, "idx": None}
+
+    def rebuild_tree():
+        if len(x):
+            state["tree"] = cKDTree(ax.transData.transform(np.column_stack([x, y])))
+
+    def update_annot(idx):
         _x, _y = x[idx], y[idx]
         annot.xy = (_x, _y)
         if labels:
@@ -27,20 +102,23 @@ def mpl_add_tooltips(figure, ax, x, y, labels=None, fmt="({x}, {y})", precision=
         else:
             annot.set_text(fmt.format(x=round(_x, precision), y=round(_y, precision)))
         annot.set_visible(True)
+
     def on_motion(event):
-        vis = annot.get_visible()
-        if event.inaxes == ax:
-            cont, ind = scatter.contains(event)
-            if cont:
-                update_annot(ind)
-                figure.canvas.draw_idle()
-            elif vis:
-                annot.set_visible(False)
-                figure.canvas.draw_idle()
-        elif vis:
+        idx = None
+        if event.inaxes == ax and state["tree"] is not None:
+            dist, i = state["tree"].query((event.x, event.y), distance_upper_bound=radius)
+            idx = int(i) if np.isfinite(dist) else None
+        if idx == state["idx"]:
+            return False
+        state["idx"] = idx
+        if idx is None:
             annot.set_visible(False)
-            figure.canvas.draw_idle()
-    figure.canvas.mpl_connect("motion_notify_event", on_motion)
+        else:
+            update_annot(idx)
+        return True
+
+    _BlitOverlay.of(figure).add([annot], on_motion, on_draw=rebuild_tree)
+    return scatter
 
 def mpl_add_click_callback(figure, ax, callback):
     """
@@ -109,7 +187,8 @@ def mpl_add_brush_zoom(figure, ax, on_select=None):
 
 def mpl_add_crosshair(figure, ax):
     """
-    Affiche un crosshair qui suit la souris sur le graphique matplotlib.
+    Affiche un crosshair qui suit la souris sur le graphique matplotlib
+    (lignes blittées sur le fond en cache, sans redessin du canvas).
     """
     import matplotlib.lines as mlines
     vline = mlines.Line2D([], [], color='#C44D58', linestyle='--', lw=1, alpha=0.6)
@@ -117,11 +196,18 @@ def mpl_add_crosshair(figure, ax):
     ax.add_line(vline)
     ax.add_line(hline)
     def mouse_move(event):
-        if not event.inaxes: return
+        if event.inaxes != ax:
+            if not vline.get_visible():
+                return False
+            vline.set_visible(False)
+            hline.set_visible(False)
+            return True
         vline.set_data([event.xdata, event.xdata], ax.get_ylim())
         hline.set_data(ax.get_xlim(), [event.ydata, event.ydata])
-        figure.canvas.draw_idle()
-    figure.canvas.mpl_connect('motion_notify_event', mouse_move)
+        vline.set_visible(True)
+        hline.set_visible(True)
+        return True
+    _BlitOverlay.of(figure).add([vline, hline], mouse_move)
 
 def mpl_add_doubleclick_reset(figure, ax, orig_xlim, orig_ylim):
     """
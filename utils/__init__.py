@@ -4,13 +4,23 @@ from .logger import (
     get_child_logger,
     set_log_level,
     add_file_handler,
+    flush_handlers,
     close_handlers,
 )
 from . import charts
 from . import csv_sort_utils
+from . import downsample
+from . import figure_cache
 from . import fileio
+from . import filtered_view
+from . import live_results
 from . import mpl_theme
 from . import pdf_export
+from . import report_builder
+from . import result_store
+from . import results_cube
+from . import run_journal
+from . import search_index
 from . import stats
 from . import theme_utils
 
@@ -18,12 +28,22 @@ __all__ = [
     "get_child_logger",
     "set_log_level",
     "add_file_handler",
+    "flush_handlers",
     "close_handlers",
     "charts",
     "csv_sort_utils",
+    "downsample",
+    "figure_cache",
     "fileio",
+    "filtered_view",
+    "live_results",
     "mpl_theme",
     "pdf_export",
+    "report_builder",
+    "result_store",
+    "results_cube",
+    "run_journal",
+    "search_index",
     "stats",
     "theme_utils",
 ]
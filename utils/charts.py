@@ -1,14 +1,63 @@
 # utils/charts.py
 
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+import multiprocessing
+import numpy as np
+import io
 import os
-from utils import logger
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from utils.logger import get_child_logger
+from utils.results_cube import ResultsCube
+logger = get_child_logger("utils.charts")
+
+# Au-delà de ce nombre de runs, la vue « tous les runs » passe en densité (histogramme 2-D)
+SPAGHETTI_DENSITY_THRESHOLD = 2000
+
+def _draw_evolution(ax, df, indicator, simulation_id, couleur):
+    """Trace l'évolution d'un indicateur pour un run sur `ax` (API objet, sans état pyplot)."""
+    if indicator == "Reserve":
+        ax.plot(df["Annee"], df["Reserve"], marker='o', color=couleur, label=f"Simulation {simulation_id}")
+        ax.set_ylabel("Réserve (DH)")
+        ax.set_title(f"Évolution de la réserve — Simulation {simulation_id}")
+    else:
+        ax.plot(df["Annee"], df[indicator], marker='s', color=couleur, label=f"{indicator} — Sim {simulation_id}")
+        ax.set_ylabel(indicator)
+        ax.set_title(f"Évolution {indicator} — Simulation {simulation_id}")
+    ax.set_xlabel("Année")
+    ax.grid(True)
+    ax.legend()
+
+def _draw_distribution(ax, values, indicator, annee, couleur):
+    """Trace l'histogramme d'un indicateur pour une année sur `ax` (API objet)."""
+    ax.hist(values, bins=15, color=couleur, alpha=0.85, edgecolor="black")
+    if indicator == "Reserve":
+        ax.set_xlabel("Réserve (DH)")
+        ax.set_title(f"Distribution de la réserve finale — Année {annee}")
+    else:
+        ax.set_xlabel(indicator)
+        ax.set_title(f"Distribution de {indicator} — Année {annee}")
+    ax.set_ylabel("Nombre de simulations")
+    ax.grid(True, axis='y')
 
 def plot_reserve_evolution(df_runs, simulation_id=1, couleur="#2077B4", save_path=None):
     """
     Affiche l'évolution de la réserve pour une simulation donnée (par défaut ID=1).
+    Accepte un DataFrame long ou un ResultsCube (lecture directe de la trajectoire du run).
     """
     try:
+        if isinstance(df_runs, ResultsCube):
+            df_runs = pd.DataFrame({
+                "Simulation": simulation_id,
+                "Annee": df_runs.years,
+                "Reserve": df_runs.run_series(simulation_id),
+            })
         # Vérification défensive des colonnes attendues
         for col in ["Simulation", "Annee", "Reserve"]:
             if col not in df_runs.columns:
@@ -18,23 +67,18 @@ def plot_reserve_evolution(df_runs, simulation_id=1, couleur="#2077B4", save_pat
         if df.empty:
             logger.warning("plot_reserve_evolution : aucune donnée pour simulation_id=%s.", simulation_id)
             return
-        plt.figure(figsize=(7, 4))
-        plt.plot(df["Annee"], df["Reserve"], marker='o', color=couleur, label=f"Simulation {simulation_id}")
-        plt.xlabel("Année")
-        plt.ylabel("Réserve (DH)")
-        plt.title(f"Évolution de la réserve — Simulation {simulation_id}")
-        plt.grid(True)
-        plt.legend()
+        fig, ax = plt.subplots(figsize=(7, 4))
+        _draw_evolution(ax, df, "Reserve", simulation_id, couleur)
         if save_path:
             directory = os.path.dirname(save_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 logger.info("Création dossier export graphique : %s", directory)
-            plt.savefig(save_path)
+            fig.savefig(save_path)
             logger.info("Graphique réserve évolution sauvegardé : %s", save_path)
         else:
             plt.show()
-        plt.close()
+        plt.close(fig)
         logger.info("plot_reserve_evolution généré pour Simulation %d.", simulation_id)
     except Exception as e:
         logger.error("Erreur plot_reserve_evolution : %s", str(e))
@@ -56,23 +100,18 @@ def plot_indicator_evolution(df_runs, indicator="TotCotis", simulation_id=1, cou
         if df.empty:
             logger.warning("plot_indicator_evolution : aucune donnée pour simulation_id=%s.", simulation_id)
             return
-        plt.figure(figsize=(7, 4))
-        plt.plot(df["Annee"], df[indicator], marker='s', color=couleur, label=f"{indicator} — Sim {simulation_id}")
-        plt.xlabel("Année")
-        plt.ylabel(indicator)
-        plt.title(f"Évolution {indicator} — Simulation {simulation_id}")
-        plt.grid(True)
-        plt.legend()
+        fig, ax = plt.subplots(figsize=(7, 4))
+        _draw_evolution(ax, df, indicator, simulation_id, couleur)
         if save_path:
             directory = os.path.dirname(save_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 logger.info("Création dossier export graphique : %s", directory)
-            plt.savefig(save_path)
+            fig.savefig(save_path)
             logger.info("Graphique évolution %s sauvegardé : %s", indicator, save_path)
         else:
             plt.show()
-        plt.close()
+        plt.close(fig)
         logger.info("plot_indicator_evolution généré pour %s (Sim %d).", indicator, simulation_id)
     except Exception as e:
         logger.error("Erreur plot_indicator_evolution : %s", str(e))
@@ -126,22 +165,18 @@ def plot_reserve_distribution(df_runs, annee, couleur="#70AD47", save_path=None)
         if len(reserves) == 0:
             logger.warning("plot_reserve_distribution : aucune donnée pour année %s.", annee)
             return
-        plt.figure(figsize=(7, 4))
-        plt.hist(reserves, bins=15, color=couleur, alpha=0.85, edgecolor="black")
-        plt.xlabel("Réserve (DH)")
-        plt.ylabel("Nombre de simulations")
-        plt.title(f"Distribution de la réserve finale — Année {annee}")
-        plt.grid(True, axis='y')
+        fig, ax = plt.subplots(figsize=(7, 4))
+        _draw_distribution(ax, reserves, "Reserve", annee, couleur)
         if save_path:
             directory = os.path.dirname(save_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 logger.info("Création dossier export graphique : %s", directory)
-            plt.savefig(save_path)
+            fig.savefig(save_path)
             logger.info("Histogramme réserve année %s sauvegardé : %s", annee, save_path)
         else:
             plt.show()
-        plt.close()
+        plt.close(fig)
         logger.info("plot_reserve_distribution généré pour année %s.", annee)
     except Exception as e:
         logger.error("Erreur plot_reserve_distribution : %s", str(e))
@@ -161,29 +196,380 @@ def plot_indicator_distribution(df_runs, indicator, annee, couleur="#FFB300", sa
         if len(values) == 0:
             logger.warning("plot_indicator_distribution : aucune donnée pour %s, année %s.", indicator, annee)
             return
-        plt.figure(figsize=(7, 4))
-        plt.hist(values, bins=15, color=couleur, alpha=0.85, edgecolor="black")
-        plt.xlabel(indicator)
-        plt.ylabel("Nombre de simulations")
-        plt.title(f"Distribution de {indicator} — Année {annee}")
-        plt.grid(True, axis='y')
+        fig, ax = plt.subplots(figsize=(7, 4))
+        _draw_distribution(ax, values, indicator, annee, couleur)
         if save_path:
             directory = os.path.dirname(save_path)
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
                 logger.info("Création dossier export graphique : %s", directory)
-            plt.savefig(save_path)
+            fig.savefig(save_path)
             logger.info("Histogramme %s année %s sauvegardé : %s", indicator, annee, save_path)
         else:
             plt.show()
-        plt.close()
+        plt.close(fig)
         logger.info("plot_indicator_distribution généré pour %s, année %s.", indicator, annee)
     except Exception as e:
         logger.error("Erreur plot_indicator_distribution : %s", str(e))
 
+def runs_matrix(df_runs, indicator="Reserve", scenario=None):
+    """
+    Matrice runs × années d'un indicateur, construite en une seule fois.
+    Accepte un DataFrame long (pivot Simulation × Annee) ou un ResultsCube (vue directe).
+    Retourne (annees, matrice).
+    """
+    if isinstance(df_runs, ResultsCube):
+        return np.asarray(df_runs.years, dtype=float), np.asarray(df_runs.indicator(indicator, scenario=scenario), dtype=float)
+    matrix = df_runs.pivot_table(index="Simulation", columns="Annee", values=indicator)
+    return matrix.columns.to_numpy(dtype=float), matrix.to_numpy(dtype=float)
+
+def draw_all_runs(ax, annees, matrix, couleur="#2077B4", alpha=None, density=None, bins=120):
+    """
+    Superpose les trajectoires de tous les runs sur `ax` :
+    - une seule LineCollection (un segment par run), alpha adapté au nombre de runs
+    - ou, si density=True (par défaut au-delà de SPAGHETTI_DENSITY_THRESHOLD runs),
+      une carte de densité (histogramme 2-D année × valeur)
+    Retourne l'artiste créé.
+    """
+    n_runs = len(matrix)
+    if density is None:
+        density = n_runs > SPAGHETTI_DENSITY_THRESHOLD
+    if density:
+        finite = np.isfinite(matrix)
+        xs = np.broadcast_to(annees, matrix.shape)[finite]
+        x_edges = np.concatenate([annees - 0.5, [annees[-1] + 0.5]])
+        counts, _, y_edges = np.histogram2d(xs, matrix[finite], bins=[x_edges, bins])
+        counts = np.ma.masked_equal(counts, 0)
+        return ax.pcolormesh(x_edges, y_edges, counts.T, cmap="Blues", shading="flat")
+    if alpha is None:
+        alpha = float(np.clip(20.0 / max(n_runs, 1), 0.03, 0.6))
+    segments = np.stack([np.broadcast_to(annees, matrix.shape), matrix], axis=-1)
+    collection = LineCollection(segments, colors=couleur, linewidths=0.8, alpha=alpha)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    return collection
+
+def _draw_spaghetti(ax, annees, matrix, indicator, couleur, density=None):
+    """Trace tous les runs d'un indicateur et leur moyenne sur `ax`."""
+    label = "Réserve" if indicator == "Reserve" else indicator
+    draw_all_runs(ax, annees, matrix, couleur=couleur, density=density)
+    ax.plot(annees, np.nanmean(matrix, axis=0), color="#C44D58", linewidth=2, label=f"{label} moyenne")
+    ax.set_xlabel("Année")
+    ax.set_ylabel("Réserve (DH)" if indicator == "Reserve" else indicator)
+    ax.set_title(f"Évolution de {label.lower() if indicator == 'Reserve' else indicator} — {len(matrix)} simulations")
+    ax.grid(True)
+    ax.legend()
+
+def plot_reserve_spaghetti(df_runs, couleur="#2077B4", density=None, save_path=None):
+    """
+    Affiche la trajectoire de réserve de chaque run (vue « spaghetti ») avec la moyenne.
+    Accepte un DataFrame long ou un ResultsCube ; densité 2-D si trop de runs.
+    """
+    try:
+        if not isinstance(df_runs, ResultsCube):
+            for col in ["Simulation", "Annee", "Reserve"]:
+                if col not in df_runs.columns:
+                    logger.error(f"plot_reserve_spaghetti : colonne absente : '{col}'. DataFrame columns = {df_runs.columns.tolist()}")
+                    return
+        annees, matrix = runs_matrix(df_runs)
+        if matrix.size == 0:
+            logger.warning("plot_reserve_spaghetti : aucune donnée à afficher.")
+            return
+        fig, ax = plt.subplots(figsize=(7, 4))
+        _draw_spaghetti(ax, annees, matrix, "Reserve", couleur, density)
+        if save_path:
+            directory = os.path.dirname(save_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+                logger.info("Création dossier export graphique : %s", directory)
+            fig.savefig(save_path)
+            logger.info("Graphique réserve (tous les runs) sauvegardé : %s", save_path)
+        else:
+            plt.show()
+        plt.close(fig)
+        logger.info("plot_reserve_spaghetti généré pour %d simulations.", len(matrix))
+    except Exception as e:
+        logger.error("Erreur plot_reserve_spaghetti : %s", str(e))
+
+# --- Export par lots (sans interface, en parallèle) ---
+#
+# Une spécification de graphique est un dict :
+#   {"kind": "evolution" | "distribution" | "spaghetti",
+#    "indicator": "Reserve", "simulation_id": 1, "annee": 2030, "scenario": None,
+#    "couleur": "#2077B4", "name": "nom_du_fichier" (optionnel)}
+# Les types "lines" et "confidence" portent leurs données agrégées (quelques points par
+# année) et ignorent la source : ce sont les graphiques du rapport (utils.report_builder).
+#   {"kind": "lines", "title": ..., "series": [{"label", "annees", "values", "couleur"}, ...]}
+#   {"kind": "confidence", "title": ..., "annees", "moyenne", "ic_bas", "ic_haut"}
+# "rc" (optionnel) : paramètres matplotlib appliqués au rendu (thème de l'appelant,
+# absent des processus "spawn").
+# Le rendu utilise l'API objet (Figure + FigureCanvasAgg) : aucun état pyplot partagé.
+
+SPEC_COLORS = {"evolution": "#2077B4", "distribution": "#70AD47", "spaghetti": "#2077B4"}
+EXPORT_FORMATS = ("png", "svg", "pdf")
+
+def _safe_name(text, basename=True):
+    """
+    Nom de fichier sûr : dernier composant du chemin (si `basename`), caractères hors
+    [lettres, chiffres, _ . -] remplacés par "_", points de tête retirés.
+    """
+    name = str(text)
+    if basename:
+        name = os.path.basename(name.replace("\\", "/"))
+    name = re.sub(r"[^\w.\-]+", "_", name).lstrip(".")
+    return name or "graphique"
+
+def chart_spec_filename(spec, index, fmt="png"):
+    """
+    Nom de fichier d'une spécification (`name` si fourni, sinon dérivé de ses champs).
+    `name` et `scenario` sont réduits à un nom simple : jamais de chemin hors du dossier d'export.
+    """
+    if spec.get("name"):
+        return f"{_safe_name(spec['name'])}.{fmt}"
+    kind = spec.get("kind", "evolution")
+    parts = [f"{index:04d}", kind, spec.get("indicator", "Reserve")]
+    if spec.get("scenario") is not None:
+        parts.append(_safe_name(spec["scenario"], basename=False))  # Libellé : "/" remplacé, pas tronqué
+    if kind == "evolution":
+        parts.append(f"sim{spec.get('simulation_id', 1)}")
+    elif kind == "distribution":
+        parts.append(str(spec["annee"]))
+    return "_".join(parts) + f".{fmt}"
+
+def _draw_aggregate(ax, spec):
+    """Trace une spécification "lines" ou "confidence" (données incluses dans la spécification)."""
+    ax.set_title(spec.get("title", ""))
+    ax.set_xlabel("Année")
+    ax.set_ylabel(spec.get("ylabel", "Réserve (DH)"))
+    ax.grid(True)
+    if spec["kind"] == "lines":
+        if not spec["series"]:
+            raise ValueError("aucune série à afficher")
+        for serie in spec["series"]:
+            ax.plot(serie["annees"], serie["values"], marker='o', color=serie.get("couleur"), label=serie["label"])
+    else:
+        y = np.asarray(spec["moyenne"], dtype=float)
+        yerr = np.nan_to_num(np.array([y - np.asarray(spec["ic_bas"], dtype=float),
+                                       np.asarray(spec["ic_haut"], dtype=float) - y]))
+        ax.errorbar(spec["annees"], y, yerr=yerr, fmt='o-', color=spec.get("couleur", "#70AD47"),
+                    ecolor='#C44D58', capsize=4, label=spec.get("label", "Réserve (IC)"))
+    ax.legend()
+
+def _select_scenario(source, scenario):
+    if isinstance(source, dict):
+        if scenario is None:
+            if len(source) == 1:
+                return next(iter(source.values()))
+            raise ValueError("Spécification sans 'scenario' pour des données multi-scénarios.")
+        return source[scenario]
+    if scenario is not None and "Scenario" in source.columns:
+        return source[source["Scenario"] == scenario]
+    return source
+
+def draw_chart_spec(ax, source, spec):
+    """
+    Trace une spécification sur `ax` à partir d'un DataFrame long, d'un dict
+    {scénario: DataFrame} ou d'un ResultsCube (lectures directes dans le memmap).
+    Lève ValueError si la sélection est vide.
+    """
+    kind = spec.get("kind", "evolution")
+    if kind in ("lines", "confidence"):
+        _draw_aggregate(ax, spec)
+        return
+    indicator = spec.get("indicator", "Reserve")
+    scenario = spec.get("scenario")
+    couleur = spec.get("couleur", SPEC_COLORS.get(kind, "#2077B4"))
+    cube = source if isinstance(source, ResultsCube) else None
+    df_runs = None if cube is not None else _select_scenario(source, scenario)
+
+    if kind == "evolution":
+        simulation_id = spec.get("simulation_id", 1)
+        if cube is not None:
+            df = pd.DataFrame({"Annee": cube.years, indicator: cube.run_series(simulation_id, indicator, scenario)})
+        else:
+            df = df_runs[df_runs["Simulation"] == simulation_id]
+        if df.empty:
+            raise ValueError(f"aucune donnée pour simulation_id={simulation_id}")
+        _draw_evolution(ax, df, indicator, simulation_id, couleur)
+    elif kind == "distribution":
+        annee = spec["annee"]
+        if cube is not None:
+            values = np.asarray(cube.year_slice(annee, indicator, scenario))
+        else:
+            values = df_runs.loc[df_runs["Annee"] == annee, indicator].to_numpy()
+        if len(values) == 0:
+            raise ValueError(f"aucune donnée pour l'année {annee}")
+        _draw_distribution(ax, values, indicator, annee, couleur)
+    elif kind == "spaghetti":
+        annees, matrix = runs_matrix(cube if cube is not None else df_runs, indicator, scenario)
+        if matrix.size == 0:
+            raise ValueError("aucune donnée à afficher")
+        _draw_spaghetti(ax, annees, matrix, indicator, couleur, spec.get("density"))
+    else:
+        raise ValueError(f"type de graphique inconnu : {kind!r}")
+
+def render_chart(source, spec, fmt="png", dpi=150):
+    """Rend une spécification en octets PNG/SVG/PDF, sans pyplot."""
+    with matplotlib.rc_context(spec.get("rc") or {}):
+        fig = Figure(figsize=(7, 4), dpi=dpi)
+        FigureCanvasAgg(fig)
+        draw_chart_spec(fig.add_subplot(111), source, spec)
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+# Données du processus de rendu, chargées une fois par processus (initializer du pool)
+_WORKER_SOURCE = None
+
+def _open_source(source):
+    """Chemin -> cube memmap ou DataFrame ; les autres sources sont rendues telles quelles."""
+    if isinstance(source, str):
+        if os.path.exists(source + ".json"):
+            return ResultsCube.open(source)
+        from utils.fileio import load_results_file
+        return load_results_file(source)
+    return source
+
+def _init_chart_worker(source):
+    global _WORKER_SOURCE
+    _WORKER_SOURCE = _open_source(source)
+
+def _render_job(job):
+    """Rend une spécification dans un processus : écrit le fichier (dossier) ou renvoie les octets (zip)."""
+    index, spec, filename, fmt, dpi, directory = job
+    try:
+        data = render_chart(_WORKER_SOURCE, spec, fmt=fmt, dpi=dpi)
+    except Exception as e:
+        return index, filename, None, f"{type(e).__name__}: {e}"
+    if directory is None:
+        return index, filename, data, None
+    tmp_path = os.path.join(directory, filename + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, filename))
+    except OSError as e:
+        # Erreur d'écriture : la tâche échoue seule, le reste du lot continue
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return index, filename, None, f"{type(e).__name__}: {e}"
+    return index, filename, None, None
+
+def _check_format(fmt):
+    fmt = fmt.lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export non supporté : {fmt!r} ({', '.join(EXPORT_FORMATS)})")
+    return fmt
+
+# En deçà, max_workers=None rend dans le processus courant : démarrer des processus "spawn"
+# (réimport de l'application dans chacun) coûte bien plus que quelques graphiques
+POOL_MIN_JOBS = 16
+
+def _run_render_jobs(source, jobs, max_workers=None):
+    """
+    Exécute les tâches de rendu, dans un pool de processus "spawn" ou dans le processus
+    courant (un seul processus, une seule tâche, ou moins de POOL_MIN_JOBS tâches sans
+    max_workers explicite). Résultats triés dans l'ordre des tâches.
+    """
+    shared = source.path if isinstance(source, ResultsCube) else source
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(jobs)) if len(jobs) >= POOL_MIN_JOBS else 1
+    if max_workers <= 1 or len(jobs) <= 1:
+        _init_chart_worker(shared)
+        results = list(map(_render_job, jobs))
+    else:
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        # "spawn" : processus neufs, sans l'état Qt/pyplot du processus appelant
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_chart_worker, initargs=(shared,)) as pool:
+            results = list(pool.map(_render_job, jobs, chunksize=chunksize))
+    return sorted(results, key=lambda r: r[0])
+
+def render_charts(source, specs, fmt="pdf", dpi=150, max_workers=None):
+    """
+    Rend une liste de spécifications en parallèle et retourne leurs octets, dans l'ordre
+    des spécifications (None pour une spécification en échec, journalisée).
+    Utilisé par le rapport PDF : une page vectorielle par spécification avec fmt="pdf".
+    """
+    fmt = _check_format(fmt)
+    jobs = [(i, spec, chart_spec_filename(spec, i, fmt), fmt, dpi, None) for i, spec in enumerate(specs)]
+    rendered = []
+    for index, filename, data, error in _run_render_jobs(source, jobs, max_workers):
+        if error is not None:
+            logger.error("render_charts : échec de la spécification %d (%s) : %s", index, filename, error)
+        rendered.append(data)
+    return rendered
+
+def _unique_filenames(specs, formats):
+    """
+    Noms de fichier des spécifications, rendus uniques : un nom déjà pris (même `name`,
+    ou noms réduits identiques) reçoit un suffixe _2, _3… au lieu d'écraser le précédent.
+    """
+    names, taken = [], set()
+    for i, (spec, spec_fmt) in enumerate(zip(specs, formats)):
+        filename = chart_spec_filename(spec, i, spec_fmt)
+        stem, ext = os.path.splitext(filename)
+        n = 1
+        while filename.lower() in taken:
+            n += 1
+            filename = f"{stem}_{n}{ext}"
+        if n > 1:
+            logger.warning("export_charts_batch : nom %s déjà utilisé, spécification %d exportée en %s",
+                           stem + ext, i, filename)
+        taken.add(filename.lower())
+        names.append(filename)
+    return names
+
+def export_charts_batch(source, specs, output, fmt="png", dpi=150, max_workers=None):
+    """
+    Rend une liste de spécifications en parallèle (pool de processus) vers `output` :
+    un dossier, ou une archive si le chemin se termine par .zip.
+
+    `source` : DataFrame long, dict {scénario: DataFrame}, ResultsCube (rouvert par chemin
+    dans chaque processus, sans copie) ou chemin d'un fichier de résultats.
+    Chaque processus reçoit les données une seule fois ; avec un seul processus (max_workers=1
+    ou un seul cœur), le rendu se fait dans le processus courant.
+    Retourne la liste des fichiers écrits (dans l'ordre des spécifications) ; les échecs sont journalisés.
+    """
+    fmt = _check_format(fmt)
+    to_zip = output.lower().endswith(".zip")
+    directory = os.path.dirname(output) if to_zip else output
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+        logger.info("Création dossier export graphique : %s", directory)
+
+    # Format propre à une spécification validé ici : une erreur avant tout rendu, pas dans un processus
+    formats = [_check_format(spec.get("format", fmt)) for spec in specs]
+    jobs = [
+        (i, spec, filename, spec_fmt, dpi, None if to_zip else output)
+        for i, (spec, spec_fmt, filename) in enumerate(zip(specs, formats, _unique_filenames(specs, formats)))
+    ]
+    results = _run_render_jobs(source, jobs, max_workers)
+
+    written = []
+    archive = zipfile.ZipFile(output, "w") if to_zip else None
+    try:
+        for index, filename, data, error in results:
+            if error is not None:
+                logger.error("export_charts_batch : échec de la spécification %d (%s) : %s", index, filename, error)
+                continue
+            if archive is not None:
+                # PNG déjà compressé : stocké tel quel ; SVG/PDF compressés
+                compression = zipfile.ZIP_STORED if filename.endswith(".png") else zipfile.ZIP_DEFLATED
+                archive.writestr(filename, data, compress_type=compression)
+            written.append(filename)
+    finally:
+        if archive is not None:
+            archive.close()
+    logger.info("export_charts_batch : %d/%d graphiques exportés vers %s", len(written), len(jobs), output)
+    return written
+
 # --- Exemples d'utilisation ---
 # plot_reserve_evolution(df_concat, simulation_id=1)
+# plot_reserve_spaghetti(df_concat, save_path="exports/reserve_runs.png")
 # plot_indicator_evolution(df_concat, indicator="TotPens", simulation_id=3)
 # plot_scenario_comparaison({"Scénario 1": df1, "Scénario 2": df2}, indicator="Reserve", annees=[2025, 2030, 2035])
 # plot_reserve_distribution(df_concat, annee=2030)
 # plot_indicator_distribution(df_concat, indicator="TotCotis", annee=2025)
+# export_charts_batch(df_concat, [{"kind": "distribution", "annee": a} for a in range(2025, 2036)], "exports/charts.zip")
@@ -0,0 +1,64 @@
+# utils/downsample.py
+
+"""
+Réduction de points pour l'affichage des grandes séries (niveau de détail).
+- lttb : Largest-Triangle-Three-Buckets, conserve la forme visuelle d'une courbe
+- minmax_decimate : garde le min et le max de chaque tranche (pics préservés)
+- visible_slice : bornes des points d'une série triée dans la fenêtre affichée
+"""
+
+import numpy as np
+
+
+def visible_slice(x, x_min, x_max, margin=1):
+    """Indices [start, stop) des points de `x` (trié) visibles entre x_min et x_max, plus une marge."""
+    start = max(int(np.searchsorted(x, x_min, side="left")) - margin, 0)
+    stop = min(int(np.searchsorted(x, x_max, side="right")) + margin, len(x))
+    return start, stop
+
+
+def lttb(x, y, n_out):
+    """
+    Sous-échantillonne (x, y) à `n_out` points par Largest-Triangle-Three-Buckets.
+    Le premier et le dernier point sont conservés ; `x` doit être trié.
+    Retourne les indices retenus (utilisables sur x, y ou toute colonne associée).
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bornes des n_out - 2 tranches intermédiaires
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Point moyen de la tranche suivante (ou dernier point)
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def minmax_decimate(x, y, n_out):
+    """
+    Garde, pour chacune des n_out // 2 tranches, l'indice du minimum et du maximum
+    (dans l'ordre de x). Retourne les indices retenus.
+    """
+    n = len(x)
+    n_bins = n_out // 2
+    if n_bins < 1 or n <= n_out:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    usable = (n // n_bins) * n_bins
+    blocks = y[:usable].reshape(n_bins, -1)
+    offsets = np.arange(n_bins) * blocks.shape[1]
+    idx_min = offsets + np.nanargmin(blocks, axis=1)
+    idx_max = offsets + np.nanargmax(blocks, axis=1)
+    kept = np.sort(np.concatenate([idx_min, idx_max, [n - 1]]))
+    return np.unique(kept)
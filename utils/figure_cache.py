@@ -0,0 +1,136 @@
+# utils/figure_cache.py
+
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.mpl_theme import restyle_figure
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.figure_cache")
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# Empreinte de contenu par DataFrame (identité de l'objet), calculée une seule fois
+_FINGERPRINTS = {}
+
+
+def data_fingerprint(data):
+    """
+    Empreinte du contenu d'un jeu de résultats (DataFrame ou dict {scénario: DataFrame}).
+    Deux DataFrames identiques donnent la même empreinte ; le hachage d'un DataFrame
+    donné n'est calculé qu'une fois.
+    """
+    if isinstance(data, dict):
+        return tuple((str(name), data_fingerprint(df)) for name, df in data.items())
+    if not isinstance(data, pd.DataFrame):
+        return ("objet", id(data))
+    key = id(data)
+    entry = _FINGERPRINTS.get(key)
+    if entry is not None and entry[0]() is data:
+        return entry[1]
+    digest = int(pd.util.hash_pandas_object(data, index=False).to_numpy().sum(dtype=np.uint64))
+    fingerprint = (data.shape, tuple(map(str, data.columns)), digest)
+    _FINGERPRINTS[key] = (weakref.ref(data, lambda _ref, key=key: _FINGERPRINTS.pop(key, None)), fingerprint)
+    return fingerprint
+
+
+def filter_key(filters):
+    """État de filtres (dict, listes comprises) sous forme hachable et indépendante de l'ordre."""
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, (list, set, tuple)) else value)
+        for name, value in filters.items()
+    ))
+
+
+def estimate_figure_bytes(figure):
+    """Mémoire approximative d'une figure rendue (tampon RGBA du canvas + fond mémorisé pour le blit)."""
+    width, height = figure.get_size_inches() * figure.dpi
+    return int(width * height * 4 * 2)
+
+
+class FigureCache:
+    """
+    Cache LRU de graphiques déjà construits (figure + agrégats), borné en mémoire.
+
+    La clé décrit ce qui est tracé (empreinte des données, état des filtres, mode) ;
+    le thème est un état de l'entrée : un accès avec un autre thème restyle les
+    artistes existants (restyle_figure) au lieu de recalculer le graphique.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, on_evict=None):
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._entries = OrderedDict()  # clé -> [valeur, figure, dark_mode, nbytes]
+        self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, dark_mode=None):
+        """Valeur en cache (marquée récente et restylée si besoin), ou None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        if dark_mode is not None and entry[2] != dark_mode:
+            restyle_figure(entry[1], dark_mode)
+            entry[2] = dark_mode
+        logger.debug("FigureCache : entrée réutilisée (%d en cache)", len(self._entries))
+        return entry[0]
+
+    def put(self, key, value, figure, dark_mode, nbytes=None):
+        """Ajoute (ou remplace) une entrée, puis évince les plus anciennes au-delà de max_bytes."""
+        self.discard(key)
+        nbytes = estimate_figure_bytes(figure) if nbytes is None else nbytes
+        self._entries[key] = [value, figure, dark_mode, nbytes]
+        self.total_bytes += nbytes
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._evict(next(iter(self._entries)))
+        return value
+
+    def get_or_create(self, key, factory, dark_mode, figure_of=lambda value: value.figure, nbytes_of=None):
+        """
+        Valeur en cache, ou construite par `factory()` puis mise en cache.
+        `factory` peut renvoyer None (rien à tracer) : rien n'est alors mis en cache.
+        """
+        value = self.get(key, dark_mode)
+        if value is not None:
+            return value
+        value = factory()
+        if value is None:
+            return None
+        nbytes = nbytes_of(value) if nbytes_of else None
+        return self.put(key, value, figure_of(value), dark_mode, nbytes)
+
+    def restyle_all(self, dark_mode):
+        """Applique un thème à toutes les figures en cache (bascule clair/sombre)."""
+        for entry in self._entries.values():
+            if entry[2] != dark_mode:
+                restyle_figure(entry[1], dark_mode)
+                entry[2] = dark_mode
+
+    def discard(self, key):
+        if key in self._entries:
+            self._evict(key)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._evict(key)
+
+    def _evict(self, key):
+        value, _figure, _dark, nbytes = self._entries.pop(key)
+        self.total_bytes -= nbytes
+        if self.on_evict is not None:
+            self.on_evict(value)
+
+
+# --- Exemple d'utilisation ---
+# cache = FigureCache(max_bytes=64 * 1024 * 1024)
+# key = (data_fingerprint(df), filter_key({"annees": [2030]}), "line")
+# fig = cache.get_or_create(key, lambda: build_figure(df), dark_mode=False, figure_of=lambda f: f)
@@ -1,12 +1,18 @@
 # utils/fileio.py
 
 import pandas as pd
+import numpy as np
 import json
 import os
 import datetime
 import csv
+import gzip
+import importlib.util
 
 from utils.logger import get_child_logger
+from utils.run_journal import is_run_journal, read_run_journal
+from utils.result_store import ResultStore, is_result_store
+from core.schema import RESULT_DTYPES, apply_result_schema
 logger = get_child_logger("utils.fileio")
 
 
@@ -46,11 +52,63 @@ def read_csv(file_path):
         raise
 
 
+# --- Lecture CSV par morceaux (gros fichiers de résultats) ---
+
+# Types compacts des colonnes connues produites par le simulateur (core.schema) ;
+# le scénario est lu en chaîne puis converti en catégorie après concaténation des blocs.
+# Entiers lus en types nullables (Int16/Int32) : une cellule vide ne fait pas échouer
+# l'import ; les blocs sans valeur manquante repassent en int16/int32 (voir _compact_int_columns).
+RESULT_CSV_DTYPES = {
+    **{col: (dtype.capitalize() if dtype.startswith("int") else dtype) for col, dtype in RESULT_DTYPES.items()},
+    "Scenario": "str",
+}
+
+
+def _compact_int_columns(df):
+    """Colonnes entières nullables sans valeur manquante -> entiers numpy (int16/int32)."""
+    casts = {col: str(dtype).lower() for col, dtype in df.dtypes.items()
+             if str(dtype) in ("Int16", "Int32", "Int64") and not df[col].isna().any()}
+    return df.astype(casts) if casts else df
+
+
+def read_csv_preview(file_path, nrows=20, dtype=None, sep=","):
+    """Lit seulement les `nrows` premières lignes d'un CSV (aperçu immédiat avant la lecture par blocs)."""
+    columns = read_csv_header(file_path, sep=sep)
+    dtype = {c: t for c, t in (RESULT_CSV_DTYPES if dtype is None else dtype).items() if c in columns}
+    return _compact_int_columns(pd.read_csv(file_path, sep=sep, dtype=dtype, nrows=nrows, encoding="utf-8"))
+
+
+def read_csv_header(file_path, sep=","):
+    """
+    Lit uniquement la ligne d'en-tête d'un CSV et retourne la liste des colonnes.
+    Permet de valider un fichier sans le parser entièrement.
+    """
+    with open(file_path, "r", newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f, delimiter=sep), [])
+    return [col.strip() for col in header]
+
+
+def iter_csv_chunks(file_path, chunksize=200_000, dtype=None, sep=","):
+    """
+    Itère sur un CSV par blocs de `chunksize` lignes.
+    Rend des tuples (chunk DataFrame, progression dans [0, 1]) ; la progression
+    est la position lue dans le fichier rapportée à sa taille.
+    """
+    columns = read_csv_header(file_path, sep=sep)
+    dtype = {c: t for c, t in (RESULT_CSV_DTYPES if dtype is None else dtype).items() if c in columns}
+    total = os.path.getsize(file_path) or 1
+    with open(file_path, "rb") as f:
+        for chunk in pd.read_csv(f, sep=sep, dtype=dtype, chunksize=chunksize, encoding="utf-8"):
+            yield _compact_int_columns(chunk), min(f.tell(), total) / total
+
+
 # --- Export CSV pandas (avancé, DataFrame(s)) ---
 
-def export_dataframe_to_csv(df_or_dict, path, mode='single', sep=',', encoding='utf-8'):
+def export_dataframe_to_csv(df_or_dict, path, mode='single', sep=',', encoding='utf-8', compression=None):
     """
     Exporte un DataFrame pandas OU un dict de DataFrames en CSV.
+    En mode 'single', un dict est écrit en flux par write_scenarios_csv
+    (compression : None, 'gzip', ou déduite d'un chemin en .gz).
     """
     try:
         ensure_directory_exists(path)
@@ -65,15 +123,9 @@ def export_dataframe_to_csv(df_or_dict, path, mode='single', sep=',', encoding='
 
         elif isinstance(df_or_dict, dict):
             if mode == 'single':
-                concat_list = []
-                for k, df in df_or_dict.items():
-                    if isinstance(df, pd.DataFrame) and not df.empty:
-                        df_copy = df.copy()
-                        df_copy.insert(0, "Scenario", k)
-                        concat_list.append(df_copy)
-                df_concat = pd.concat(concat_list, ignore_index=True) if concat_list else pd.DataFrame()
-                df_concat.to_csv(path, index=False, sep=sep, encoding=encoding)
-                logger.info("Fichier CSV multi-scenarios exporté (concaténé) : %s", path)
+                # Écriture en flux : aucune concaténation des scénarios en mémoire
+                n_rows = write_scenarios_csv(df_or_dict, path, sep=sep, encoding=encoding, compression=compression)
+                logger.info("Fichier CSV multi-scenarios exporté (%d lignes) : %s", n_rows, path)
                 return True
 
             elif mode == 'split':
@@ -103,6 +155,289 @@ def export_dataframe_to_csv(df_or_dict, path, mode='single', sep=',', encoding='
         return False
 
 
+# Lignes formatées à la fois par write_scenarios_csv : borne la mémoire de l'export
+CSV_WRITE_CHUNK_ROWS = 100_000
+
+
+def write_scenarios_csv(df_dict, path, sep=',', encoding='utf-8', compression=None, chunksize=CSV_WRITE_CHUNK_ROWS):
+    """
+    Écrit un dict {scénario: DataFrame} en un seul CSV long, en flux : en-tête écrit une fois
+    ("Scenario" puis l'union des colonnes), puis chaque scénario bloc par bloc avec son
+    libellé en première colonne. Seul le bloc courant est copié en mémoire.
+    Une colonne 'Scenario' déjà présente dans un DataFrame est ignorée (la clé du dict fait foi) ;
+    les colonnes absentes d'un scénario sont écrites vides (relues en entiers nullables).
+
+    compression : None ou 'gzip' (déduite si le chemin se termine par .gz).
+    Écriture dans `path + ".tmp"` puis renommage atomique : un export interrompu ne laisse
+    jamais de fichier partiel à la place de `path`.
+    Retourne le nombre de lignes écrites.
+    """
+    frames = [(str(k), df) for k, df in df_dict.items() if isinstance(df, pd.DataFrame) and not df.empty]
+    columns = list(dict.fromkeys(col for _k, df in frames for col in df.columns if col != "Scenario"))
+    if compression is None and path.lower().endswith(".gz"):
+        compression = "gzip"
+    if compression not in (None, "gzip"):
+        raise ValueError(f"Compression non supportée : {compression!r} (None ou 'gzip')")
+
+    ensure_directory_exists(path)
+    tmp_path = path + ".tmp"
+    if compression == "gzip":
+        f = gzip.open(tmp_path, "wt", encoding=encoding, newline="", compresslevel=6)
+    else:
+        f = open(tmp_path, "w", encoding=encoding, newline="")
+    n_rows = 0
+    try:
+        with f:
+            csv.writer(f, delimiter=sep).writerow(["Scenario"] + columns)
+            for label, df in frames:
+                same_columns = list(df.columns) == columns
+                for start in range(0, len(df), chunksize):
+                    chunk = df.iloc[start:start + chunksize]
+                    if not same_columns:
+                        chunk = chunk.reindex(columns=columns)  # Par bloc : colonnes manquantes vides, 'Scenario' retirée
+                    # Libellé du scénario écrit comme index : pas de colonne insérée dans les données
+                    chunk = chunk.set_axis(pd.Index(np.full(len(chunk), label, dtype=object)), axis=0)
+                    chunk.to_csv(f, header=False, index=True, sep=sep, lineterminator="\n")
+                    n_rows += len(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return n_rows
+
+
+# --- Format binaire colonnaire (npz / Parquet / Feather) ---
+
+# Extension -> format. Parquet/Feather nécessitent pyarrow (optionnel), npz n'utilise que numpy.
+BINARY_RESULT_FORMATS = {
+    ".npz": "npz",
+    ".parquet": "parquet",
+    ".feather": "feather",
+}
+
+# pyarrow détecté sans être importé (import coûteux au démarrage)
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def available_binary_formats():
+    """Formats binaires utilisables dans cet environnement : npz toujours, Parquet/Feather si pyarrow."""
+    if HAS_PYARROW:
+        return ["npz", "parquet", "feather"]
+    return ["npz"]
+
+
+def results_export_filter():
+    """Filtre QFileDialog d'export : Parquet/Feather proposés seulement si pyarrow est installé."""
+    labels = {"npz": "Binaire compact (*.npz)", "parquet": "Parquet (*.parquet)", "feather": "Feather (*.feather)"}
+    binaires = ";;".join(labels[fmt] for fmt in available_binary_formats())
+    return f"CSV files (*.csv);;{binaires};;Stock SQLite (*.sqlite)"
+
+_NPZ_META_KEY = "__meta__"
+
+
+def _binary_format(path, fmt=None):
+    """Retourne le format binaire ('npz', 'parquet', 'feather') déduit de l'extension si besoin."""
+    if fmt:
+        return fmt
+    return BINARY_RESULT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def is_binary_results_file(path):
+    """True si le chemin correspond à un format de résultats binaire connu."""
+    return _binary_format(path) is not None
+
+
+def _concat_scenarios(df_or_dict):
+    """Dict {scénario: DataFrame} -> DataFrame long avec colonne 'Scenario' catégorielle."""
+    if isinstance(df_or_dict, pd.DataFrame):
+        return df_or_dict
+    frames = [df for df in df_or_dict.values() if isinstance(df, pd.DataFrame) and not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    keys = [k for k, df in df_or_dict.items() if isinstance(df, pd.DataFrame) and not df.empty]
+    df_concat = pd.concat(frames, ignore_index=True)
+    labels = np.repeat(np.arange(len(keys)), [len(df) for df in frames])
+    df_concat.insert(0, "Scenario", pd.Categorical.from_codes(labels, categories=[str(k) for k in keys]))
+    return df_concat
+
+
+def _write_npz(df, path):
+    """Écrit un DataFrame en npz : une entrée par colonne + un en-tête JSON (ordre, catégories)."""
+    arrays = {}
+    meta = {"columns": [], "categories": {}}
+    for col in df.columns:
+        name = str(col)
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+            cat = series.astype("category")
+            arrays[name] = cat.cat.codes.to_numpy()
+            meta["categories"][name] = [str(c) for c in cat.cat.categories]
+        else:
+            arrays[name] = series.to_numpy()
+        meta["columns"].append(name)
+    arrays[_NPZ_META_KEY] = np.array(json.dumps(meta))
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def _read_npz(path, columns=None, scenarios=None, annees=None):
+    """
+    Lit un npz de résultats. Seules les colonnes demandées (et celles des filtres) sont décompressées :
+    le masque Scenario/Annee est calculé avant de charger les autres colonnes.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(str(npz[_NPZ_META_KEY]))
+        categories = meta.get("categories", {})
+        all_columns = meta["columns"]
+        wanted = [c for c in (columns or all_columns) if c in all_columns]
+
+        def column(name):
+            values = npz[name]
+            if name in categories:
+                return pd.Categorical.from_codes(values, categories=categories[name])
+            return values
+
+        mask = None
+        if scenarios is not None and "Scenario" in all_columns:
+            mask = np.asarray(pd.Series(column("Scenario")).isin([str(s) for s in scenarios]))
+        if annees is not None and "Annee" in all_columns:
+            year_mask = np.isin(npz["Annee"], list(annees))
+            mask = year_mask if mask is None else (mask & year_mask)
+
+        data = {}
+        for name in wanted:
+            values = column(name)
+            data[name] = values[mask] if mask is not None else values
+    return pd.DataFrame(data, columns=wanted)
+
+
+def export_results_binary(df_or_dict, path, fmt=None):
+    """
+    Exporte un DataFrame (ou un dict {scénario: DataFrame}) dans un format binaire colonnaire.
+    Le format est déduit de l'extension (.npz, .parquet, .feather) sauf si `fmt` est fourni.
+    """
+    try:
+        fmt = _binary_format(path, fmt)
+        if fmt is None:
+            logger.error("Format binaire non reconnu pour %s (utilise .npz, .parquet ou .feather)", path)
+            return False
+        if fmt not in available_binary_formats():
+            logger.error("Format %s indisponible pour %s : pyarrow n'est pas installé", fmt, path)
+            return False
+        if not isinstance(df_or_dict, (pd.DataFrame, dict)):
+            logger.error("Type d'entrée non pris en charge : %s", type(df_or_dict))
+            return False
+
+        ensure_directory_exists(path)
+        df = _concat_scenarios(df_or_dict).reset_index(drop=True)
+
+        if fmt == "npz":
+            _write_npz(df, path)
+        elif fmt == "parquet":
+            # Les lignes restent groupées par scénario : les statistiques de row groups
+            # permettent aux lectures filtrées de sauter les groupes inutiles.
+            df.to_parquet(path, index=False)
+        elif fmt == "feather":
+            df.to_feather(path)
+        else:
+            logger.error("Format binaire inconnu : '%s'", fmt)
+            return False
+
+        logger.info("Résultats exportés en %s : %s (%d lignes)", fmt, path, len(df))
+        return True
+
+    except Exception as e:
+        logger.error("Export binaire échoué pour %s : %s", path, str(e))
+        return False
+
+
+def export_results_store(df_or_dict, path):
+    """
+    Exporte un DataFrame (ou un dict {scénario: DataFrame}) dans un stock SQLite indexé
+    (voir utils.result_store), interrogeable par page depuis les onglets.
+    """
+    try:
+        if not isinstance(df_or_dict, (pd.DataFrame, dict)):
+            logger.error("Type d'entrée non pris en charge : %s", type(df_or_dict))
+            return False
+        if os.path.exists(path):
+            os.remove(path)  # Un export remplace le stock existant
+        with ResultStore.from_dataframe(df_or_dict, path):
+            pass
+        return True
+    except Exception as e:
+        logger.error("Export SQLite échoué pour %s : %s", path, str(e))
+        return False
+
+
+def read_results_binary(path, columns=None, scenarios=None, annees=None, fmt=None):
+    """
+    Lit un fichier de résultats binaire avec projection de colonnes (`columns`)
+    et filtrage par scénario (`scenarios`) et année (`annees`).
+    """
+    try:
+        fmt = _binary_format(path, fmt)
+        if fmt == "npz":
+            df = _read_npz(path, columns=columns, scenarios=scenarios, annees=annees)
+        elif fmt == "parquet":
+            filters = []
+            if scenarios is not None:
+                filters.append(("Scenario", "in", [str(s) for s in scenarios]))
+            if annees is not None:
+                filters.append(("Annee", "in", list(annees)))
+            df = pd.read_parquet(path, columns=columns, filters=filters or None)
+        elif fmt == "feather":
+            df = pd.read_feather(path, columns=columns)
+            if scenarios is not None and "Scenario" in df.columns:
+                df = df[df["Scenario"].astype(str).isin([str(s) for s in scenarios])]
+            if annees is not None and "Annee" in df.columns:
+                df = df[df["Annee"].isin(list(annees))]
+            df = df.reset_index(drop=True)
+        else:
+            raise ValueError(f"Format binaire non reconnu : {path}")
+        logger.info("Résultats %s lus depuis %s (n lignes = %d)", fmt, path, len(df))
+        return df
+    except FileNotFoundError as e:
+        logger.error("Fichier de résultats introuvable : %s — %s", path, str(e))
+        raise
+    except Exception as e:
+        logger.error("Erreur lecture résultats binaires : %s — %s", path, str(e))
+        raise
+
+
+def load_results_file(path, columns=None, scenarios=None, annees=None):
+    """
+    Charge un fichier de résultats quel que soit son format (CSV, binaire ou journal
+    de runs .jsonl), détecté d'après l'extension. Utilisé par les fenêtres d'import.
+    """
+    if is_binary_results_file(path):
+        return apply_result_schema(read_results_binary(path, columns=columns, scenarios=scenarios, annees=annees))
+    if is_result_store(path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        with ResultStore(path) as store:
+            return store.query(scenarios=scenarios, annees=annees, columns=columns)
+    if is_run_journal(path):
+        df = read_run_journal(path)
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+    else:
+        df = pd.read_csv(path, usecols=columns)
+    if scenarios is not None and "Scenario" in df.columns:
+        df = df[df["Scenario"].astype(str).isin([str(s) for s in scenarios])]
+    if annees is not None and "Annee" in df.columns:
+        df = df[df["Annee"].isin(list(annees))]
+    return apply_result_schema(df.reset_index(drop=True))
+
+
+# Filtre QFileDialog commun aux fenêtres d'import
+RESULTS_FILE_FILTER = (
+    f"Résultats (*.csv *.csv.gz *.npz {'*.parquet *.feather ' if HAS_PYARROW else ''}*.jsonl *.sqlite);;"
+    "Fichiers CSV (*.csv);;Journaux de runs (*.jsonl);;Stock SQLite (*.sqlite *.db);;Tous les fichiers (*)"
+)
+
+
 # --- Outils génériques fichiers ---
 
 def ensure_directory_exists(path):
@@ -128,15 +463,24 @@ def get_default_pdf_path(section_name=None, base_dir="data/output", prefix="rapp
 
 def export_pdf_file(pdf_bytes, path):
     """
-    Sauvegarde un PDF à partir d’un buffer de bytes.
+    Sauvegarde un PDF à partir d’un buffer de bytes (bytes ou BytesIO).
+    Écriture atomique : fichier temporaire dans le même dossier puis renommage,
+    un export interrompu ne laisse ni PDF tronqué ni fichier parasite.
     """
+    tmp_path = None
     try:
+        if hasattr(pdf_bytes, "getvalue"):
+            pdf_bytes = pdf_bytes.getvalue()
         ensure_directory_exists(path)
-        with open(path, "wb") as f:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
             f.write(pdf_bytes)
+        os.replace(tmp_path, path)
         logger.info("PDF exporté : %s", path)
         return True
     except Exception as e:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
         logger.error("Erreur export PDF dans %s : %s", path, str(e))
         return False
 
@@ -178,7 +522,11 @@ def save_config(config, path):
 # --- Exports explicites (optionnel) ---
 __all__ = [
     "write_csv", "read_csv",
-    "export_dataframe_to_csv", "ensure_directory_exists",
+    "read_csv_header", "read_csv_preview", "iter_csv_chunks", "RESULT_CSV_DTYPES",
+    "export_dataframe_to_csv", "write_scenarios_csv", "ensure_directory_exists",
+    "export_results_binary", "read_results_binary", "load_results_file",
+    "export_results_store", "is_result_store",
+    "is_binary_results_file", "BINARY_RESULT_FORMATS", "RESULTS_FILE_FILTER",
     "get_default_pdf_path", "export_pdf_file",
     "load_config", "save_config"
 ]
@@ -186,7 +534,10 @@ __all__ = [
 # --- Exemples d'utilisation ---
 # export_dataframe_to_csv(df, "data/output/simulations.csv")          # Simple
 # export_dataframe_to_csv(dict_scenarios, "data/output/scen_multi.csv", mode='single')   # Multi-concaténé
+# export_dataframe_to_csv(dict_scenarios, "data/output/scen_multi.csv.gz", mode='single')  # Multi, compressé gzip
 # export_dataframe_to_csv(dict_scenarios, "data/output/scen_multi", mode='split')        # Multi-fichiers
+# export_results_binary(dict_scenarios, "data/output/etude.npz")                       # Binaire colonnaire
+# df = read_results_binary("data/output/etude.npz", columns=["Annee", "Reserve"], annees=[2035])
 # pdf_path = get_default_pdf_path(section_name="comparaison")
 # export_pdf_file(pdf_bytes, pdf_path)
 # cfg = load_config("data/config/parametres.json")
@@ -0,0 +1,97 @@
+# utils/filtered_view.py
+
+import weakref
+
+import numpy as np
+
+from utils.search_index import get_search_index
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.filtered_view")
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+class FilteredView:
+    """
+    Moteur de filtrage partagé d'un jeu de résultats.
+
+    Les positions de lignes de chaque valeur d'Annee, de Simulation et de Scenario
+    sont calculées une seule fois (au premier filtre sur la colonne) ; un filtre est
+    ensuite une intersection de tableaux de positions triés, sans copie du DataFrame.
+    Sans filtre actif, le DataFrame d'origine est rendu tel quel.
+
+    Avec weak=True (vues partagées de get_filtered_view), la vue ne garde qu'une référence
+    faible : elle ne maintient pas le DataFrame en vie.
+    """
+
+    def __init__(self, df, weak=False):
+        self._df = weakref.ref(df) if weak else df
+        self._groups = {}
+
+    @property
+    def df(self):
+        return self._df() if isinstance(self._df, weakref.ref) else self._df
+
+    def _group(self, column):
+        if column not in self._groups:
+            if column in self.df.columns:
+                indices = self.df.groupby(column, sort=True, observed=True).indices
+                self._groups[column] = {key: np.asarray(pos, dtype=np.intp) for key, pos in indices.items()}
+            else:
+                self._groups[column] = None
+            logger.debug("FilteredView : index de groupes construit pour '%s'", column)
+        return self._groups[column]
+
+    def values(self, column):
+        """Valeurs distinctes triées d'une colonne (pour remplir les listes de filtres)."""
+        groups = self._group(column)
+        return list(groups) if groups else []
+
+    def positions(self, annees=None, simulations=None, scenarios=None, query=None):
+        """
+        Positions (iloc, triées) des lignes retenues, ou None si aucun filtre n'est actif.
+        Un filtre sur une colonne absente est ignoré.
+        """
+        result = None
+        for column, wanted in (("Annee", annees), ("Simulation", simulations), ("Scenario", scenarios)):
+            groups = self._group(column) if wanted is not None else None
+            if groups is None:
+                continue
+            parts = [groups.get(v, _EMPTY) for v in wanted]
+            pos = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts or [_EMPTY]))
+            result = pos if result is None else np.intersect1d(result, pos, assume_unique=True)
+        if query:
+            pos = get_search_index(self.df).positions(query)
+            result = pos if result is None else np.intersect1d(result, pos, assume_unique=True)
+        return result
+
+    def count(self, **filters):
+        """Nombre de lignes retenues, sans construire le DataFrame filtré."""
+        pos = self.positions(**filters)
+        return len(self.df) if pos is None else len(pos)
+
+    def select(self, **filters):
+        """DataFrame filtré (le DataFrame d'origine lui-même si aucun filtre n'est actif)."""
+        pos = self.positions(**filters)
+        return self.df if pos is None else self.df.take(pos)
+
+
+# Une vue par DataFrame (identité de l'objet) : tous les onglets d'une fenêtre la partagent
+_VIEWS = {}
+
+
+def get_filtered_view(df):
+    """Retourne la vue filtrable partagée de `df`, construite au premier appel."""
+    key = id(df)
+    entry = _VIEWS.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    view = FilteredView(df, weak=True)  # Sinon _VIEWS garderait le DataFrame en vie via la vue
+    _VIEWS[key] = (weakref.ref(df, lambda _ref, key=key: _VIEWS.pop(key, None)), view)
+    return view
+
+
+# --- Exemple d'utilisation ---
+# view = get_filtered_view(df)
+# df_2035 = view.select(annees=[2035], query="scénario 2")
+# n = view.count(simulations=[1, 2, 3])
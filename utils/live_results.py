@@ -0,0 +1,95 @@
+# utils/live_results.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.live_results")
+
+
+class LiveResults:
+    """
+    Source de résultats alimentée run par run pendant une simulation.
+
+    Le simulateur (thread de travail) pousse chaque run terminé avec append_run() ;
+    l'interface lit snapshot() à son rythme. Moyenne et variance de l'indicateur par
+    année sont mises à jour de façon incrémentale (Welford) : un run ajouté coûte
+    O(années), quel que soit le nombre de runs déjà reçus.
+    """
+
+    def __init__(self, indicator="Reserve", alpha=0.05, expected_runs=None):
+        self.indicator = indicator
+        self.alpha = alpha
+        self.expected_runs = expected_runs
+        self.version = 0  # Incrémenté à chaque run : permet de ne redessiner qu'en cas de nouveauté
+        self._lock = threading.Lock()
+        self._runs = []
+        self._annees = None
+        self._n = None
+        self._mean = None
+        self._m2 = None
+
+    def append_run(self, simulation_id, df_run):
+        """Ajoute un run terminé (format long, une ligne par année)."""
+        serie = df_run.set_index("Annee")[self.indicator]
+        with self._lock:
+            if self._annees is None:
+                self._annees = np.asarray(sorted(serie.index), dtype=int)
+                self._n = np.zeros(len(self._annees))
+                self._mean = np.zeros(len(self._annees))
+                self._m2 = np.zeros(len(self._annees))
+            values = serie.reindex(self._annees).to_numpy(dtype=float)
+            ok = ~np.isnan(values)
+            self._n[ok] += 1
+            delta = values[ok] - self._mean[ok]
+            self._mean[ok] += delta / self._n[ok]
+            self._m2[ok] += delta * (values[ok] - self._mean[ok])
+            self._runs.append(df_run)
+            self.version += 1
+        logger.debug("LiveResults : run %s reçu (%d runs)", simulation_id, len(self._runs))
+
+    @property
+    def n_runs(self):
+        return len(self._runs)
+
+    def snapshot(self):
+        """
+        État courant : dict avec annees, moyenne, ic_bas, ic_haut (IC de Student au niveau
+        1 - alpha, égal à la moyenne tant qu'un seul run est disponible), n_runs et version.
+        Retourne None avant le premier run.
+        """
+        with self._lock:
+            if self._annees is None:
+                return None
+            n = self._n.copy()
+            mean = self._mean.copy()
+            m2 = self._m2.copy()
+            version = self.version
+            n_runs = len(self._runs)
+        half = np.zeros_like(mean)
+        several = n > 1
+        sem = np.sqrt(m2[several] / (n[several] - 1) / n[several])
+        half[several] = sem * st.t.ppf(1 - self.alpha / 2, n[several] - 1)
+        return {
+            "annees": self._annees,
+            "moyenne": mean,
+            "ic_bas": mean - half,
+            "ic_haut": mean + half,
+            "n_runs": n_runs,
+            "version": version,
+        }
+
+    def to_dataframe(self):
+        """Runs reçus jusqu'ici, concaténés (format long)."""
+        with self._lock:
+            runs = list(self._runs)
+        return pd.concat(runs, ignore_index=True) if runs else pd.DataFrame()
+
+
+# --- Exemple d'utilisation ---
+# live = LiveResults(expected_runs=40)
+# sim.simuler_40_runs(on_run=live.append_run)   # dans un thread de travail
+# live.snapshot()["moyenne"]                     # depuis l'interface
@@ -1,44 +1,159 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import threading
+import time
 
 # --- 1. Central 'app' logger singleton ---
 logger = logging.getLogger("app")
 
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+
+class _BatchedFlushMixin:
+    """
+    Defers the per-record flush of StreamHandler: the stream is flushed every
+    `batch_size` records, after `flush_interval` seconds, or when the queue
+    listener has drained its queue (see _BatchingQueueListener).
+    """
+
+    batch_size = 256
+    flush_interval = 1.0
+
+    def _init_batching(self):
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        self._pending += 1
+        if self._pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.force_flush()
+
+    def force_flush(self):
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        super().flush()
+
+    def close(self):
+        self.force_flush()
+        super().close()
+
+
+class BatchedFileHandler(_BatchedFlushMixin, logging.FileHandler):
+    def __init__(self, path, encoding="utf-8"):
+        super().__init__(path, encoding=encoding)
+        self._init_batching()
+
+
+class BatchedRotatingFileHandler(_BatchedFlushMixin, logging.handlers.RotatingFileHandler):
+    def __init__(self, path, max_bytes, backup_count=3, encoding="utf-8"):
+        super().__init__(path, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self._init_batching()
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue: records are never pickled, so the
+    copy and full formatting done by the default prepare() are skipped. Only
+    the message is rendered here, so mutable arguments are captured as they are now.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes the batched handlers each time the queue runs empty."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            self.flush_handlers()
+            return self.queue.get(block)
+
+    def flush_handlers(self):
+        for handler in self.handlers:
+            getattr(handler, "force_flush", handler.flush)()
+
+
+def _make_formatter():
+    return logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT)
+
+
+def _make_file_handler(path, level, max_bytes=0, backup_count=3, batched=False):
+    """
+    File handler (rotating when max_bytes > 0). `batched` only behind the queue
+    listener, which flushes it when the queue drains: written synchronously, a batched
+    handler would hold the last records until a later one arrives or the process exits.
+    """
+    log_dir = os.path.dirname(path)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+    if max_bytes and batched:
+        handler = BatchedRotatingFileHandler(path, max_bytes, backup_count)
+    elif max_bytes:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    elif batched:
+        handler = BatchedFileHandler(path)
+    else:
+        handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setLevel(getattr(logging, level.upper(), logging.DEBUG))
+    handler.setFormatter(_make_formatter())
+    return handler
+
+
 # --- 2. Setup Handlers ---
+# Output handlers (console, file) run on a background thread behind a QueueHandler:
+# the calling thread only enqueues the record, file I/O happens in the listener.
+# APP_LOG_ASYNC=0 attaches them directly to the logger instead (synchronous).
+_listener = None
+_output_handlers = []
+
 if not logger.hasHandlers():
+    use_async = os.environ.get("APP_LOG_ASYNC", "1") != "0"
+
     # Console Handler
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_level = os.environ.get("APP_LOG_CONSOLE_LEVEL", "INFO").upper()
     stream_handler.setLevel(getattr(logging, stream_level, logging.INFO))
-    formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    stream_handler.setFormatter(_make_formatter())
+    _output_handlers.append(stream_handler)
 
-    # File Handler (optional)
+    # File Handler (optional), rotating when APP_LOG_MAX_BYTES > 0
     log_path = os.environ.get("APP_LOG_FILE", "logs/app.log")
-    file_level = os.environ.get("APP_LOG_FILE_LEVEL", "DEBUG").upper()
-    log_dir = os.path.dirname(log_path)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
+    file_level = os.environ.get("APP_LOG_FILE_LEVEL", "DEBUG")
+    max_bytes = int(os.environ.get("APP_LOG_MAX_BYTES", "0"))
+    backup_count = int(os.environ.get("APP_LOG_BACKUP_COUNT", "3"))
+    _output_handlers.append(_make_file_handler(log_path, file_level, max_bytes, backup_count, batched=use_async))
+
+    if use_async:
+        logger.addHandler(_InProcessQueueHandler(queue.SimpleQueue()))
+        _listener = _BatchingQueueListener(logger.handlers[0].queue, *_output_handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in _output_handlers:
+            logger.addHandler(handler)
 
-    if not any(
-        isinstance(h, logging.FileHandler) and
-        os.path.abspath(getattr(h, "baseFilename", "")) == os.path.abspath(log_path)
-        for h in logger.handlers
-    ):
-        file_handler = logging.FileHandler(log_path, encoding="utf-8")
-        file_handler.setLevel(getattr(logging, file_level, logging.DEBUG))
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+def _all_handlers():
+    """Handlers attached to the logger plus those run by the queue listener."""
+    handlers = list(logger.handlers)
+    if _listener is not None:
+        handlers += [h for h in _listener.handlers if h not in handlers]
+    return handlers
 
 # --- 3. Set global log level ---
 default_level = os.environ.get("APP_LOG_LEVEL", "DEBUG").upper()
 logger.setLevel(getattr(logging, default_level, logging.DEBUG))
-for h in logger.handlers:
+for h in _all_handlers():
     h.setLevel(getattr(logging, default_level, logging.DEBUG))
 
 # --- 4. Public API ---
@@ -52,45 +167,193 @@ def set_log_level(level_name: str):
     """Change the global log level at runtime."""
     level = getattr(logging, level_name.upper(), logging.INFO)
     logger.setLevel(level)
-    for handler in logger.handlers:
+    for handler in _all_handlers():
         handler.setLevel(level)
 
-def add_file_handler(path: str, level: str = "DEBUG"):
-    """Add a custom file handler at runtime."""
-    log_dir = os.path.dirname(path)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
-
+def add_file_handler(path: str, level: str = "DEBUG", max_bytes: int = 0, backup_count: int = 3):
+    """
+    Add a custom file handler at runtime (rotating when max_bytes > 0).
+    With the asynchronous setup, it is written (batched) by the background listener;
+    otherwise it is a plain handler that flushes every record.
+    """
     already_added = any(
         isinstance(h, logging.FileHandler) and
         os.path.abspath(getattr(h, "baseFilename", "")) == os.path.abspath(path)
-        for h in logger.handlers
+        for h in _all_handlers()
     )
-    if not already_added:
-        file_handler = logging.FileHandler(path, encoding="utf-8")
-        file_handler.setLevel(getattr(logging, level.upper(), logging.DEBUG))
-        formatter = logging.Formatter(
-            "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        file_handler.setFormatter(formatter)
+    if already_added:
+        return
+    listening = _listener is not None and _listener._thread is not None
+    file_handler = _make_file_handler(path, level, max_bytes, backup_count, batched=listening)
+    if listening:
+        # Restart the listener so that its thread picks up the new handler
+        _listener.stop()
+        _listener.handlers = _listener.handlers + (file_handler,)
+        _listener.start()
+    else:
         logger.addHandler(file_handler)
 
+def flush_handlers():
+    """Write out every pending record (waits for the background listener to drain its queue)."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+        _listener.start()
+    for handler in _all_handlers():
+        getattr(handler, "force_flush", handler.flush)()
+
 def close_handlers():
     """Close all log handlers (e.g., for rotation or shutdown)."""
-    for handler in logger.handlers[:]:
-        handler.flush()
-        handler.close()
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()  # Drains the queue before returning
+    for handler in _all_handlers():
+        handler.close()  # Flushes pending batched records first
         logger.removeHandler(handler)
+    if _listener is not None:
+        _listener.handlers = ()
+
+atexit.register(close_handlers)
+
+# --- 5. Volume filters for per-entity debug events ---
+# Attached to a logger (not a handler), they run in the calling thread before the
+# record is queued. Records above `max_level` always pass. Counters are kept per
+# message template (record.msg), which is why hot-path calls use %-style arguments.
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 record in `every_n` for each message template."""
+
+    def __init__(self, every_n, max_level=logging.INFO):
+        super().__init__()
+        self.every_n = max(int(every_n), 1)
+        self.max_level = max_level
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        with self._lock:
+            count = self._counts.get(record.msg, 0)
+            self._counts[record.msg] = count + 1
+        return count % self.every_n == 0
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per message template: `rate` records per second, bursts of up to
+    `burst`. The next record let through reports how many were dropped meanwhile.
+    """
+
+    def __init__(self, rate, burst=None, max_level=logging.INFO):
+        super().__init__()
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self.max_level = max_level
+        self._buckets = {}  # template -> [tokens, last_refill, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(record.msg, [self.burst, now, 0])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            dropped, bucket[2] = bucket[2], 0
+        if dropped:
+            record.msg = f"{record.msg} [+{dropped} similar messages dropped]"
+        return True
+
+
+class SummaryFilter(logging.Filter):
+    """
+    Drops the records and counts them per message template. emit_summary() logs
+    one aggregate line (e.g. "Année 2026 : 10 300 employés vieillis, 412 ...")
+    then resets the counters. `labels` maps templates to readable names.
+    """
+
+    def __init__(self, labels=None, max_level=logging.INFO):
+        super().__init__()
+        self.labels = labels or {}
+        self.max_level = max_level
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        with self._lock:
+            self._counts[record.msg] = self._counts.get(record.msg, 0) + 1
+        return False
+
+    def counts(self):
+        """Counters per label (or template when unlabelled) since the last summary."""
+        with self._lock:
+            return {self.labels.get(msg, msg): n for msg, n in self._counts.items()}
+
+    def emit_summary(self, target, label):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return
+        parts = ", ".join(
+            "{} {}".format(f"{n:,}".replace(",", " "), self.labels.get(msg, repr(msg)))
+            for msg, n in counts.items()
+        )
+        target.info("%s : %s", label, parts)
+
+
+_FILTER_TYPES = (SamplingFilter, RateLimitFilter, SummaryFilter)
+
+def make_log_filter(spec: str, labels=None):
+    """
+    Build a volume filter from a spec string:
+    "all" (no filter), "sample:N", "rate:R" or "rate:R/BURST", "summary".
+    """
+    spec = (spec or "all").strip().lower()
+    mode, _, arg = spec.partition(":")
+    if mode == "all":
+        return None
+    if mode == "sample":
+        return SamplingFilter(int(arg or 100))
+    if mode == "rate":
+        rate, _, burst = (arg or "10").partition("/")
+        return RateLimitFilter(float(rate), float(burst) if burst else None)
+    if mode == "summary":
+        return SummaryFilter(labels)
+    raise ValueError(f"Unknown log filter spec: {spec!r}")
+
+def set_log_filter(name, spec, labels=None):
+    """
+    Replace the volume filter of logger `name` (child of 'app', or a Logger).
+    Returns the new filter (None for "all").
+    """
+    target = name if isinstance(name, logging.Logger) else get_logger(name)
+    for existing in [f for f in target.filters if isinstance(f, _FILTER_TYPES)]:
+        target.removeFilter(existing)
+    log_filter = spec if isinstance(spec, logging.Filter) else make_log_filter(spec, labels)
+    if log_filter is not None:
+        target.addFilter(log_filter)
+    return log_filter
 
-# --- 5. Optional import log message ---
+# --- 6. Optional import log message ---
 logger.debug("✅ Logger initialized from utils/logger.py")
 
-# --- 6. Explicit exports ---
+# --- 7. Explicit exports ---
 __all__ = [
     "get_logger",
     "get_child_logger",
     "set_log_level",
     "add_file_handler",
-    "close_handlers"
+    "flush_handlers",
+    "close_handlers",
+    "SamplingFilter",
+    "RateLimitFilter",
+    "SummaryFilter",
+    "make_log_filter",
+    "set_log_filter"
 ]
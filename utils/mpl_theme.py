@@ -1,7 +1,20 @@
 # utils/mpl_theme.py
 
 import matplotlib as mpl
-from ui.theme import MPL_COLORS, FONT_FAMILY, FONT_SIZE
+
+# ui.theme est importé à l'appel : importer utils (ex. dans un processus de rendu)
+# ne charge pas tout le paquet ui, qui importe lui-même utils.
+
+def _theme_colors(dark_mode):
+    """Couleurs du thème : (fond, texte, grille, fond légende, bord légende, fond tooltip, texte tooltip)."""
+    from ui.theme import MPL_COLORS
+    base_colors = MPL_COLORS
+    # Couleurs adaptées dark/clair
+    if dark_mode:
+        return (base_colors.get("dark_background", "#181C20"), "#EEE", "#444",
+                "#232B34", "#444", "#232B34", "#F8FBFF")
+    return (base_colors["background"], "#222", "#DDE3EA",
+            "#F8FBFF", "#AAA", "#F8FBFF", "#282C34")
 
 def set_mpl_theme(dark_mode=False):
     """
@@ -9,24 +22,8 @@ def set_mpl_theme(dark_mode=False):
     incluant palette de couleurs, fonds, polices, tailles, styles de légende, etc.
     Appelle cette fonction à chaque changement de mode pour homogénéiser tous tes plots.
     """
-    base_colors = MPL_COLORS
-    # Couleurs adaptées dark/clair
-    if dark_mode:
-        bg = base_colors.get("dark_background", "#181C20")
-        fg = "#EEE"
-        grid = "#444"
-        legend_face = "#232B34"
-        legend_edge = "#444"
-        tooltip_bg = "#232B34"
-        tooltip_fg = "#F8FBFF"
-    else:
-        bg = base_colors["background"]
-        fg = "#222"
-        grid = "#DDE3EA"
-        legend_face = "#F8FBFF"
-        legend_edge = "#AAA"
-        tooltip_bg = "#F8FBFF"
-        tooltip_fg = "#282C34"
+    from ui.theme import MPL_COLORS, FONT_FAMILY, FONT_SIZE
+    bg, fg, grid, legend_face, legend_edge, tooltip_bg, tooltip_fg = _theme_colors(dark_mode)
 
     # Palette matplotlib mise à jour
     mpl.rcParams.update({
@@ -47,11 +44,11 @@ def set_mpl_theme(dark_mode=False):
         "legend.fontsize": FONT_SIZE - 1,
         # --- Palette des courbes ---
         "axes.prop_cycle": mpl.cycler(color=[
-            base_colors["reserve"],
-            base_colors["confidence"],
-            base_colors["highlight"],
-            base_colors["danger"],
-            base_colors["success"]
+            MPL_COLORS["reserve"],
+            MPL_COLORS["confidence"],
+            MPL_COLORS["highlight"],
+            MPL_COLORS["danger"],
+            MPL_COLORS["success"]
         ]),
         # --- Grille ---
         "grid.color": grid,
@@ -75,6 +72,32 @@ def set_mpl_theme(dark_mode=False):
     mpl._MPL_TOOLTIP_BG = tooltip_bg
     mpl._MPL_TOOLTIP_FG = tooltip_fg
 
+def restyle_figure(figure, dark_mode=False):
+    """
+    Applique le thème clair/sombre aux artistes d'une figure déjà tracée
+    (fonds, axes, graduations, titres, grille, légende), sans retracer les données.
+    """
+    bg, fg, grid, legend_face, legend_edge, _tooltip_bg, _tooltip_fg = _theme_colors(dark_mode)
+    figure.set_facecolor(bg)
+    for ax in figure.axes:
+        ax.set_facecolor(bg)
+        for spine in ax.spines.values():
+            spine.set_edgecolor(fg)
+        ax.tick_params(colors=fg, which="both")
+        ax.xaxis.label.set_color(fg)
+        ax.yaxis.label.set_color(fg)
+        ax.title.set_color(fg)
+        for line in ax.get_xgridlines() + ax.get_ygridlines():
+            line.set_color(grid)
+        legend = ax.get_legend()
+        if legend is not None:
+            legend.get_frame().set_facecolor(legend_face)
+            legend.get_frame().set_edgecolor(legend_edge)
+            for text in legend.get_texts():
+                text.set_color(fg)
+    if figure.canvas is not None:
+        figure.canvas.draw_idle()
+
 # --- UTILISATION ---
 """
 from utils.mpl_theme import set_mpl_theme
@@ -82,4 +105,7 @@ from utils.mpl_theme import set_mpl_theme
 # Appeler à chaque changement de mode :
 set_mpl_theme(dark_mode=True)   # Pour le mode sombre
 set_mpl_theme(dark_mode=False)  # Pour le mode clair
+
+# Restyler une figure existante sans la retracer :
+restyle_figure(fig, dark_mode=True)
 """
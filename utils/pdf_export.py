@@ -1,20 +1,23 @@
 # utils/pdf_export.py
 
+import io
 import os
 from datetime import datetime
 
 from matplotlib.backends.backend_pdf import PdfPages
 from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas as rl_canvas
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 
+from utils.charts import render_charts
+from utils.fileio import export_pdf_file
+
 # --- MAIN ENTRY POINT ---
 
 def export_report_to_pdf(
-    path,
+    path=None,
     figures=None,
     stats=None,
     summary=None,
@@ -22,12 +25,17 @@ def export_report_to_pdf(
     title="Rapport de Simulation",
     author="Simulation App",
     add_toc=True,
-    custom_logo_path=None
+    custom_logo_path=None,
+    chart_source=None,
+    chart_specs=None,
+    max_workers=None,
+    table_max_rows=None,
+    table_overflow="truncate"
 ):
     """
     Génére un PDF rapport complet (figures matplotlib, stats, résumé, etc.)
     Params:
-        path: destination du PDF
+        path: destination du PDF ; si None, retourne les octets du PDF au lieu d'écrire
         figures: liste de matplotlib Figure
         stats: liste de tuples (titre, dict|DataFrame)
         summary: texte ou HTML (str)
@@ -35,20 +43,73 @@ def export_report_to_pdf(
         title, author: meta PDF
         add_toc: ajoute une table des matières
         custom_logo_path: chemin vers un logo (facultatif)
+        chart_source, chart_specs: graphiques décrits par des spécifications (voir utils.charts),
+            rendus en pages PDF vectorielles par un pool de processus (max_workers) puis
+            ajoutés dans l'ordre après les figures
+        table_max_rows: au-delà (défaut TABLE_MAX_ROWS), un tableau DataFrame est tronqué
+            (table_overflow="truncate") ou remplacé par son résumé statistique ("summary")
+    Le document est assemblé en mémoire puis écrit en une fois (renommage atomique,
+    via fileio.export_pdf_file) : aucun fichier temporaire intermédiaire.
     """
+    pdf_bytes = build_report_pdf(
+        figures=figures, stats=stats, summary=summary, sections=sections,
+        title=title, author=author, add_toc=add_toc, custom_logo_path=custom_logo_path,
+        chart_source=chart_source, chart_specs=chart_specs, max_workers=max_workers,
+        table_max_rows=table_max_rows, table_overflow=table_overflow
+    )
+    if path is None:
+        return pdf_bytes
+    return export_pdf_file(pdf_bytes, path)
+
+
+def build_report_pdf(
+    figures=None,
+    stats=None,
+    summary=None,
+    sections=None,
+    title="Rapport de Simulation",
+    author="Simulation App",
+    add_toc=True,
+    custom_logo_path=None,
+    chart_source=None,
+    chart_specs=None,
+    max_workers=None,
+    table_max_rows=None,
+    table_overflow="truncate"
+):
+    """Construit le rapport (mêmes paramètres que export_report_to_pdf) et retourne ses octets."""
     # Sélectionne sections par défaut
     sections = sections or ['summary', 'stats', 'figures']
 
-    # === 1. Génére la page de garde, résumé, stats et TOC via ReportLab
-    tmp_main = path + ".rl_temp.pdf"
-    doc = SimpleDocTemplate(tmp_main, pagesize=A4, rightMargin=1.5*cm, leftMargin=1.5*cm, topMargin=1.8*cm, bottomMargin=1.5*cm)
-    elements = []
-    styles = getSampleStyleSheet()
-    H1, H2, H3 = styles['Heading1'], styles['Heading2'], styles['Heading3']
+    # Chaque section est un document PDF à part (fragment), fusionné dans l'ordre :
+    # ReportBuilder peut ainsi réutiliser les fragments inchangés d'un export à l'autre
+    fragments = [cover_pdf(title, author, sections, add_toc, custom_logo_path)]
+    if summary and 'summary' in sections:
+        fragments.append(summary_pdf(summary))
+    if stats and 'stats' in sections:
+        fragments.append(stats_pdf(stats, table_max_rows, table_overflow))
+    if figures and 'figures' in sections:
+        fragments.append(figures_pdf(figures))
+    # Spécifications : rendues en parallèle, une page PDF chacune, dans l'ordre
+    # (même rendu que les graphiques de ReportBuilder.export_pdf, voir ReportBuilder.chart_spec)
+    if chart_specs and 'figures' in sections:
+        fragments += [page for page in render_charts(chart_source, chart_specs, fmt="pdf", max_workers=max_workers)
+                      if page is not None]
+    return merge_pdf_fragments(fragments)
 
-    # --- Page de garde / titre
-    elements.append(Paragraph(title, H1))
-    elements.append(Spacer(1, 0.3*cm))
+# --- Fragments (une section = un PDF en mémoire) ---
+
+def _render_elements(elements):
+    """Met en page une liste de flowables ReportLab (A4, marges du rapport) et retourne les octets."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=1.5*cm, leftMargin=1.5*cm, topMargin=1.8*cm, bottomMargin=1.5*cm)
+    doc.build(elements)
+    return buffer.getvalue()
+
+def cover_pdf(title, author, sections, add_toc=True, custom_logo_path=None):
+    """Page de garde (titre, date, auteur) et table des matières."""
+    styles = getSampleStyleSheet()
+    elements = [Paragraph(title, styles['Heading1']), Spacer(1, 0.3*cm)]
     if custom_logo_path and os.path.exists(custom_logo_path):
         from reportlab.platypus import Image
         elements.append(Image(custom_logo_path, width=3*cm, height=3*cm))
@@ -59,90 +120,125 @@ def export_report_to_pdf(
 
     # --- Table des matières
     if add_toc:
-        elements.append(Paragraph("Table des matières", H2))
+        elements.append(Paragraph("Table des matières", styles['Heading2']))
         toc = []
         if 'summary' in sections: toc.append("Résumé")
         if 'stats' in sections: toc.append("Statistiques")
         if 'figures' in sections: toc.append("Graphiques")
         elements.append(Paragraph("<br/>".join(f"{i+1}. {t}" for i, t in enumerate(toc)), styles["Normal"]))
-        elements.append(PageBreak())
+    return _render_elements(elements)
 
-    # --- Résumé
-    if summary and 'summary' in sections:
-        elements.append(Paragraph("Résumé", H2))
-        elements.append(Paragraph(summary, styles["Normal"]))
-        elements.append(Spacer(1, 0.5*cm))
-        elements.append(PageBreak())
+def summary_pdf(summary):
+    styles = getSampleStyleSheet()
+    return _render_elements([Paragraph("Résumé", styles['Heading2']), Paragraph(summary, styles["Normal"])])
 
-    # --- Statistiques/Tableaux
-    if stats and 'stats' in sections:
-        elements.append(Paragraph("Statistiques", H2))
-        for stat_title, stat_data in stats:
-            elements.append(Paragraph(stat_title, H3))
-            elements.append(_stats_table(stat_data, styles))
-            elements.append(Spacer(1, 0.2*cm))
-        elements.append(PageBreak())
-
-    # --- Build main (non-graph) PDF
-    doc.build(elements)
+def stats_pdf(stats, table_max_rows=None, table_overflow="truncate"):
+    """Section Statistiques : un titre et un tableau (découpé en blocs) par entrée (titre, données)."""
+    styles = getSampleStyleSheet()
+    elements = [Paragraph("Statistiques", styles['Heading2'])]
+    for stat_title, stat_data in stats:
+        elements.append(Paragraph(stat_title, styles['Heading3']))
+        elements.extend(_stats_table(stat_data, styles, max_rows=table_max_rows, overflow=table_overflow))
+        elements.append(Spacer(1, 0.2*cm))
+    return _render_elements(elements)
 
-    # === 2. Combine figures matplotlib (1 fig = 1 page) via PdfPages
-    tmp_figs = []
-    if figures and 'figures' in sections:
-        tmp_fig_path = path + ".mpl_temp.pdf"
-        with PdfPages(tmp_fig_path) as pdf:
-            for fig in figures:
-                pdf.savefig(fig, bbox_inches="tight")
-        tmp_figs.append(tmp_fig_path)
+def figures_pdf(figures):
+    """Figures matplotlib (1 fig = 1 page, vectorielles) via PdfPages, en mémoire."""
+    buffer = io.BytesIO()
+    with PdfPages(buffer) as pdf:
+        for fig in figures:
+            pdf.savefig(fig, bbox_inches="tight")
+    return buffer.getvalue()
 
-    # === 3. Fusionne tout dans le PDF final
+def merge_pdf_fragments(fragments):
+    """Fusionne des PDF (octets) dans l'ordre, en mémoire."""
+    if len(fragments) == 1:
+        return fragments[0]
     from PyPDF2 import PdfMerger
     merger = PdfMerger()
-    merger.append(tmp_main)
-    for p in tmp_figs:
-        merger.append(p)
-    merger.write(path)
+    for fragment in fragments:
+        merger.append(io.BytesIO(fragment))
+    output = io.BytesIO()
+    merger.write(output)
     merger.close()
-
-    # Clean temp
-    os.remove(tmp_main)
-    for p in tmp_figs:
-        os.remove(p)
-    return True
+    return output.getvalue()
 
 # --- Helpers ---
 
-def _stats_table(data, styles):
-    """Crée un tableau ReportLab depuis dict, list of tuples, or DataFrame."""
-    from reportlab.platypus import Table, TableStyle
+# Tableaux : découpés en blocs de TABLE_CHUNK_ROWS lignes (en-tête répété), le coût de mise
+# en page de ReportLab croissant plus vite que le nombre de lignes d'une même Table
+TABLE_CHUNK_ROWS = 200
+TABLE_MAX_ROWS = 5000
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#e6fbe2")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#417505")),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#f6f7fb")]),
+    ('GRID', (0,0), (-1,-1), 0.2, colors.HexColor("#bfcddb")),
+    ('LEFTPADDING', (0,0), (-1,-1), 4),
+    ('RIGHTPADDING', (0,0), (-1,-1), 4),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 2),
+    ('TOPPADDING', (0,0), (-1,-1), 2),
+])
+
+def _stats_table(data, styles, max_rows=None, overflow="truncate", chunk_rows=TABLE_CHUNK_ROWS):
+    """
+    Crée les tableaux ReportLab depuis dict, list of tuples, or DataFrame : une liste de
+    flowables (un Table par bloc de `chunk_rows` lignes, en-tête répété).
+    Un DataFrame de plus de `max_rows` lignes est tronqué (note en fin de tableau) ou,
+    avec overflow="summary", remplacé par son résumé statistique (describe).
+    """
     import pandas as pd
     if isinstance(data, dict):
-        rows = [["Clé", "Valeur"]]
-        rows += [[str(k), str(v)] for k, v in data.items()]
-    elif isinstance(data, pd.DataFrame):
-        rows = [list(map(str, data.columns))]
-        rows += data.astype(str).values.tolist()
+        data = pd.DataFrame({"Clé": list(map(str, data.keys())), "Valeur": list(map(str, data.values()))})
     elif isinstance(data, (list, tuple)):
-        rows = [list(map(str, data[0]))] if data and isinstance(data[0], (list, tuple)) else []
-        rows += [list(map(str, r)) for r in data[1:]] if len(data) > 1 else []
-    else:
-        rows = [["Donnée", str(data)]]
-
-    tbl = Table(rows, hAlign='LEFT')
-    tbl.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#e6fbe2")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#417505")),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#f6f7fb")]),
-        ('GRID', (0,0), (-1,-1), 0.2, colors.HexColor("#bfcddb")),
-        ('LEFTPADDING', (0,0), (-1,-1), 4),
-        ('RIGHTPADDING', (0,0), (-1,-1), 4),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 2),
-        ('TOPPADDING', (0,0), (-1,-1), 2),
-    ]))
+        if not (data and isinstance(data[0], (list, tuple))):
+            return []
+        data = pd.DataFrame([list(map(str, r)) for r in data[1:]], columns=list(map(str, data[0])))
+    elif not isinstance(data, pd.DataFrame):
+        return [_table([["Donnée", str(data)]])]
+
+    max_rows = TABLE_MAX_ROWS if max_rows is None else max_rows
+    flowables, note = [], None
+    if len(data) > max_rows:
+        if overflow == "summary":
+            note = f"Résumé statistique de {len(data):,} lignes (au-delà de {max_rows:,} lignes)."
+            data = data.describe().T.reset_index(names="Colonne")
+        else:
+            note = f"… {len(data) - max_rows:,} lignes supplémentaires non affichées (tableau limité à {max_rows:,} lignes)."
+            data = data.iloc[:max_rows]
+
+    header = list(map(str, data.columns))
+    for start in range(0, max(len(data), 1), chunk_rows):
+        # Formatage vectorisé, bloc par bloc : seules les chaînes du bloc courant sont créées
+        flowables.append(_table([header] + _format_rows(data.iloc[start:start + chunk_rows])))
+    if note:
+        flowables.append(Paragraph(f"<i>{note}</i>", styles["Normal"]))
+    return flowables
+
+def _format_rows(df):
+    """Lignes de chaînes d'un DataFrame : flottants à 2 décimales, NaN vides, colonne par colonne."""
+    import numpy as np
+    import pandas as pd
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        if pd.api.types.is_float_dtype(col):
+            values = col.to_numpy(dtype=float)
+            text = np.char.mod("%.2f", values).astype(object)
+            text[np.isnan(values)] = ""
+        else:
+            text = col.astype(str).to_numpy(dtype=object)
+        columns.append(text)
+    return np.column_stack(columns).tolist() if columns else [[] for _ in range(len(df))]
+
+def _table(rows):
+    tbl = Table(rows, hAlign='LEFT', repeatRows=1)
+    tbl.setStyle(TABLE_STYLE)
     return tbl
 
 # --- Exemple d'utilisation ---
@@ -158,4 +254,13 @@ export_report_to_pdf(
     title="Rapport Simulation Retraite",
     author="Nawfal RAZOUK"
 )
+
+pdf_bytes = export_report_to_pdf(path=None, figures=[fig1])  # octets, sans écriture disque
+
+# Graphiques décrits par spécifications, rendus en parallèle (une page par année)
+export_report_to_pdf(
+    path="rapport_distributions.pdf",
+    chart_source=df_concat,
+    chart_specs=[{"kind": "distribution", "annee": a} for a in range(2025, 2036)],
+)
 """
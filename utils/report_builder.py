@@ -0,0 +1,326 @@
+# utils/report_builder.py
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import matplotlib
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.charts import draw_chart_spec, render_charts
+from utils.fileio import export_pdf_file
+from utils.figure_cache import data_fingerprint
+from utils.pdf_export import cover_pdf, merge_pdf_fragments, stats_pdf, summary_pdf
+from utils.stats import intervalle_confiance_reserve
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.report_builder")
+
+# Parties du rapport, dans l'ordre d'assemblage (mêmes contenus que les onglets)
+REPORT_PARTS = ("reserve", "comparaison", "confidence", "summary", "by_year")
+# Parties rendues en graphique (une page chacune)
+FIGURE_PARTS = ("reserve", "comparaison", "confidence")
+
+# Agrégats déjà calculés, par (empreinte des données, nom, paramètres) : partagés entre
+# les rapports successifs sur les mêmes résultats (ReportWindow, ChartsWindow, scripts)
+_AGGREGATES = OrderedDict()
+_MAX_AGGREGATES = 64
+
+
+def _cached(data, name, compute, *params):
+    key = (data_fingerprint(data), name, params)
+    if key in _AGGREGATES:
+        _AGGREGATES.move_to_end(key)
+        return _AGGREGATES[key]
+    value = compute()
+    _AGGREGATES[key] = value
+    while len(_AGGREGATES) > _MAX_AGGREGATES:
+        _AGGREGATES.popitem(last=False)
+    return value
+
+
+# Version du rendu des fragments : à incrémenter si leur mise en page change
+FRAGMENT_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join("data", "cache", "rapport")
+
+# Paramètres matplotlib qui changent l'apparence des figures (thème clair/sombre)
+_THEME_RC_KEYS = ("figure.facecolor", "axes.facecolor", "axes.edgecolor", "axes.labelcolor",
+                  "text.color", "xtick.color", "ytick.color", "grid.color", "legend.facecolor")
+
+
+def _theme_key():
+    return tuple(str(matplotlib.rcParams[k]) for k in _THEME_RC_KEYS)
+
+
+def fragment_key(name, inputs):
+    """Empreinte (hexadécimale) d'une section : nom, entrées et version du rendu."""
+    return hashlib.sha256(repr((FRAGMENT_VERSION, name, inputs)).encode("utf-8")).hexdigest()
+
+
+class PdfFragmentCache:
+    """
+    Fragments PDF rendus, sur disque (un fichier <empreinte>.pdf par section).
+    Les fichiers les moins récemment utilisés sont supprimés au-delà de max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        os.utime(path)  # Marque le fragment comme récemment utilisé
+        return data
+
+    def put(self, key, data):
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _prune(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pdf"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _mtime, size, _name in entries)
+        for _mtime, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+            logger.debug("PdfFragmentCache : fragment %s supprimé (taille max atteinte)", name)
+
+
+class ReportBuilder:
+    """
+    Construit le contenu d'un rapport PDF (figures, statistiques, résumé) directement
+    depuis les résultats, sans instancier d'onglet Qt : utilisable depuis un script
+    ou un serveur, et réutilisé par ReportWindow et ChartsWindow.
+
+    - data : DataFrame long des runs (Simulation, Annee, Reserve, ...)
+    - data_scenarios : dict {scénario: DataFrame} pour la comparaison (facultatif)
+    """
+
+    def __init__(self, data=None, data_scenarios=None, alpha=0.05):
+        self.data = data if isinstance(data, pd.DataFrame) else pd.DataFrame()
+        self.data_scenarios = data_scenarios if isinstance(data_scenarios, dict) else {}
+        self.alpha = alpha
+
+    # --- Agrégats (mis en cache) ---
+
+    def reserve_by_year(self):
+        """Réserve moyenne par année (Series indexée par Annee)."""
+        return _cached(self.data, "reserve_by_year", lambda: self.data.groupby("Annee")["Reserve"].mean())
+
+    def confidence_table(self):
+        """Moyenne et IC de Student de la réserve par année (colonnes Annee, Moyenne, IC bas, IC haut)."""
+        def compute():
+            rows = []
+            for annee, moyenne in self.reserve_by_year().items():
+                low, high = intervalle_confiance_reserve(self.data, annee, alpha=self.alpha)
+                rows.append((int(annee), moyenne, low, high))
+            return pd.DataFrame(rows, columns=["Annee", "Moyenne", "IC bas", "IC haut"])
+        return _cached(self.data, "confidence_table", compute, self.alpha)
+
+    def by_year_table(self):
+        """Moyenne de chaque indicateur par année (vue « Moyenne par Année »)."""
+        return _cached(self.data, "by_year", lambda: self.data.groupby("Annee").mean(numeric_only=True).reset_index())
+
+    def scenario_reserve_by_year(self):
+        """Réserve moyenne par année et par scénario (DataFrame indexé par Annee)."""
+        def compute():
+            return pd.DataFrame({
+                name: df.groupby("Annee")["Reserve"].mean()
+                for name, df in self.data_scenarios.items() if not df.empty
+            })
+        return _cached(self.data_scenarios, "scenario_reserve_by_year", compute)
+
+    def final_year_summary(self):
+        """Réserve finale : (année, moyenne, IC bas, IC haut, n), IC normal à 95 % comme la vue Résumé."""
+        def compute():
+            annee = int(self.data["Annee"].max())
+            reserves = self.data.loc[self.data["Annee"] == annee, "Reserve"]
+            moyenne, n = reserves.mean(), reserves.shape[0]
+            marge = 1.96 * reserves.std(ddof=1) / (n ** 0.5)
+            return annee, moyenne, moyenne - marge, moyenne + marge, n
+        return _cached(self.data, "final_year_summary", compute)
+
+    # --- Contenu du rapport ---
+
+    def available_parts(self, parts=REPORT_PARTS):
+        """Parties demandées pour lesquelles les données nécessaires sont présentes."""
+        has_runs = not self.data.empty and {"Annee", "Reserve"} <= set(self.data.columns)
+        return [
+            part for part in parts
+            if (part == "comparaison" and any(not df.empty for df in self.data_scenarios.values()))
+            or (part != "comparaison" and has_runs)
+        ]
+
+    def figures(self, parts=REPORT_PARTS):
+        return [self.figure(part) for part in self.available_parts(parts) if part in FIGURE_PARTS]
+
+    def stats(self, parts=REPORT_PARTS):
+        """Liste de (titre, dict|DataFrame) pour la section Statistiques."""
+        stats = []
+        for part in self.available_parts(parts):
+            if part == "reserve":
+                series = self.reserve_by_year()
+                stats.append(("Réserve moyenne", {
+                    f"Réserve moyenne {int(series.index[0])}": f"{series.iloc[0]:,.0f} DH",
+                    f"Réserve moyenne {int(series.index[-1])}": f"{series.iloc[-1]:,.0f} DH",
+                    "Minimum": f"{series.min():,.0f} DH ({int(series.idxmin())})",
+                    "Maximum": f"{series.max():,.0f} DH ({int(series.idxmax())})",
+                }))
+            elif part == "comparaison":
+                finale = self.scenario_reserve_by_year().iloc[-1]
+                stats.append(("Réserve finale par scénario", {name: f"{v:,.0f} DH" for name, v in finale.items()}))
+            elif part == "confidence":
+                stats.append((f"Intervalles de confiance à {100 * (1 - self.alpha):.0f}%", self.confidence_table().round(0)))
+            elif part == "by_year":
+                stats.append(("Résultats annuels moyens", self.by_year_table().round(2)))
+        return stats
+
+    def summary(self, parts=REPORT_PARTS):
+        if "summary" not in self.available_parts(parts):
+            return ""
+        annee, moyenne, ic_low, ic_high, n = self.final_year_summary()
+        return (
+            f"Réserve moyenne finale ({annee}) : {moyenne:,.0f} DH<br/>"
+            f"Intervalle de confiance à 95% : [{ic_low:,.0f}, {ic_high:,.0f}] DH<br/>"
+            f"Nombre de simulations : {n}"
+        )
+
+    def export_pdf(self, path=None, parts=REPORT_PARTS, sections=None,
+                   title="Rapport Simulation Retraite", author="Nawfal RAZOUK",
+                   add_toc=True, custom_logo_path=None, table_max_rows=None, table_overflow="truncate",
+                   cache_dir=None, max_workers=None):
+        """
+        Construit et exporte le rapport : retourne True/False, ou les octets du PDF si path est None.
+
+        Chaque section (résumé, statistiques, chaque graphique) est rendue en fragment PDF.
+        Avec `cache_dir`, les fragments sont conservés sur disque sous l'empreinte de leurs
+        entrées (données, parties, alpha, options de tableau, thème matplotlib) : seules les
+        sections dont les entrées ont changé sont recalculées et re-rendues.
+        Les graphiques à rendre sont décrits par des spécifications et rendus ensemble par
+        utils.charts.render_charts : dans le processus courant par défaut (quelques graphiques),
+        en pool de processus avec un `max_workers` explicite > 1.
+        """
+        sections = sections or ["summary", "stats", "figures"]
+        parts = self.available_parts(parts)
+        cache = PdfFragmentCache(cache_dir) if cache_dir else None
+
+        entries = self._fragment_specs(parts, sections, table_max_rows, table_overflow)
+        fragments, stale_charts, reused = [None] * len(entries), [], 0
+        for i, (name, inputs, render) in enumerate(entries):
+            key = fragment_key(name, inputs)
+            fragment = cache.get(key) if cache is not None else None
+            if fragment is not None:
+                fragments[i] = fragment
+                reused += 1
+            elif name.startswith("figure:"):
+                stale_charts.append((i, key, render()))  # Spécification : rendue avec les autres graphiques
+            else:
+                fragments[i] = render()
+                if fragments[i] is not None and cache is not None:
+                    cache.put(key, fragments[i])
+
+        if stale_charts:
+            pages = render_charts(None, [spec for _i, _key, spec in stale_charts], fmt="pdf", max_workers=max_workers)
+            for (i, key, _spec), page in zip(stale_charts, pages):
+                fragments[i] = page
+                if page is not None and cache is not None:
+                    cache.put(key, page)
+
+        logger.info("ReportBuilder : rapport %s (parties=%s, sections=%s, %d fragment(s) réutilisé(s), "
+                    "%d graphique(s) rendu(s))", path or "en mémoire", parts, sections, reused, len(stale_charts))
+        cover = cover_pdf(title, author, sections, add_toc, custom_logo_path)
+        pdf_bytes = merge_pdf_fragments([cover] + [f for f in fragments if f is not None])
+        return pdf_bytes if path is None else export_pdf_file(pdf_bytes, path)
+
+    def _fragment_specs(self, parts, sections, table_max_rows, table_overflow):
+        """
+        (nom, entrées, rendu) de chaque section du rapport, dans l'ordre d'assemblage.
+        Pour les graphiques ("figure:<partie>"), le rendu retourne la spécification utils.charts.
+        """
+        data_fp = data_fingerprint(self.data)
+        scenarios_fp = data_fingerprint(self.data_scenarios) if "comparaison" in parts else None
+        specs = []
+        if "summary" in sections and "summary" in parts:
+            specs.append(("summary", (data_fp,), lambda: summary_pdf(self.summary(parts))))
+        if "stats" in sections:
+            stats_inputs = (data_fp, scenarios_fp, tuple(parts), self.alpha, table_max_rows, table_overflow)
+            specs.append(("stats", stats_inputs, lambda: self._stats_fragment(parts, table_max_rows, table_overflow)))
+        if "figures" in sections:
+            theme = _theme_key()
+            for part in parts:
+                if part in FIGURE_PARTS:
+                    inputs = (scenarios_fp if part == "comparaison" else data_fp, self.alpha, theme)
+                    specs.append((f"figure:{part}", inputs, lambda part=part: self.chart_spec(part)))
+        return specs
+
+    def _stats_fragment(self, parts, table_max_rows, table_overflow):
+        stats = self.stats(parts)
+        return stats_pdf(stats, table_max_rows, table_overflow) if stats else None
+
+    # --- Figures (spécifications utils.charts, sans pyplot ni Qt) ---
+
+    def chart_spec(self, part):
+        """
+        Spécification utils.charts du graphique d'une partie ("reserve", "comparaison",
+        "confidence") : agrégats par année inclus et thème matplotlib courant ("rc"),
+        si bien qu'elle se rend à l'identique dans un autre processus.
+        """
+        if part == "reserve":
+            series = self.reserve_by_year()
+            spec = {"kind": "lines", "title": "Évolution de la réserve", "series": [{
+                "label": "Réserve moyenne", "annees": series.index.astype(int).tolist(),
+                "values": series.tolist(), "couleur": "#0077cc",
+            }]}
+        elif part == "comparaison":
+            table = self.scenario_reserve_by_year()
+            series = []
+            for i, name in enumerate(table.columns):
+                serie = table[name].dropna()
+                series.append({"label": str(name), "annees": serie.index.astype(int).tolist(),
+                               "values": serie.tolist(), "couleur": f"C{i}"})
+            spec = {"kind": "lines", "title": "Comparaison multi-scénarios", "series": series}
+        elif part == "confidence":
+            table = self.confidence_table()
+            spec = {"kind": "confidence", "title": "Intervalle de Confiance Réserve",
+                    "annees": table["Annee"].tolist(), "moyenne": table["Moyenne"].tolist(),
+                    "ic_bas": table["IC bas"].tolist(), "ic_haut": table["IC haut"].tolist()}
+        else:
+            raise ValueError(f"Partie sans graphique : {part!r}")
+        spec["name"] = f"rapport_{part}"
+        spec["rc"] = {k: matplotlib.rcParams[k] for k in _THEME_RC_KEYS}
+        return spec
+
+    def figure(self, part):
+        """Figure matplotlib (API objet) du graphique d'une partie, dans le processus courant."""
+        spec = self.chart_spec(part)
+        with matplotlib.rc_context(spec["rc"]):
+            fig = Figure(figsize=(7, 4))
+            FigureCanvasAgg(fig)
+            draw_chart_spec(fig.add_subplot(111), None, spec)
+            fig.tight_layout()
+        return fig
+
+
+# --- Exemple d'utilisation (script, sans interface) ---
+# from utils.fileio import load_results_file
+# df = load_results_file("data/output/resultats.csv")
+# ReportBuilder(df).export_pdf("data/output/rapport.pdf")
+# ReportBuilder(df).export_pdf("data/output/rapport.pdf", cache_dir=DEFAULT_CACHE_DIR)  # export quotidien incrémental
@@ -0,0 +1,189 @@
+# utils/result_store.py
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from core.schema import RESULT_DTYPES, apply_result_schema
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.result_store")
+
+STORE_EXTS = {".sqlite", ".db"}
+
+# Colonnes de la table (ordre du format long) et leur type SQLite
+_COLUMNS = ["Scenario", "Annee", "Simulation", "TotEmp", "TotRet", "TotCotis", "TotPens", "Reserve", "NouvRet", "NouvRec"]
+_SQL_TYPES = {col: ("TEXT" if col == "Scenario" else "REAL" if RESULT_DTYPES[col].startswith("float") else "INTEGER")
+              for col in _COLUMNS}
+
+
+# Texte d'une ligne pour la recherche plein texte (valeurs séparées par des espaces),
+# comme l'index de recherche des onglets en mémoire (utils.search_index)
+_ROW_TEXT_SQL = " || ' ' || ".join(f"COALESCE({col}, '')" for col in _COLUMNS)
+
+
+def _like_pattern(text):
+    """Motif LIKE « contient `text` », avec %, _ et \\ échappés."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def is_result_store(path):
+    return os.path.splitext(path)[1].lower() in STORE_EXTS
+
+
+class ResultStore:
+    """
+    Stock de résultats SQLite (module standard sqlite3), indexé sur (Scenario, Annee, Simulation).
+
+    Les filtres des onglets sont traduits en requêtes SQL et lus par pages,
+    si bien qu'une étude plus grande que la mémoire peut être parcourue et filtrée.
+    L'ordre naturel des lignes (rowid) est l'ordre d'insertion : il sert de clé de pagination.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+            logger.info("Dossier créé : %s", directory)
+        self.conn = sqlite3.connect(path)
+        columns_sql = ", ".join(f'"{col}" {_SQL_TYPES[col]}' for col in _COLUMNS)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS results ({columns_sql})")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_sc_an_sim ON results (Scenario, Annee, Simulation)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_an_sim ON results (Annee, Simulation)")
+        logger.info("Stock de résultats ouvert : %s", path)
+
+    @classmethod
+    def from_dataframe(cls, df_or_dict, path):
+        """Crée (ou complète) un stock à partir d'un DataFrame long ou d'un dict {scénario: DataFrame}."""
+        store = cls(path)
+        store.insert(df_or_dict)
+        return store
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- Écriture ---
+
+    def insert(self, df_or_dict, scenario=None):
+        """
+        Insère un DataFrame long (ou un dict {scénario: DataFrame}) en une seule transaction.
+        `scenario` sert de libellé lorsque le DataFrame n'a pas de colonne 'Scenario'.
+        Retourne le nombre de lignes insérées.
+        """
+        frames = df_or_dict.items() if isinstance(df_or_dict, dict) else [(scenario, df_or_dict)]
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        sql = f"INSERT INTO results ({', '.join(_COLUMNS)}) VALUES ({placeholders})"
+        n_rows = 0
+        with self.conn:
+            for label, df in frames:
+                if not isinstance(df, pd.DataFrame) or df.empty:
+                    continue
+                values = []
+                for col in _COLUMNS:
+                    if col in df.columns:
+                        values.append(df[col].astype(str).tolist() if col == "Scenario" else df[col].tolist())
+                    elif col == "Scenario" and label is not None:
+                        values.append([str(label)] * len(df))
+                    else:
+                        values.append([None] * len(df))
+                self.conn.executemany(sql, zip(*values))
+                n_rows += len(df)
+        logger.info("Stock de résultats : %d lignes insérées dans %s", n_rows, self.path)
+        return n_rows
+
+    # --- Lecture ---
+
+    @staticmethod
+    def _where(scenarios=None, annees=None, simulations=None, after=None, text=None):
+        clauses, params = [], []
+        for col, values in (("Scenario", scenarios), ("Annee", annees), ("Simulation", simulations)):
+            if values is None:
+                continue
+            values = [str(v) for v in values] if col == "Scenario" else [int(v) for v in values]
+            if not values:
+                clauses.append("0")  # Liste vide : aucune ligne (« IN () » est invalide en SQLite)
+                continue
+            clauses.append(f"{col} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        text = (text or "").strip()
+        if text:
+            # LIKE : insensible à la casse (ASCII), évalué par SQLite sans charger les lignes
+            clauses.append(f"({_ROW_TEXT_SQL}) LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(text))
+        if after is not None:
+            clauses.append("rowid > ?")
+            params.append(int(after))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, scenarios=None, annees=None, simulations=None, text=None):
+        where, params = self._where(scenarios, annees, simulations, text=text)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def distinct(self, column):
+        """Valeurs distinctes (triées) d'une colonne indexée, pour remplir les filtres."""
+        if column not in _COLUMNS:
+            raise ValueError(f"Colonne inconnue : {column}")
+        rows = self.conn.execute(f"SELECT DISTINCT {column} FROM results WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [r[0] for r in rows]
+
+    def query(self, scenarios=None, annees=None, simulations=None, columns=None, limit=None, offset=None, text=None):
+        """
+        Retourne les lignes filtrées (DataFrame au schéma compact), éventuellement paginées
+        par LIMIT/OFFSET. `text` ne garde que les lignes contenant ce texte (toutes colonnes).
+        Les colonnes entièrement vides sont omises.
+        """
+        df, _ = self._select(scenarios, annees, simulations, columns, limit=limit, offset=offset, text=text)
+        return df
+
+    def fetch_page(self, page_size, after=0, scenarios=None, annees=None, simulations=None, columns=None,
+                   text=None):
+        """
+        Pagination par clé (keyset) : retourne (DataFrame, dernière clé) pour les `page_size`
+        lignes suivant la clé `after`. Coût constant quel que soit le numéro de page.
+        """
+        return self._select(scenarios, annees, simulations, columns, limit=page_size, after=after, text=text)
+
+    def mean_by_year(self, scenarios=None):
+        """Moyennes par année (toutes simulations) calculées en SQL : une ligne par année."""
+        numeric = [c for c in _COLUMNS if c not in ("Scenario", "Annee", "Simulation")]
+        where, params = self._where(scenarios)
+        sql = (f"SELECT Annee, {', '.join(f'AVG({c}) AS {c}' for c in numeric)} "
+               f"FROM results{where} GROUP BY Annee ORDER BY Annee")
+        df = pd.read_sql_query(sql, self.conn, params=params).dropna(axis=1, how="all")
+        return df.astype({"Annee": RESULT_DTYPES["Annee"]})
+
+    def _select(self, scenarios, annees, simulations, columns, limit=None, offset=None, after=None, text=None):
+        cols = [c for c in (columns or _COLUMNS) if c in _COLUMNS]
+        where, params = self._where(scenarios, annees, simulations, after, text)
+        sql = f"SELECT rowid AS _key, {', '.join(cols)} FROM results{where} ORDER BY rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+            if offset:
+                sql += " OFFSET ?"
+                params.append(int(offset))
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        last_key = int(df["_key"].iloc[-1]) if not df.empty else after
+        df = df.drop(columns="_key")
+        if columns is None:
+            df = df.dropna(axis=1, how="all") if not df.empty else df
+        logger.debug("Stock de résultats : %d lignes lues (%s)", len(df), where or "sans filtre")
+        return apply_result_schema(df), last_key
+
+
+# --- Exemples d'utilisation ---
+# store = ResultStore.from_dataframe({"Scénario 1": df1, "Scénario 2": df2}, "data/output/etude.sqlite")
+# store.count(annees=[2035], text="scénario 1")
+# page, cle = store.fetch_page(1000, scenarios=["Scénario 1"], annees=[2035])
+# suite, cle = store.fetch_page(1000, after=cle, scenarios=["Scénario 1"], annees=[2035])
@@ -0,0 +1,159 @@
+# utils/results_cube.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.schema import apply_result_schema
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.results_cube")
+
+# Indicateurs produits par Simulator.simuler_annee (ordre de l'axe "indicateurs")
+INDICATORS = ["TotEmp", "TotRet", "TotCotis", "TotPens", "Reserve", "NouvRet", "NouvRec"]
+
+
+def _header_path(path):
+    return path + ".json"
+
+
+class ResultsCube:
+    """
+    Cube de résultats (scénarios × runs × années × indicateurs) stocké sur disque
+    dans un np.memmap de disposition fixe, accompagné d'un en-tête JSON (`<path>.json`)
+    contenant les libellés des axes.
+
+    Les lectures renvoient des vues du memmap (aucune copie) : la réserve d'une année
+    pour tous les runs est une seule lecture à pas fixe.
+    """
+
+    def __init__(self, path, data, scenarios, runs, years, indicators):
+        self.path = path
+        self.data = data
+        self.scenarios = [str(s) for s in scenarios]
+        self.runs = [int(r) for r in runs]
+        self.years = [int(a) for a in years]
+        self.indicators = list(indicators)
+        self._scenario_pos = {s: i for i, s in enumerate(self.scenarios)}
+        self._run_pos = {r: i for i, r in enumerate(self.runs)}
+        self._year_pos = {a: i for i, a in enumerate(self.years)}
+        self._indicator_pos = {n: i for i, n in enumerate(self.indicators)}
+
+    # --- Création / ouverture ---
+
+    @classmethod
+    def create(cls, path, scenarios, runs, years, indicators=INDICATORS, dtype="float64"):
+        """Crée un cube vide (rempli de NaN) et son en-tête JSON."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        header = {
+            "dtype": np.dtype(dtype).str,
+            "scenarios": [str(s) for s in scenarios],
+            "runs": [int(r) for r in runs],
+            "years": [int(a) for a in years],
+            "indicators": list(indicators),
+        }
+        shape = (len(header["scenarios"]), len(header["runs"]), len(header["years"]), len(header["indicators"]))
+        with open(_header_path(path), "w", encoding="utf-8") as f:
+            json.dump(header, f, ensure_ascii=False, indent=2)
+        data = np.memmap(path, dtype=header["dtype"], mode="w+", shape=shape)
+        data[:] = np.nan
+        logger.info("Cube de résultats créé : %s (forme %s)", path, shape)
+        return cls(path, data, header["scenarios"], header["runs"], header["years"], header["indicators"])
+
+    @classmethod
+    def open(cls, path, mode="r"):
+        """Ouvre un cube existant en lecture (`r`) ou lecture/écriture (`r+`)."""
+        with open(_header_path(path), "r", encoding="utf-8") as f:
+            header = json.load(f)
+        shape = (len(header["scenarios"]), len(header["runs"]), len(header["years"]), len(header["indicators"]))
+        data = np.memmap(path, dtype=header["dtype"], mode=mode, shape=shape)
+        logger.info("Cube de résultats ouvert : %s (forme %s, mode=%s)", path, shape, mode)
+        return cls(path, data, header["scenarios"], header["runs"], header["years"], header["indicators"])
+
+    # --- Écriture ---
+
+    def write_run(self, scenario, run, df_run):
+        """Écrit les lignes d'un run (format long, une ligne par année) dans le cube."""
+        s = self._scenario_pos[str(scenario)]
+        r = self._run_pos[int(run)]
+        year_idx = [self._year_pos[int(a)] for a in df_run["Annee"]]
+        for name, i in self._indicator_pos.items():
+            if name in df_run.columns:
+                self.data[s, r, year_idx, i] = df_run[name].to_numpy()
+
+    def flush(self):
+        if hasattr(self.data, "flush"):
+            self.data.flush()
+
+    # --- Lecture (vues sans copie) ---
+
+    def _scenario_index(self, scenario):
+        if scenario is None:
+            if len(self.scenarios) == 1:
+                return 0
+            raise ValueError("Lecture sans 'scenario' d'un cube multi-scénarios.")
+        return self._scenario_pos[str(scenario)]
+
+    def year_slice(self, annee, indicator="Reserve", scenario=None):
+        """
+        Valeurs d'un indicateur pour une année, sur tous les runs (vue 1-D).
+        `scenario` n'est facultatif que pour un cube à un seul scénario (ValueError sinon),
+        comme pour les méthodes de lecture suivantes.
+        """
+        return self.data[self._scenario_index(scenario), :, self._year_pos[int(annee)], self._indicator_pos[indicator]]
+
+    def indicator(self, indicator="Reserve", scenario=None):
+        """Matrice runs × années d'un indicateur (vue 2-D)."""
+        return self.data[self._scenario_index(scenario), :, :, self._indicator_pos[indicator]]
+
+    def run_series(self, run, indicator="Reserve", scenario=None):
+        """Trajectoire d'un indicateur sur les années pour un run (vue 1-D)."""
+        return self.data[self._scenario_index(scenario), self._run_pos[int(run)], :, self._indicator_pos[indicator]]
+
+    # --- Conversion vers / depuis le format DataFrame long ---
+
+    def to_dataframe(self, scenario=None):
+        """
+        Reconstruit le DataFrame long (une ligne par run et par année).
+        Sans `scenario`, tous les scénarios sont concaténés avec une colonne 'Scenario'
+        (omise s'il n'y en a qu'un). Les colonnes suivent le schéma compact (core.schema).
+        """
+        scenarios = self.scenarios if scenario is None else [str(scenario)]
+        n_runs, n_years = len(self.runs), len(self.years)
+        frames = []
+        for name in scenarios:
+            block = np.asarray(self.data[self._scenario_pos[name]]).reshape(n_runs * n_years, len(self.indicators))
+            df = pd.DataFrame(block, columns=self.indicators)
+            df["Annee"] = np.tile(self.years, n_runs)
+            df["Simulation"] = np.repeat(self.runs, n_years)
+            if len(scenarios) > 1:
+                df.insert(0, "Scenario", name)
+            frames.append(df)
+        return apply_result_schema(pd.concat(frames, ignore_index=True))
+
+    @classmethod
+    def from_dataframe(cls, df_or_dict, path, indicators=None, dtype="float64"):
+        """Crée un cube à partir d'un DataFrame long (ou d'un dict {scénario: DataFrame})."""
+        frames = df_or_dict if isinstance(df_or_dict, dict) else {"default": df_or_dict}
+        frames = {str(k): df for k, df in frames.items() if isinstance(df, pd.DataFrame) and not df.empty}
+        first = next(iter(frames.values()))
+        indicators = indicators or [c for c in INDICATORS if c in first.columns]
+        runs = sorted(set().union(*(df["Simulation"].unique() for df in frames.values())))
+        years = sorted(set().union(*(df["Annee"].unique() for df in frames.values())))
+        cube = cls.create(path, list(frames), runs, years, indicators=indicators, dtype=dtype)
+        for name, df in frames.items():
+            for run, df_run in df.groupby("Simulation"):
+                cube.write_run(name, run, df_run)
+        cube.flush()
+        return cube
+
+
+# --- Exemples d'utilisation ---
+# cube = ResultsCube.create("data/output/etude.cube", ["Scénario 1"], range(1, 41), range(2025, 2036))
+# sim.simuler_40_runs(cube=cube, scenario="Scénario 1")
+# cube = ResultsCube.open("data/output/etude.cube")
+# reserves_2035 = cube.year_slice(2035)                    # vue sur les 40 runs
+# df = cube.to_dataframe()                                 # format dernier_resultat_df
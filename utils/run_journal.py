@@ -0,0 +1,139 @@
+# utils/run_journal.py
+
+import datetime
+import json
+import os
+
+import pandas as pd
+
+from core.schema import apply_result_schema
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.run_journal")
+
+JOURNAL_EXT = ".jsonl"
+JOURNAL_DIR = "data/output/journal"
+JOURNAL_KEEP = 10  # Journaux horodatés conservés par prune_old_journals
+_FOOTER_KEY = "__run__"
+
+
+def get_default_journal_path(base_dir=JOURNAL_DIR, prefix="runs"):
+    """Génère un nom de journal unique avec timestamp (un journal par batch)."""
+    now = datetime.datetime.now()
+    return os.path.join(base_dir, f"{prefix}_{now:%Y-%m-%d_%H-%M-%S}{JOURNAL_EXT}")
+
+
+def prune_old_journals(base_dir=JOURNAL_DIR, keep=JOURNAL_KEEP, prefix="runs"):
+    """
+    Supprime les journaux horodatés les plus anciens (`<prefix>_*.jsonl`) pour n'en garder que `keep`.
+    Le timestamp du nom donne l'ordre chronologique ; les autres fichiers ne sont pas touchés.
+    Retourne la liste des fichiers supprimés.
+    """
+    if not os.path.isdir(base_dir):
+        return []
+    names = sorted(
+        name for name in os.listdir(base_dir)
+        if name.startswith(prefix + "_") and name.endswith(JOURNAL_EXT)
+    )
+    removed = []
+    for name in names[:max(len(names) - keep, 0)]:
+        path = os.path.join(base_dir, name)
+        try:
+            os.remove(path)
+            removed.append(path)
+        except OSError as e:
+            logger.warning("Journal %s non supprimé : %s", path, e)
+    if removed:
+        logger.info("Journaux de runs purgés : %d supprimé(s), %d conservé(s).", len(removed), keep)
+    return removed
+
+
+def is_run_journal(path):
+    return os.path.splitext(path)[1].lower() == JOURNAL_EXT
+
+
+class RunJournal:
+    """
+    Journal append-only des runs terminés (JSON, une ligne par enregistrement).
+
+    Chaque run écrit ses lignes de résultats puis une ligne de pied
+    {"__run__": id, "rows": n}, suivie d'un flush + fsync : un crash ne peut
+    laisser qu'un run incomplet en fin de fichier, ignoré à la relecture.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+            logger.info("Dossier créé : %s", directory)
+        self._file = open(path, "a", encoding="utf-8")
+        logger.info("Journal de runs ouvert : %s", path)
+
+    def append_run(self, simulation_id, df_run, scenario=None):
+        """Ajoute les lignes d'un run terminé puis son pied, et force l'écriture sur disque."""
+        records = df_run.to_dict(orient="records")
+        lines = [json.dumps(r, ensure_ascii=False) for r in records]
+        footer = {_FOOTER_KEY: int(simulation_id), "rows": len(records)}
+        if scenario is not None:
+            footer["scenario"] = str(scenario)
+        lines.append(json.dumps(footer, ensure_ascii=False))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        logger.debug("Journal : run %s écrit (%d lignes)", simulation_id, len(records))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_run_journal(path):
+    """
+    Relit un journal et reconstruit le DataFrame long (format dernier_resultat_df).
+    Seuls les runs complets (pied présent et nombre de lignes cohérent) sont conservés.
+    Le scénario des pieds est restauré dans une colonne 'Scenario' catégorielle.
+    """
+    rows, pending = [], []
+    n_runs = n_skipped = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Ligne tronquée (écriture interrompue) : le run en cours est perdu
+                pending, n_skipped = [], n_skipped + 1
+                continue
+            if _FOOTER_KEY in record:
+                if len(pending) == record.get("rows"):
+                    if "scenario" in record:
+                        for row in pending:
+                            row["Scenario"] = record["scenario"]
+                    rows.extend(pending)
+                    n_runs += 1
+                else:
+                    n_skipped += 1
+                pending = []
+            else:
+                pending.append(record)
+    if pending:
+        n_skipped += 1
+    if n_skipped:
+        logger.warning("Journal %s : %d run(s) incomplet(s) ignoré(s).", path, n_skipped)
+    logger.info("Journal relu : %s (%d runs, %d lignes)", path, n_runs, len(rows))
+    df = pd.DataFrame(rows)
+    if "Scenario" in df.columns:
+        df.insert(0, "Scenario", df.pop("Scenario"))
+    return apply_result_schema(df)
+
+
+# --- Exemples d'utilisation ---
+# prune_old_journals()
+# with RunJournal(get_default_journal_path()) as journal:
+#     sim.simuler_40_runs(journal=journal)
+# df = read_run_journal("data/output/journal/runs_2025-06-01_22-00-00.jsonl")
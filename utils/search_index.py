@@ -0,0 +1,79 @@
+# utils/search_index.py
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_child_logger
+logger = get_child_logger("utils.search_index")
+
+
+class SearchIndex:
+    """
+    Index de recherche plein texte d'un DataFrame, construit une seule fois :
+    le texte de chaque ligne (valeurs séparées par des espaces, en minuscules) est
+    gardé dans un tableau, et les recherches sont des tests de sous-chaîne vectorisés.
+
+    Une recherche qui prolonge la précédente (frappe au clavier) ne réexamine que
+    les lignes déjà trouvées.
+    """
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        if df.shape[1] == 0 or self.n_rows == 0:
+            text = pd.Series([""] * self.n_rows, dtype=object)
+        else:
+            text = df.iloc[:, 0].astype(str).reset_index(drop=True)
+            for j in range(1, df.shape[1]):
+                text = text + " " + df.iloc[:, j].astype(str).reset_index(drop=True)
+        self._text = text.str.lower()
+        self._last_query = ""
+        self._last_positions = np.arange(self.n_rows)
+        self._lock = threading.Lock()  # Interrogé depuis le thread GUI et le thread de filtrage
+        logger.debug("Index de recherche construit (%d lignes)", self.n_rows)
+
+    def positions(self, query):
+        """Positions (iloc) des lignes contenant `query` (insensible à la casse)."""
+        query = (query or "").strip().lower()
+        if not query:
+            return np.arange(self.n_rows)
+        with self._lock:
+            if self._last_query and self._last_query in query:
+                candidates = self._last_positions
+            else:
+                candidates = np.arange(self.n_rows)
+            found = self._text.iloc[candidates].str.contains(query, regex=False).to_numpy(dtype=bool)
+            self._last_query, self._last_positions = query, candidates[found]
+            return self._last_positions
+
+    def mask(self, query):
+        """Masque booléen (longueur du DataFrame) des lignes contenant `query`."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.positions(query)] = True
+        return mask
+
+
+# Un index par DataFrame (identité de l'objet), libéré avec le DataFrame
+_INDEXES = {}
+
+
+def get_search_index(df):
+    """Retourne l'index de recherche de `df`, construit au premier appel puis réutilisé."""
+    key = id(df)
+    entry = _INDEXES.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    index = SearchIndex(df)
+    _INDEXES[key] = (weakref.ref(df, lambda _ref, key=key: _INDEXES.pop(key, None)), index)
+    return index
+
+
+def search_mask(df, query):
+    """Raccourci : masque des lignes de `df` contenant `query`."""
+    return get_search_index(df).mask(query)
+
+
+# --- Exemple d'utilisation ---
+# df_filtre = df[search_mask(df, "2035")]
@@ -6,6 +6,7 @@ import statistics
 import scipy.stats as st
 
 from utils.logger import get_child_logger
+from utils.results_cube import ResultsCube
 logger = get_child_logger("utils.stats")
 
 
@@ -42,7 +43,14 @@ def moyenne_reserve(data, annee=None):
     Calcule la moyenne de la réserve (optionnellement pour une année).
     """
     try:
-        if isinstance(data, pd.DataFrame):
+        if isinstance(data, ResultsCube):
+            if annee is None:
+                reserves = np.asarray(data.indicator("Reserve")).ravel()
+            else:
+                reserves = data.year_slice(annee)
+            reserves = reserves[~np.isnan(reserves)]
+
+        elif isinstance(data, pd.DataFrame):
             df = data
             if annee is not None:
                 if "Annee" not in df.columns:
@@ -112,13 +120,17 @@ def intervalle_confiance(data, alpha=0.05):
 def intervalle_confiance_reserve(df_runs, annee, alpha=0.05):
     """
     IC pour la réserve d’une année spécifique.
+    Accepte aussi un ResultsCube (lecture directe de la tranche année, sans copie).
     """
     try:
-        if df_runs is None or "Reserve" not in df_runs.columns or "Annee" not in df_runs.columns:
+        if isinstance(df_runs, ResultsCube):
+            reserves = df_runs.year_slice(annee)
+            reserves = reserves[~np.isnan(reserves)]
+        elif df_runs is None or "Reserve" not in df_runs.columns or "Annee" not in df_runs.columns:
             logger.warning("intervalle_confiance_reserve : DataFrame incomplet ou None.")
             return (None, None)
-
-        reserves = df_runs[df_runs["Annee"] == annee]["Reserve"].values
+        else:
+            reserves = df_runs[df_runs["Annee"] == annee]["Reserve"].values
         n = len(reserves)
         if n == 0:
             logger.warning("intervalle_confiance_reserve : aucune donnée pour année %s.", annee)
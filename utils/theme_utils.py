@@ -9,8 +9,14 @@ except ImportError:
     import logging
     logger = logging.getLogger("ui.theme_utils")
 
-# UI feedback dialogs
-from ui.dialogs import show_error, show_warning
+# UI feedback dialogs (importés à l'usage : ui importe lui-même utils)
+def show_error(*args, **kwargs):
+    from ui.dialogs import show_error as _show_error
+    return _show_error(*args, **kwargs)
+
+def show_warning(*args, **kwargs):
+    from ui.dialogs import show_warning as _show_warning
+    return _show_warning(*args, **kwargs)
 
 DEFAULT_CONFIG_PATH = "data/config/ui_prefs.json"
 